@@ -0,0 +1,145 @@
+# app/data/aio.py
+# Async-capable data layer. The data functions stay plain blocking code;
+# this module runs them on a bounded thread pool whose workers each pin one
+# pooled SQLite connection for their whole life (every connection() call
+# on a worker thread gets that connection back), so concurrent queries
+# never queue for a connection. sqlite3 releases the GIL while SQLite is
+# executing, so independent queries overlap and a page waits for roughly
+# its slowest query instead of the sum of all of them.
+import asyncio
+import atexit
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app.data import db
+from app.data.pool import get_pool
+
+MAX_WORKERS = 4  # leaves the rest of the connection pool to ordinary callers
+
+
+class DataExecutor:
+    """Bounded thread pool for data calls, one pinned connection per worker."""
+
+    def __init__(self, db_path, max_workers=MAX_WORKERS):
+        self.db_path = str(db_path)
+        self.max_workers = max_workers
+        self._pinned = []  # open connection() contexts, kept alive with their workers
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="data",
+                                            initializer=self._pin)
+
+    def _pin(self):
+        context = get_pool(self.db_path).connection()
+        self._local.conn = context.__enter__()
+        with self._lock:
+            self._pinned.append(context)
+
+    def _call(self, fn, args, kwargs, submitted):
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            conn = self._local.conn
+            if conn.in_transaction:  # what release() would do for a pooled connection
+                conn.rollback()
+        done = time.perf_counter()
+        return result, {"seconds": done - started, "queued": started - submitted}
+
+    def submit(self, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` on a worker; Future of (result, timing)."""
+        return self._executor.submit(self._call, fn, args, kwargs, time.perf_counter())
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for context in self._pinned:
+                context.__exit__(None, None, None)
+            self._pinned.clear()
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(db_path=None, **kwargs):
+    """Return the process-wide data executor for ``db_path`` (default: db.DB_PATH)."""
+    key = str(Path(db_path or db.DB_PATH).resolve())
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            executor = DataExecutor(key, **kwargs)
+            _executors[key] = executor
+        return executor
+
+
+@atexit.register
+def _close_executors():
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.close()
+        _executors.clear()
+
+
+def _submit(executor, query):
+    """Submit ``fn`` or ``(fn, *args)``."""
+    if callable(query):
+        return executor.submit(query)
+    fn, *args = query
+    return executor.submit(fn, *args)
+
+
+async def run_query(fn, *args, **kwargs):
+    """Awaitable wrapper: ``df = await run_query(count_by, "it_tickets", "status")``."""
+    result, _ = await asyncio.wrap_future(get_executor().submit(fn, *args, **kwargs))
+    return result
+
+
+async def load_many_async(queries):
+    """Awaitable load_many(): same arguments and return value."""
+    started = time.perf_counter()
+    executor = get_executor()
+    names = list(queries)
+    outcomes = await asyncio.gather(*(asyncio.wrap_future(_submit(executor, queries[n]))
+                                      for n in names))
+    results = {name: result for name, (result, _) in zip(names, outcomes)}
+    timings = {name: timing for name, (_, timing) in zip(names, outcomes)}
+    timings["total"] = {"seconds": time.perf_counter() - started, "queued": 0.0}
+    return results, timings
+
+
+def load_many(queries):
+    """Run independent data calls concurrently and return them together.
+
+    ``queries`` maps a name to ``fn`` or ``(fn, *args)``, e.g.
+    {"kpis": kpi_summary, "severity": (count_by, "cyber_incidents", "severity")}.
+    Returns (results, timings): results[name] is the call's return value,
+    timings[name] is {"seconds": run time, "queued": time spent waiting for
+    a worker} and timings["total"] the wall time of the whole batch. The
+    first failing call's exception is raised once every call has finished.
+    """
+    started = time.perf_counter()
+    executor = get_executor()
+    futures = {name: _submit(executor, query) for name, query in queries.items()}
+    results, timings, error = {}, {}, None
+    for name, future in futures.items():
+        try:
+            results[name], timings[name] = future.result()
+        except Exception as exc:
+            error = error or exc
+    if error is not None:
+        raise error
+    timings["total"] = {"seconds": time.perf_counter() - started, "queued": 0.0}
+    return results, timings
+
+
+def format_timings(timings):
+    """One line per query, slowest first, then the total, e.g. for a log or caption."""
+    rows = sorted(((n, t) for n, t in timings.items() if n != "total"),
+                  key=lambda item: item[1]["seconds"], reverse=True)
+    lines = [f"{name}: {t['seconds'] * 1000:.1f} ms" for name, t in rows]
+    if "total" in timings:
+        lines.append(f"total: {timings['total']['seconds'] * 1000:.1f} ms")
+    return lines
@@ -0,0 +1,158 @@
+# app/data/changes.py
+# Change-data-capture log. Triggers on the data tables append one row per
+# INSERT/UPDATE/DELETE to change_log (seq, table, op, row_id), so a client
+# holding a copy of a table can ask "what changed since seq N?" and fetch
+# just those rows instead of re-reading the whole table.
+#
+# seq comes from AUTOINCREMENT, so it never goes backwards or gets reused
+# after old entries are compacted away. A bulk load (triggers paused) logs
+# a single 'R' (reset) entry per table instead of one row per record, and
+# a client whose cursor is older than the oldest retained entry is told to
+# reload too; both show up as "reset" in changes_since().
+import pandas as pd
+
+CHANGE_TABLES = ["cyber_incidents", "it_tickets", "datasets_metadata"]
+OPS = {"INSERT": "I", "UPDATE": "U", "DELETE": "D"}
+
+MAX_LOG_ROWS = 100_000      # retention by size, enforced by a trigger
+COMPACT_EVERY = 1_000       # ... checked on every COMPACT_EVERY-th entry
+MAX_LOG_AGE_HOURS = 24      # retention by age, see compact_changes()
+CHANGES_LIMIT = 10_000      # most log rows one changes_since() call reads
+
+
+def create_change_log(conn):
+    """Create the change_log table and its size-based compaction trigger."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            op TEXT NOT NULL,
+            row_id INTEGER,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_change_log_compact AFTER INSERT ON change_log "
+        f"WHEN NEW.seq % {COMPACT_EVERY} = 0 "
+        f"BEGIN DELETE FROM change_log WHERE seq <= NEW.seq - {MAX_LOG_ROWS}; END"
+    )
+
+
+def install_triggers(conn, tables=None):
+    for table in tables or CHANGE_TABLES:
+        for op, code in OPS.items():
+            row = "OLD" if op == "DELETE" else "NEW"
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_changes_{table}_{op.lower()} AFTER {op} ON {table} "
+                f"BEGIN INSERT INTO change_log (table_name, op, row_id) VALUES ('{table}', '{code}', {row}.id); END"
+            )
+
+
+def drop_triggers(conn, tables=None):
+    for table in tables or CHANGE_TABLES:
+        for op in OPS:
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_changes_{table}_{op.lower()}")
+
+
+def log_reset(conn, tables=None):
+    """Record that ``tables`` changed wholesale (after a bulk load with triggers paused)."""
+    conn.executemany(
+        "INSERT INTO change_log (table_name, op, row_id) VALUES (?, 'R', NULL)",
+        [(t,) for t in tables or CHANGE_TABLES],
+    )
+
+
+def change_log_installed(conn):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_log'"
+    ).fetchone()
+    return row is not None
+
+
+def setup_change_log(conn):
+    """Migration step: table + triggers."""
+    create_change_log(conn)
+    install_triggers(conn)
+
+
+def latest_seq(conn):
+    """Cursor for "everything up to now" (0 for an empty, never-written log)."""
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    return row[0] if row else 0
+
+
+def changes_since(conn, seq, tables=None, limit=CHANGES_LIMIT):
+    """What changed in ``tables`` after cursor ``seq``.
+
+    Returns {"seq": new cursor, "reset": set of tables to reload,
+    "upserted": {table: [ids]}, "deleted": {table: [ids]}, "more": bool}.
+    Several changes to one row collapse into its last one. At most
+    ``limit`` log entries are read; with "more" set, call again with the
+    returned cursor.
+    """
+    tables = list(tables or CHANGE_TABLES)
+    latest = latest_seq(conn)  # read first: entries up to here are all committed
+    result = {"seq": max(seq, latest), "reset": set(), "upserted": {}, "deleted": {}, "more": False}
+
+    oldest = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+    if seq + 1 < (oldest if oldest is not None else latest + 1):
+        result["reset"] = set(tables)  # entries after the cursor were compacted away
+        return result
+
+    placeholders = ", ".join("?" for _ in tables)
+    rows = conn.execute(
+        f"SELECT seq, table_name, op, row_id FROM change_log "
+        f"WHERE seq > ? AND seq <= ? AND table_name IN ({placeholders}) ORDER BY seq LIMIT ?",
+        [seq, latest, *tables, limit + 1],
+    ).fetchall()
+    if len(rows) > limit:
+        rows, result["more"] = rows[:limit], True
+        result["seq"] = rows[-1][0]
+
+    last_op = {}
+    for _, table, op, row_id in rows:
+        if op == "R":
+            result["reset"].add(table)
+        else:
+            last_op[(table, row_id)] = op
+    for (table, row_id), op in last_op.items():
+        if table in result["reset"]:
+            continue
+        bucket = result["deleted"] if op == "D" else result["upserted"]
+        bucket.setdefault(table, []).append(row_id)
+    return result
+
+
+def compact_changes(conn, max_age_hours=MAX_LOG_AGE_HOURS, max_rows=MAX_LOG_ROWS):
+    """Retention: drop entries older than ``max_age_hours`` and all but the
+    newest ``max_rows``. Clients behind the cut get a reset. Caller commits.
+    Returns the number of entries removed."""
+    removed = conn.execute(
+        "DELETE FROM change_log WHERE changed_at < datetime('now', ?)",
+        (f"-{max_age_hours} hours",),
+    ).rowcount
+    removed += conn.execute(
+        "DELETE FROM change_log WHERE seq <= (SELECT seq FROM sqlite_sequence WHERE name = 'change_log') - ?",
+        (max_rows,),
+    ).rowcount
+    return removed
+
+
+def log_stats(conn):
+    """Entries, oldest/newest seq and oldest timestamp of the log, as a dict."""
+    row = conn.execute(
+        "SELECT COUNT(*), MIN(seq), MAX(seq), MIN(changed_at) FROM change_log"
+    ).fetchone()
+    return dict(zip(["entries", "oldest_seq", "newest_seq", "oldest_change"], row))
+
+
+def read_rows(conn, table, ids, columns):
+    """Current rows of ``table`` with the given ids (in chunks under SQLite's variable limit)."""
+    frames = []
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        frames.append(pd.read_sql(
+            f"SELECT {', '.join(columns)} FROM {table} WHERE id IN ({', '.join('?' for _ in chunk)})",
+            conn, params=chunk,
+        ))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
@@ -0,0 +1,152 @@
+# app/data/counters.py
+# kpi_counters holds one row per (table, dimension, value) with a live row
+# count, kept up to date by triggers, so headline numbers are a single
+# primary-key lookup instead of a scan. dimension "total" (value '') is the
+# table's row count. NULL values are counted under ''.
+import sys
+
+COUNTER_DIMENSIONS = {
+    "cyber_incidents": ["severity", "status"],
+    "it_tickets": ["status", "priority"],
+}
+
+_UPSERT = (
+    "INSERT INTO kpi_counters (table_name, dimension, value, count) VALUES ('{table}', '{dimension}', {value}, {delta}) "
+    "ON CONFLICT(table_name, dimension, value) DO UPDATE SET count = count + {delta};"
+)
+
+
+def create_counters_table(conn):
+    """Create the kpi_counters table."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS kpi_counters (
+            table_name TEXT NOT NULL,
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (table_name, dimension, value)
+        ) WITHOUT ROWID
+    """)
+
+
+def _bump(table, dimension, row, delta):
+    value = "''" if dimension == "total" else f"COALESCE({row}.{dimension}, '')"
+    return _UPSERT.format(table=table, dimension=dimension, value=value, delta=delta)
+
+
+def _trigger_sql(table, dimensions):
+    insert = "".join(_bump(table, d, "NEW", 1) for d in ["total"] + dimensions)
+    delete = "".join(_bump(table, d, "OLD", -1) for d in ["total"] + dimensions)
+    update = "".join(_bump(table, d, "OLD", -1) + _bump(table, d, "NEW", 1) for d in dimensions)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS trg_kpi_{table}_insert AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_kpi_{table}_delete AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_kpi_{table}_update AFTER UPDATE OF {', '.join(dimensions)} "
+        f"ON {table} BEGIN {update} END",
+    ]
+
+
+def install_triggers(conn, tables=None):
+    for table in tables or COUNTER_DIMENSIONS:
+        for sql in _trigger_sql(table, COUNTER_DIMENSIONS[table]):
+            conn.execute(sql)
+
+
+def drop_triggers(conn, tables=None):
+    for table in tables or COUNTER_DIMENSIONS:
+        for op in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_kpi_{table}_{op}")
+
+
+def _actual_counts(conn, table):
+    """Recompute (dimension, value, count) rows straight from the base table."""
+    rows = [("total", "", conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])]
+    for dimension in COUNTER_DIMENSIONS[table]:
+        rows += conn.execute(
+            f"SELECT '{dimension}', COALESCE({dimension}, ''), COUNT(*) FROM {table} GROUP BY 2"
+        ).fetchall()
+    return rows
+
+
+def rebuild_counters(conn, tables=None):
+    """Recompute counters from scratch. Caller commits."""
+    for table in tables or COUNTER_DIMENSIONS:
+        conn.execute("DELETE FROM kpi_counters WHERE table_name = ?", (table,))
+        conn.executemany(
+            "INSERT INTO kpi_counters (table_name, dimension, value, count) VALUES (?, ?, ?, ?)",
+            [(table, d, v, n) for d, v, n in _actual_counts(conn, table)],
+        )
+
+
+def check_counters(conn, tables=None):
+    """Compare counters with the base tables.
+
+    Returns a list of (table, dimension, value, stored, actual) for every
+    mismatch; an empty list means the counters are consistent.
+    """
+    mismatches = []
+    for table in tables or COUNTER_DIMENSIONS:
+        actual = {(d, v): n for d, v, n in _actual_counts(conn, table)}
+        stored = {
+            (d, v): n for d, v, n in conn.execute(
+                "SELECT dimension, value, count FROM kpi_counters WHERE table_name = ? AND count != 0",
+                (table,),
+            )
+        }
+        for key in sorted(set(actual) | set(stored)):
+            if actual.get(key, 0) != stored.get(key, 0):
+                mismatches.append((table, *key, stored.get(key, 0), actual.get(key, 0)))
+    return mismatches
+
+
+def counters_installed(conn):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'kpi_counters'"
+    ).fetchone()
+    return row is not None
+
+
+def setup_counters(conn):
+    """Migration step: table + triggers + initial counts."""
+    create_counters_table(conn)
+    install_triggers(conn)
+    rebuild_counters(conn)
+
+
+def read_counters(conn, table, dimension):
+    """{value: count} for one dimension (NULL values come back as None)."""
+    rows = conn.execute(
+        "SELECT value, count FROM kpi_counters WHERE table_name = ? AND dimension = ? AND count > 0",
+        (table, dimension),
+    )
+    return {(value if value != "" else None): count for value, count in rows}
+
+
+def main(argv):
+    """python -m app.data.counters [rebuild|check]   (run from WEEK8_BACKEND)"""
+    from app.data.db import connect_database
+
+    command = argv[1] if len(argv) > 1 else "check"
+    conn = connect_database()
+    if command == "rebuild":
+        conn.execute("BEGIN")
+        rebuild_counters(conn)
+        conn.commit()
+        print("✅ KPI counters rebuilt")
+    elif command == "check":
+        mismatches = check_counters(conn)
+        for table, dimension, value, stored, actual in mismatches:
+            print(f"❌ {table}.{dimension}={value!r}: counter {stored}, actual {actual}")
+        if not mismatches:
+            print("✅ KPI counters are consistent")
+        conn.close()
+        return 1 if mismatches else 0
+    else:
+        print(main.__doc__)
+        return 2
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -1,9 +1,15 @@
 # app/data/datasets.py
-import pandas as pd
-from app.data.db import connect_database
+from app.data.db import connection
+from app.data.snapshots import load_table
+from app.data.metrics import instrumented
+from app.data.query import ITER_BATCH_SIZE, iter_table
 
-def get_all_datasets():
-    conn = connect_database()
-    df = pd.read_sql_query("SELECT * FROM datasets_metadata", conn)
-    conn.close()
-    return df
\ No newline at end of file
+@instrumented
+def get_all_datasets(columns=None, compact=True):
+    """All dataset metadata as a DataFrame (see app.data.snapshots.load_table)."""
+    with connection() as conn:
+        return load_table(conn, "datasets_metadata", columns, compact)
+
+def iter_datasets(batch_size=ITER_BATCH_SIZE, columns=None, where=None, frames=True, compact=True):
+    """Dataset metadata in id order, streamed like app.data.incidents.iter_incidents."""
+    return iter_table("datasets_metadata", batch_size, columns, where, frames, compact)
@@ -0,0 +1,85 @@
+# app/data/dates.py
+# Dates are stored as ISO-8601 'YYYY-MM-DD' text, so string order is date
+# order and a B-tree index on the column serves range queries and sorts.
+# CSV exports arrive as M/D/YYYY and friends; everything goes through
+# to_iso_dates() on the way in.
+import numpy as np
+import pandas as pd
+
+# Date columns per table (the names used in the database)
+DATE_COLUMNS = {
+    "cyber_incidents": ["date_reported"],
+    "it_tickets": ["created_date", "resolved_date"],
+    "datasets_metadata": ["last_updated"],
+}
+
+# Tried in order, each one vectorized; whatever is left falls back to
+# pandas' per-value "mixed" parser.
+KNOWN_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%Y-%m-%d %H:%M:%S", "%d.%m.%Y", "%Y/%m/%d"]
+
+ISO_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+
+
+def _parse(text):
+    """Index-aligned datetime64 Series for a Series of date strings."""
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+    for fmt in KNOWN_FORMATS:
+        todo = parsed.isna()
+        if not todo.any():
+            break
+        parsed[todo] = pd.to_datetime(text[todo], format=fmt, errors="coerce")
+    todo = parsed.isna()
+    if todo.any():
+        parsed[todo] = pd.to_datetime(text[todo], format="mixed", errors="coerce")
+    return parsed
+
+
+def to_iso_dates(values):
+    """Vectorized: Series of date text -> Series of 'YYYY-MM-DD' (None if unparseable).
+
+    Date columns repeat a lot, so only the distinct values are parsed and
+    the result is mapped back by position.
+    """
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values.to_numpy(dtype=object))
+    parsed = _parse(pd.Series(uniques, dtype=object).astype(str))
+    iso = np.datetime_as_string(parsed.to_numpy(), unit="D").astype(object)
+    iso[parsed.isna().to_numpy()] = None
+    result = np.append(iso, None)[codes]  # code -1 (missing) picks the trailing None
+    return pd.Series(result, index=values.index, dtype=object)
+
+
+def normalize_dates(table, df):
+    """Rewrite the table's date columns of ``df`` (in place) as ISO text."""
+    for column in DATE_COLUMNS.get(table, []):
+        if column in df.columns:
+            df[column] = to_iso_dates(df[column])
+    return df
+
+
+def to_iso(value):
+    """One date/datetime/str -> 'YYYY-MM-DD' (for API arguments)."""
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def backfill_iso_dates(conn, tables=None):
+    """Migration step: rewrite non-ISO dates already in the database.
+
+    Only rows whose value doesn't already look like YYYY-MM-DD are read
+    and updated. Values that can't be parsed become NULL.
+    """
+    for table in tables or DATE_COLUMNS:
+        for column in DATE_COLUMNS[table]:
+            rows = conn.execute(
+                f"SELECT id, {column} FROM {table} "
+                f"WHERE {column} IS NOT NULL AND NOT ({column} GLOB '{ISO_GLOB}')"
+            ).fetchall()
+            if not rows:
+                continue
+            ids, values = zip(*rows)
+            iso = to_iso_dates(pd.Series(values))
+            conn.executemany(
+                f"UPDATE {table} SET {column} = ? WHERE id = ?",
+                zip(iso.tolist(), ids),
+            )
+            print(f"  📅 {table}.{column}: {len(rows)} value(s) rewritten as ISO dates")
@@ -1,8 +1,33 @@
 import sqlite3
 from pathlib import Path
+from app.data.metrics import InstrumentedConnection
+from app.data.pool import apply_pragmas, get_pool
+from app.data.writer import get_writer
 
-DB_PATH = Path("DATA") / "intelligence_platform.db"
+# Resolved from this file so the Streamlit app (run from WEEK9_STREAMLIT)
+# and main.py (run from WEEK8_BACKEND) open the same database.
+DB_PATH = Path(__file__).resolve().parents[2] / "DATA" / "intelligence_platform.db"
 
 def connect_database(db_path=DB_PATH):
-    """Connect to SQLite database."""
-    return sqlite3.connect(str(db_path))
\ No newline at end of file
+    """Connect to SQLite database (a standalone, tuned connection)."""
+    return apply_pragmas(sqlite3.connect(str(db_path), factory=InstrumentedConnection))
+
+def connection(db_path=None):
+    """Borrow a pooled connection: ``with connection() as conn: ...``
+
+    ``db_path`` defaults to the module-level DB_PATH, looked up per call so
+    scripts (benchmarks) can point the whole data layer at another file.
+    """
+    return get_pool(db_path or DB_PATH).connection()
+
+def dedicated_connection(db_path=None):
+    """Borrow a pooled connection for one long-lived reader (e.g. a generator)."""
+    return get_pool(db_path or DB_PATH).dedicated()
+
+def pool_stats(db_path=None):
+    """Hit/wait metrics for the shared connection pool."""
+    return get_pool(db_path or DB_PATH).stats()
+
+def writer(db_path=None):
+    """Shared group-commit writer: ``writer().execute(sql, params)`` -> lastrowid."""
+    return get_writer(db_path or DB_PATH)
@@ -0,0 +1,41 @@
+# app/data/frames.py
+# Compact DataFrame loading shared by the backend and the Streamlit app:
+# read only the columns a caller needs, store low-cardinality text as
+# pandas categories (one small code per row instead of a string object)
+# and parse date text (ISO-8601 in the database) into datetime64.
+import pandas as pd
+
+CATEGORY_COLUMNS = {"severity", "status", "priority", "category", "incident_type", "source"}
+DATE_COLUMNS = {"date_reported", "created_date", "resolved_date", "last_updated", "created_at"}
+
+
+def compact_frame(df):
+    """Convert category/date columns of ``df`` in place and return it."""
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS:
+            df[column] = df[column].astype("category")
+        elif column in DATE_COLUMNS:
+            df[column] = pd.to_datetime(df[column], errors="coerce", format="ISO8601")
+    return df
+
+
+def read_table(conn, table, columns=None, compact=True):
+    """SELECT ``columns`` (default: all) from ``table`` as a DataFrame.
+
+    Column names are checked against the table's schema before they go
+    into the SQL. With ``compact`` the result goes through compact_frame().
+    """
+    known = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    if not known:
+        raise ValueError(f"Unknown table: {table}")
+    if columns:
+        unknown = [c for c in columns if c not in known]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+    df = pd.read_sql(f"SELECT {', '.join(columns or known)} FROM {table}", conn)
+    return compact_frame(df) if compact else df
+
+
+def bytes_per_row(df):
+    """Deep memory usage per row (0 for an empty frame)."""
+    return int(df.memory_usage(index=True, deep=True).sum()) / len(df) if len(df) else 0
@@ -1,44 +1,209 @@
+from itertools import islice
+
 import pandas as pd
-from app.data.db import connect_database
+from app.data.db import connection, writer
+from app.data.dates import to_iso, to_iso_dates
+from app.data.snapshots import load_table
+from app.data.metrics import instrumented
+from app.data.query import ITER_BATCH_SIZE, iter_table, query
+from app.data import search as fts
+from app.data.search import search
+
+INSERT_INCIDENT_SQL = """
+    INSERT INTO cyber_incidents
+    (date_reported, incident_type, severity, status, description, reported_by)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
 
+@instrumented
 def insert_incident(date_reported, incident_type, severity, status, description, reported_by):
-    """Insert a new cyber incident"""
+    """Insert a new cyber incident
+
+    Goes through the shared group-commit writer, so concurrent saves share
+    one transaction and one commit. Returns the new id.
+    """
     try:
-        conn = connect_database()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO cyber_incidents 
-            (date_reported, incident_type, severity, status, description, reported_by)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (date_reported, incident_type, severity, status, description, reported_by))
-        
-        incident_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return incident_id
+        return writer().execute(
+            INSERT_INCIDENT_SQL,
+            (date_reported, incident_type, severity, status, description, reported_by),
+        )
     except Exception as e:
         print(f"Error inserting incident: {e}")
         return None
 
-def get_all_incidents():
-    conn = connect_database()
-    df = pd.read_sql_query("SELECT * FROM cyber_incidents", conn)
-    conn.close()
-    return df
+@instrumented
+def get_all_incidents(columns=None, compact=True):
+    """All incidents as a DataFrame (see app.data.snapshots.load_table)."""
+    with connection() as conn:
+        return load_table(conn, "cyber_incidents", columns, compact)
+
+def iter_incidents(batch_size=ITER_BATCH_SIZE, columns=None, where=None, frames=True, compact=True):
+    """Incidents in id order, ``batch_size`` rows at a time, without loading the table.
+
+    Yields DataFrame chunks (or row tuples with ``frames=False``) from one
+    fetchmany() cursor, so memory stays at one batch whatever the table
+    size. ``where`` takes query() filters, e.g. {"status": "Open"}.
+    """
+    return iter_table("cyber_incidents", batch_size, columns, where, frames, compact)
+
+@instrumented
+def incidents_between(start, end, columns=None, compact=True):
+    """Incidents with date_reported in [start, end], oldest first.
+
+    ``start``/``end`` are dates or date strings. Served from the
+    date_reported index (dates are stored as ISO-8601 text).
+    """
+    q = query("cyber_incidents").where(date_reported__between=(to_iso(start), to_iso(end)))
+    if columns:
+        q = q.select(*columns)
+    return q.order_by("date_reported", "id").to_frame(compact)
+
+@instrumented
 def update_incident_status(incident_id, new_status):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE cyber_incidents SET status = ? WHERE id = ?",
-        (new_status, incident_id)
-    )
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        conn.execute(
+            "UPDATE cyber_incidents SET status = ? WHERE id = ?",
+            (new_status, incident_id)
+        )
+        conn.commit()
 
+@instrumented
 def delete_incident(incident_id):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM cyber_incidents WHERE id = ?", (incident_id,))
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    with connection() as conn:
+        conn.execute("DELETE FROM cyber_incidents WHERE id = ?", (incident_id,))
+        conn.commit()
+
+@instrumented
+def search_incidents(query, limit=50):
+    """Full-text search over incident descriptions/types, best match first."""
+    with connection() as conn:
+        return search(conn, "cyber_incidents", query, limit)
+
+
+INCIDENT_COLUMNS = ["date_reported", "incident_type", "severity", "status", "description", "reported_by"]
+BULK_BATCH_SIZE = 50_000
+# Batches at least this big swap the per-row FTS trigger for one set-based
+# index insert; smaller ones (e.g. the threat feed's micro-batches) keep the
+# trigger, since dropping/recreating it is a schema change that makes every
+# connection re-prepare its statements.
+FTS_SWAP_MIN_ROWS = 10_000
+_DATE = INCIDENT_COLUMNS.index("date_reported")
+IN_LIST_LIMIT = 500  # above this many ids, match through a temp table instead of IN (...)
+
+
+def _begin(conn):
+    """Take the write lock up front (unless a caller's transaction is open)."""
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
+def _incident_tuples(rows):
+    """Yield one tuple per incident from tuples, dicts or a DataFrame."""
+    if isinstance(rows, pd.DataFrame):
+        frame = rows.reindex(columns=INCIDENT_COLUMNS).astype(object)
+        frame = frame.where(frame.notna(), None)
+        yield from frame.itertuples(index=False, name=None)
+        return
+    for row in rows:
+        if isinstance(row, dict):
+            yield tuple(row.get(c) for c in INCIDENT_COLUMNS)
+        else:
+            yield tuple(row)
+
+
+def _iso_dates(batch):
+    """The batch with date_reported as ISO text, whatever shape the rows came in."""
+    iso = to_iso_dates(pd.Series([row[_DATE] for row in batch], dtype=object)).tolist()
+    return [row[:_DATE] + (date,) + row[_DATE + 1:] for row, date in zip(batch, iso)]
+
+
+@instrumented
+def insert_incidents_bulk(rows, batch_size=None):
+    """Insert many incidents with executemany, one transaction per batch.
+
+    ``rows`` is an iterable of tuples (in INCIDENT_COLUMNS order), dicts or
+    a DataFrame. By default everything goes in a single transaction; with
+    ``batch_size`` a commit happens every ``batch_size`` rows so a huge
+    import doesn't hold the write lock throughout.
+
+    Dates are stored as ISO text for every input shape. For batches of
+    FTS_SWAP_MIN_ROWS or more the per-row FTS trigger is swapped for one
+    set-based index insert (inside the batch's transaction, so nobody sees
+    it missing), which roughly halves the cost of a large insert.
+
+    Returns the assigned ids as a list of ranges: a single range, unless
+    another writer got in between two batch commits.
+    """
+    sql = (f"INSERT INTO cyber_incidents ({', '.join(INCIDENT_COLUMNS)}) "
+           f"VALUES ({', '.join('?' for _ in INCIDENT_COLUMNS)})")
+    tuples = _incident_tuples(rows)
+    ranges = []
+    with connection() as conn:
+        indexed = fts.search_installed(conn)
+        _begin(conn)
+        while True:
+            batch = list(islice(tuples, batch_size or BULK_BATCH_SIZE))
+            if not batch:
+                break
+            swap = indexed and len(batch) >= FTS_SWAP_MIN_ROWS
+            if swap:
+                fts.drop_triggers(conn, ["cyber_incidents"])
+            conn.executemany(sql, _iso_dates(batch))
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            ranges.append(range(last_id - len(batch) + 1, last_id + 1))
+            if swap:
+                fts.index_rows(conn, "cyber_incidents", ranges[-1].start, last_id)
+                fts.install_triggers(conn, ["cyber_incidents"])
+            if batch_size:
+                conn.commit()
+                _begin(conn)
+        conn.commit()
+    return _merge_ranges(ranges)
+
+
+def _merge_ranges(ranges):
+    merged = []
+    for r in ranges:
+        if merged and merged[-1].stop == r.start:
+            merged[-1] = range(merged[-1].start, r.stop)
+        else:
+            merged.append(r)
+    return merged
+
+
+def _match_ids(conn, ids):
+    """SQL fragment + params selecting ``ids`` (IN list, or a temp table)."""
+    if len(ids) <= IN_LIST_LIMIT:
+        return f"id IN ({', '.join('?' for _ in ids)})", ids
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS bulk_ids (id INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM temp.bulk_ids")
+    conn.executemany("INSERT OR IGNORE INTO temp.bulk_ids (id) VALUES (?)", ((i,) for i in ids))
+    return "id IN (SELECT id FROM temp.bulk_ids)", []
+
+
+@instrumented
+def update_incident_status_bulk(incident_ids, new_status):
+    """Set ``status`` on many incidents in one statement. Returns rows updated."""
+    ids = [int(i) for i in incident_ids]
+    if not ids:
+        return 0
+    with connection() as conn:
+        _begin(conn)
+        match, params = _match_ids(conn, ids)
+        cur = conn.execute(f"UPDATE cyber_incidents SET status = ? WHERE {match}", [new_status, *params])
+        conn.commit()
+        return cur.rowcount
+
+
+@instrumented
+def delete_incidents_bulk(incident_ids):
+    """Delete many incidents in one statement. Returns rows deleted."""
+    ids = [int(i) for i in incident_ids]
+    if not ids:
+        return 0
+    with connection() as conn:
+        _begin(conn)
+        match, params = _match_ids(conn, ids)
+        cur = conn.execute(f"DELETE FROM cyber_incidents WHERE {match}", params)
+        conn.commit()
+        return cur.rowcount
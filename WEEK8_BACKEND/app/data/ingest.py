@@ -0,0 +1,349 @@
+# app/data/ingest.py
+import time
+from pathlib import Path
+
+import pandas as pd
+from app.data import manifest
+from app.data.dates import normalize_dates
+
+DEFAULT_CHUNK_SIZE = 50_000
+# Loads bringing less new CSV data than this into a table keep its
+# maintenance triggers (counters, versions, FTS, rollups, change log) on.
+PAUSE_ABOVE_BYTES = 4 << 20
+
+# CSV columns that identify a row; tables not listed key on the whole row.
+NATURAL_KEYS = {
+    "cyber_incidents": ["Title", "Date"],
+    "datasets_metadata": ["dataset_name", "source_organization"],
+}
+# Columns analysts own once a row exists: the CSV only seeds them, so a
+# re-ingest never overwrites them (e.g. an incident's status).
+ANALYST_COLUMNS = {
+    "cyber_incidents": ["status", "severity"],
+    "it_tickets": ["status", "assigned_to", "resolved_date"],
+}
+
+# Identifier columns built from source_key: unique across all of a table's
+# files and unchanged when other lines move (the mappers number by position).
+KEY_IDS = {
+    "it_tickets": ("ticket_id", "TICKET_"),
+}
+
+# Mapper output -> schema.py columns.
+COLUMN_RENAMES = {
+    "it_tickets": {"date_created": "created_date"},
+}
+# Columns the schema needs but the mappers don't produce: copied from another column.
+COLUMN_COPIES = {
+    "it_tickets": {"subject": "description"},
+}
+# Fallbacks for NOT NULL columns so a blank CSV cell doesn't reject the row.
+NOT_NULL_DEFAULTS = {
+    "datasets_metadata": {"dataset_name": "Unknown Dataset"},
+    "it_tickets": {"subject": "No subject"},
+}
+
+
+def table_columns(conn, table):
+    """Insertable columns of a schema table (no id / created_at)."""
+    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    if not rows:
+        raise ValueError(f"Table '{table}' does not exist - run create_all_tables() first")
+    return [r[1] for r in rows if r[1] not in ("id", "created_at")]
+
+
+def _key_text(frame):
+    """Key columns as text, so a value hashes the same whichever dtype a chunk inferred."""
+    text = {}
+    for column in frame.columns:
+        values = frame[column]
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            values = values.astype("Float64")  # 7 and 7.0 (a chunk with blanks) agree
+        text[column] = values.astype(object).where(values.notna(), "").astype(str)
+    return pd.DataFrame(text, index=frame.index)
+
+
+class RowKeys:
+    """source_key for the rows of one CSV: hash of (file name, natural key, occurrence).
+
+    The natural key is the table's NATURAL_KEYS columns, or the whole row
+    when it has none, so a row keeps its key when other lines are added,
+    removed or moved. The occurrence (0 for the first row with a given
+    natural key, 1 for the next, ...) tells true duplicates apart; it is
+    counted across chunks, so use one RowKeys per pass over a file.
+    """
+
+    def __init__(self, csv_path, table):
+        self.source = Path(csv_path).name
+        self.table = table
+        self.key_columns = NATURAL_KEYS.get(table)
+        self._seen = pd.Series(dtype="uint64")  # natural-key hash -> rows seen so far
+
+    def __call__(self, raw):
+        columns = [c for c in self.key_columns or () if c in raw.columns] or list(raw.columns)
+        natural = pd.Series(pd.util.hash_pandas_object(_key_text(raw[columns]), index=False).to_numpy())
+        before = natural.map(self._seen).fillna(0).astype("uint64").to_numpy()
+        occurrence = before + natural.groupby(natural).cumcount().to_numpy(dtype="uint64")
+        self._seen = self._seen.add(natural.value_counts(), fill_value=0).astype("uint64")
+        frame = pd.DataFrame({"source": self.source, "key": natural.to_numpy(), "n": occurrence})
+        hashed = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+        return pd.Series(hashed.view("int64"), index=raw.index)
+
+    def prime(self, csv_path, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Count the first ``rows`` rows of the file (before an append-only read of its tail)."""
+        if rows:
+            for raw in pd.read_csv(csv_path, nrows=rows, chunksize=chunk_size):
+                self(raw)
+        return self
+
+
+def read_chunks(csv_path, chunk_size, byte_offset=0, first_row=0):
+    """pd.read_csv in chunks, optionally starting at a byte offset.
+
+    Reading from ``byte_offset`` lets an append-only file load just its new
+    tail; ``first_row`` keeps the frame index (and so ticket numbering)
+    continuous with what was loaded before.
+    """
+    if not byte_offset:
+        yield from pd.read_csv(csv_path, chunksize=chunk_size)
+        return
+
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    with open(csv_path, "rb") as fh:
+        fh.seek(byte_offset)
+        for chunk in pd.read_csv(fh, header=None, names=header, chunksize=chunk_size):
+            chunk.index = chunk.index + first_row
+            yield chunk
+
+
+def map_chunk(raw, mapper, keys):
+    """Run the table's mapper and attach each row's source_key / source_file."""
+    mapped = mapper(raw)
+    source_keys = keys(raw).to_numpy()
+    mapped["source_key"] = source_keys
+    mapped["source_file"] = keys.source
+    if keys.table in KEY_IDS:
+        column, prefix = KEY_IDS[keys.table]
+        mapped[column] = [f"{prefix}{key:016X}" for key in source_keys.view("uint64")]
+    return mapped
+
+
+def prepare_chunk(table, df, columns):
+    """Align a mapped DataFrame with the table and return (columns, row tuples)."""
+    df = df.rename(columns=COLUMN_RENAMES.get(table, {}))
+    for target, source in COLUMN_COPIES.get(table, {}).items():
+        if target not in df.columns and source in df.columns:
+            df[target] = df[source]
+    for column, default in NOT_NULL_DEFAULTS.get(table, {}).items():
+        if column in df.columns:
+            df[column] = df[column].fillna(default)
+    normalize_dates(table, df)
+
+    used = [c for c in columns if c in df.columns]
+    values = df[used].astype(object)
+    values = values.where(values.notna(), None)
+    return used, list(values.itertuples(index=False, name=None))
+
+
+def insert_rows(conn, table, columns, rows, upsert=False):
+    """executemany() one batch; returns {"inserted", "updated", "unchanged", "ignored"}.
+
+    Plain inserts skip rows that hit a UNIQUE constraint (counted as
+    "ignored"); with ``upsert``
+    a row whose source_key already exists is updated in place, unless
+    every column already holds the incoming value (then it is left alone,
+    so no trigger fires for it). ANALYST_COLUMNS are only written on
+    insert. The counts come from the statement's own row count and the
+    new ids, never from total_changes (which includes what triggers wrote).
+    """
+    placeholders = ", ".join("?" for _ in columns)
+    if upsert:
+        kept = {"source_key", "source_file", *ANALYST_COLUMNS.get(table, ())}
+        compared = [c for c in columns if c not in kept]
+        updates = ", ".join(f"{c} = excluded.{c}" for c in compared)
+        same = " AND ".join(f"{c} IS excluded.{c}" for c in compared)
+        sql = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+               f"ON CONFLICT(source_key) DO UPDATE SET {updates} WHERE NOT ({same})")
+    else:
+        sql = f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    last_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+    changed = conn.executemany(sql, rows).rowcount
+    inserted = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE id > ?", (last_id,)).fetchone()[0]
+    if not upsert:
+        return {"inserted": inserted, "updated": 0, "unchanged": 0, "ignored": len(rows) - inserted}
+    return {"inserted": inserted, "updated": changed - inserted, "unchanged": len(rows) - changed,
+            "ignored": 0}
+
+
+def add_counts(stats, counts):
+    stats["rows_inserted"] += counts["inserted"]
+    stats["rows_updated"] += counts["updated"]
+    stats["rows_unchanged"] += counts["unchanged"]
+    stats["rows_ignored"] += counts["ignored"]
+
+
+def empty_stats(csv_path, table):
+    return {"file": str(csv_path), "table": table, "rows_read": 0, "rows_inserted": 0,
+            "rows_updated": 0, "rows_unchanged": 0, "rows_ignored": 0, "rows_deleted": 0,
+            "chunks": 0}
+
+
+def _seen_keys(conn):
+    """Per-connection temp table of the keys each file's current read has produced."""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS ingest_seen "
+                 "(source_file TEXT, source_key INTEGER, PRIMARY KEY (source_file, source_key))")
+
+
+def remember_keys(conn, csv_path, rows, columns):
+    """Note the source_keys of a batch read from ``csv_path`` (see delete_missing_rows)."""
+    _seen_keys(conn)
+    at = columns.index("source_key")
+    name = Path(csv_path).name
+    conn.executemany("INSERT OR IGNORE INTO temp.ingest_seen VALUES (?, ?)",
+                     [(name, row[at]) for row in rows])
+
+
+def forget_keys(conn, csv_path):
+    _seen_keys(conn)
+    conn.execute("DELETE FROM temp.ingest_seen WHERE source_file = ?", (Path(csv_path).name,))
+
+
+def delete_missing_rows(conn, table, csv_path):
+    """Delete rows loaded from ``csv_path`` whose key the last full read didn't see."""
+    name = Path(csv_path).name
+    deleted = conn.execute(
+        f"DELETE FROM {table} WHERE source_file = ? AND source_key NOT IN "
+        f"(SELECT source_key FROM temp.ingest_seen WHERE source_file = ?)",
+        (name, name),
+    ).rowcount
+    forget_keys(conn, csv_path)
+    return deleted
+
+
+def stream_csv(conn, csv_path, table, mapper, chunk_size=DEFAULT_CHUNK_SIZE, replace=True,
+               upsert=False, byte_offset=0, first_row=0):
+    """Stream one CSV into an existing table, one transaction per chunk.
+
+    Only ``chunk_size`` rows are held in memory at a time. With ``replace``
+    the table's old rows are cleared in the first transaction, keeping the
+    schema (AUTOINCREMENT, UNIQUE, defaults) intact. An upsert of the whole
+    file (no ``byte_offset``) remembers the keys it saw, for
+    delete_missing_rows().
+
+    Returns a stats dict with rows read/inserted/updated/unchanged, chunks
+    and rows/sec.
+    """
+    columns = table_columns(conn, table)
+    stats = empty_stats(csv_path, table)
+    start = time.perf_counter()
+
+    keys = RowKeys(csv_path, table).prime(csv_path, first_row if byte_offset else 0, chunk_size)
+    track = upsert and not byte_offset
+
+    if replace:
+        conn.execute(f"DELETE FROM {table}")
+    if track:
+        forget_keys(conn, csv_path)
+
+    try:
+        for raw in read_chunks(csv_path, chunk_size, byte_offset, first_row):
+            used, rows = prepare_chunk(table, map_chunk(raw, mapper, keys), columns)
+            add_counts(stats, insert_rows(conn, table, used, rows, upsert))
+            if track:
+                remember_keys(conn, csv_path, rows, used)
+            conn.commit()
+            stats["rows_read"] += len(raw)
+            stats["chunks"] += 1
+    except Exception:
+        conn.rollback()
+        raise
+
+    if replace and stats["chunks"] == 0:
+        conn.commit()
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["rows_per_sec"] = stats["rows_read"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def reset_tables(conn, tables):
+    """Empty tables and forget their files, forcing a full reload next time."""
+    for table in tables:
+        conn.execute(f"DELETE FROM {table}")
+        manifest.forget_table(conn, table)
+    conn.commit()
+
+
+def plan_files(conn, csv_files):
+    """Plan every file before loading: {path: (action, entry, fp)}.
+
+    Runs manifest.sync_table() per table first. Only the first file of a
+    table that needs a "full" load keeps that action; later ones upsert,
+    so they can't clear rows another file just loaded.
+    """
+    for table in set(csv_files.values()):
+        manifest.sync_table(conn, table)
+    plans, cleared = {}, set()
+    for csv_path, table in csv_files.items():
+        action, entry, fp = manifest.plan_load(conn, csv_path, table)
+        if action == "full":
+            if table in cleared:
+                action = "upsert"
+            cleared.add(table)
+        plans[csv_path] = (action, entry, fp)
+    return plans
+
+
+def bulk_tables(csv_files, plans):
+    """Tables whose planned load is big enough to pause maintenance for.
+
+    Counts the bytes a "full" or "append" load will insert; "upsert"
+    re-reads a file but only writes the rows that really changed, so it
+    keeps the triggers, as do skipped files.
+    """
+    new_bytes = {}
+    for csv_path, (action, entry, fp) in plans.items():
+        if action in ("full", "append"):
+            size = fp["size_bytes"] - (entry["size_bytes"] if action == "append" else 0)
+            table = csv_files[csv_path]
+            new_bytes[table] = new_bytes.get(table, 0) + size
+    return {table for table, size in new_bytes.items() if size > PAUSE_ABOVE_BYTES}
+
+
+def ingest_incremental(conn, csv_path, table, mapper, chunk_size=DEFAULT_CHUNK_SIZE, plan=None):
+    """Load a CSV only as far as it changed since the last run.
+
+    Uses the ingest_manifest table: unchanged files are skipped, files that
+    only grew load just the appended rows, and edited files are re-read
+    and upserted by source_key (rows no longer in the file are deleted).
+    Call manifest.sync_table() once per table first, or pass the file's
+    ``plan`` from plan_files(). The returned stats include the ``action``
+    taken.
+    """
+    action, entry, fp = plan or manifest.plan_load(conn, csv_path, table)
+
+    if action == "skip":
+        stats = {**empty_stats(csv_path, table), "seconds": 0.0, "rows_per_sec": 0.0}
+        if fp is not None:  # touched but identical: remember the new mtime
+            manifest.save_entry(conn, csv_path, table, fp, entry["rows_loaded"])
+            conn.commit()
+    elif action == "append":
+        stats = stream_csv(conn, csv_path, table, mapper, chunk_size, replace=False,
+                           upsert=True, byte_offset=entry["size_bytes"],
+                           first_row=entry["rows_loaded"])
+    else:
+        # a first load into an emptied table has nothing to upsert against
+        stats = stream_csv(conn, csv_path, table, mapper, chunk_size,
+                           replace=(action == "full"), upsert=(action == "upsert"))
+
+    if action != "skip":
+        rows_loaded = stats["rows_read"] + (entry["rows_loaded"] if action == "append" else 0)
+        if action == "upsert":
+            stats["rows_deleted"] = delete_missing_rows(conn, table, csv_path)
+        manifest.save_entry(conn, csv_path, table, fp, rows_loaded)
+        conn.commit()
+
+    stats["action"] = action
+    return stats
@@ -0,0 +1,82 @@
+# app/data/maintenance.py
+# Trigger-maintained side structures (KPI counters, table versions, FTS
+# search indexes, trend rollups, change log, ...).
+# A bulk load drops their row-by-row triggers, then brings each structure
+# up to date in one pass and reinstalls the triggers.
+from contextlib import contextmanager
+
+from app.data import changes, counters, rollups, search, versions
+
+# name -> hooks, each taking (conn, tables) except "installed" (conn)
+MAINTAINED = {
+    "kpi_counters": {
+        "tables": counters.COUNTER_DIMENSIONS,
+        "installed": counters.counters_installed,
+        "drop": counters.drop_triggers,
+        "refresh": counters.rebuild_counters,
+        "install": counters.install_triggers,
+    },
+    "table_versions": {
+        "tables": versions.VERSIONED_TABLES,
+        "installed": versions.versions_installed,
+        "drop": versions.drop_triggers,
+        "refresh": versions.bump_versions,
+        "install": versions.install_triggers,
+    },
+    "search": {
+        "tables": search.SEARCH_INDEXES,
+        "installed": search.search_installed,
+        "drop": search.drop_triggers,
+        "refresh": search.rebuild_search,
+        "install": search.install_triggers,
+    },
+    "rollups": {
+        "tables": rollups.ROLLUP_TABLES,
+        "installed": rollups.rollups_installed,
+        "drop": rollups.drop_triggers,
+        "refresh": rollups.rebuild_rollups,
+        "install": rollups.install_triggers,
+    },
+    "change_log": {
+        "tables": changes.CHANGE_TABLES,
+        "installed": changes.change_log_installed,
+        "drop": changes.drop_triggers,
+        "refresh": changes.log_reset,
+        "install": changes.install_triggers,
+    },
+}
+
+
+@contextmanager
+def maintenance_paused(conn, tables):
+    """Suspend maintenance triggers on ``tables`` for a bulk load.
+
+    Work inside the block is committed on success and rolled back on error;
+    either way every structure is refreshed and its triggers reinstalled
+    in a single transaction afterwards.
+    """
+    active = []
+    for hooks in MAINTAINED.values():
+        affected = [t for t in tables if t in hooks["tables"]]
+        if affected and hooks["installed"](conn):
+            active.append((hooks, affected))
+
+    if not active:
+        yield
+        return
+
+    for hooks, affected in active:
+        hooks["drop"](conn, affected)
+    conn.commit()
+    try:
+        yield
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("BEGIN")
+        for hooks, affected in active:
+            hooks["refresh"](conn, affected)
+            hooks["install"](conn, affected)
+        conn.commit()
@@ -0,0 +1,138 @@
+# app/data/manifest.py
+import hashlib
+import os
+from pathlib import Path
+
+BLOCK_SIZE = 1 << 20  # 1 MB reads while hashing
+
+
+def source_name(csv_path):
+    return str(Path(csv_path).resolve())
+
+
+def fingerprint(csv_path, prefix_size=0):
+    """Size, mtime and sha256 of a file, in a single pass.
+
+    When ``prefix_size`` is given the hash of the first ``prefix_size`` bytes
+    is returned too, so an append-only file can be recognised without
+    reading it twice. ``prefix_ends_line`` tells whether that prefix ended
+    on a newline (i.e. on a CSV record boundary).
+    """
+    stat = os.stat(csv_path)
+    full = hashlib.sha256()
+    prefix = hashlib.sha256()
+    remaining = prefix_size if 0 < prefix_size <= stat.st_size else 0
+    last_prefix_byte = b""
+
+    with open(csv_path, "rb") as fh:
+        for block in iter(lambda: fh.read(BLOCK_SIZE), b""):
+            full.update(block)
+            if remaining:
+                head = block[:remaining]
+                prefix.update(head)
+                last_prefix_byte = head[-1:]
+                remaining -= len(head)
+
+    return {
+        "size_bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "content_hash": full.hexdigest(),
+        "prefix_hash": prefix.hexdigest() if prefix_size else None,
+        "prefix_ends_line": last_prefix_byte == b"\n",
+    }
+
+
+def get_entry(conn, csv_path):
+    """Manifest row for a file as a dict, or None if it was never loaded."""
+    cursor = conn.execute(
+        """SELECT source_file, table_name, size_bytes, mtime_ns, content_hash, rows_loaded
+           FROM ingest_manifest WHERE source_file = ?""",
+        (source_name(csv_path),),
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([d[0] for d in cursor.description], row))
+
+
+def save_entry(conn, csv_path, table, fp, rows_loaded):
+    """Record (or replace) the manifest row for a file. Caller commits."""
+    conn.execute(
+        """INSERT INTO ingest_manifest
+           (source_file, table_name, size_bytes, mtime_ns, content_hash, rows_loaded, loaded_at)
+           VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+           ON CONFLICT(source_file) DO UPDATE SET
+               table_name = excluded.table_name,
+               size_bytes = excluded.size_bytes,
+               mtime_ns = excluded.mtime_ns,
+               content_hash = excluded.content_hash,
+               rows_loaded = excluded.rows_loaded,
+               loaded_at = excluded.loaded_at""",
+        (source_name(csv_path), table, fp["size_bytes"], fp["mtime_ns"],
+         fp["content_hash"], rows_loaded),
+    )
+
+
+def forget_file(conn, csv_path):
+    """Drop a file from the manifest so the next run reloads it in full."""
+    conn.execute("DELETE FROM ingest_manifest WHERE source_file = ?", (source_name(csv_path),))
+    conn.commit()
+
+
+def forget_table(conn, table):
+    """Drop every manifest row that targets ``table``."""
+    conn.execute("DELETE FROM ingest_manifest WHERE table_name = ?", (table,))
+    conn.commit()
+
+
+def table_is_managed(conn, table):
+    """True once at least one CSV for ``table`` has been recorded."""
+    row = conn.execute(
+        "SELECT 1 FROM ingest_manifest WHERE table_name = ? LIMIT 1", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def sync_table(conn, table):
+    """Forget a table's files if its rows were wiped outside the ingest.
+
+    Called once per table before planning, so a table emptied by hand is
+    reloaded in full instead of every file being reported as unchanged.
+    """
+    has_rows = conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is not None
+    if not has_rows:
+        loaded = conn.execute(
+            "SELECT 1 FROM ingest_manifest WHERE table_name = ? AND rows_loaded > 0 LIMIT 1",
+            (table,),
+        ).fetchone()
+        if loaded:
+            forget_table(conn, table)
+
+
+def plan_load(conn, csv_path, table):
+    """Decide how to (re)load a file.
+
+    Returns (action, entry, fp) where action is one of:
+      "full"   - first file ever loaded into the table: clear it and load
+      "skip"   - unchanged since the last load
+      "append" - old content is an unchanged prefix: load only the new tail
+      "upsert" - content changed, or a new file for a table that already
+                 has others: load every row, upserting by source_key
+    """
+    entry = get_entry(conn, csv_path)
+    if entry is None or entry["table_name"] != table:
+        action = "upsert" if table_is_managed(conn, table) else "full"
+        return action, None, fingerprint(csv_path)
+
+    stat = os.stat(csv_path)
+    if stat.st_size == entry["size_bytes"] and stat.st_mtime_ns == entry["mtime_ns"]:
+        return "skip", entry, None
+
+    fp = fingerprint(csv_path, prefix_size=entry["size_bytes"])
+    if fp["content_hash"] == entry["content_hash"]:
+        return "skip", entry, fp  # touched but identical
+    if (fp["size_bytes"] > entry["size_bytes"]
+            and fp["prefix_hash"] == entry["content_hash"]
+            and fp["prefix_ends_line"]):
+        return "append", entry, fp
+    return "upsert", entry, fp
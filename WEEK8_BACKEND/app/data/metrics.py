@@ -0,0 +1,294 @@
+# app/data/metrics.py
+# In-process instrumentation for the data layer.
+#
+# - @instrumented wraps a data-access function and records calls, errors,
+#   a latency histogram (p50/p95/p99 from recent samples), rows returned
+#   and bytes materialized (deep DataFrame size, strings included; it is
+#   measured after the latency is taken).
+# - InstrumentedConnection (the factory of every pooled, writer and
+#   connect_database() connection) times each statement including its
+#   fetches; statements slower than the threshold go to the slow-query
+#   log with their SQL, the shape of their parameters (never the values)
+#   and EXPLAIN QUERY PLAN. The threshold is one process-wide setting
+#   (set_slow_query_seconds); the log file is written by a logging
+#   QueueListener thread, so a slow statement never waits on file I/O.
+# - prometheus_text() / export_prometheus() render everything in the
+#   Prometheus text exposition format.
+import atexit
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "DATA"
+PROMETHEUS_PATH = DATA_DIR / "metrics.prom"
+SLOW_LOG_PATH = DATA_DIR / "slow_queries.log"
+
+# histogram bucket upper bounds, seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SAMPLES = 2048                   # recent latencies kept per function for percentiles
+SLOW_QUERY_SECONDS = 0.1         # statements slower than this are logged
+SLOW_LOG_SIZE = 200              # slow queries kept in memory
+
+
+class _FunctionStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+        self.samples = deque(maxlen=SAMPLES)
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class Metrics:
+    """Thread-safe registry of per-function stats and the slow-query log."""
+
+    def __init__(self):
+        self._functions = {}
+        self._slow = deque(maxlen=SLOW_LOG_SIZE)
+        self._slow_total = 0
+        self._lock = threading.Lock()
+        self.slow_query_seconds = SLOW_QUERY_SECONDS
+        self.slow_log_path = SLOW_LOG_PATH  # None: memory only; read when the log first starts
+        self._slow_logger = None
+
+    def record_call(self, name, seconds, rows=None, size=None, error=False):
+        with self._lock:
+            stats = self._functions.get(name)
+            if stats is None:
+                stats = self._functions[name] = _FunctionStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.seconds += seconds
+            stats.rows += rows or 0
+            stats.bytes += size or 0
+            stats.buckets[bisect_left(BUCKETS, seconds)] += 1
+            stats.samples.append(seconds)
+
+    def set_slow_query_seconds(self, seconds):
+        """Change the slow-query threshold for every connection and session in this process."""
+        if seconds <= 0:
+            raise ValueError("The slow-query threshold must be positive")
+        self.slow_query_seconds = seconds
+
+    def _file_logger(self):
+        """Logger for the slow-query file: a QueueHandler feeding a background listener."""
+        with self._lock:
+            if self._slow_logger is None and self.slow_log_path is not None:
+                path = Path(self.slow_log_path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                handler = logging.FileHandler(path, encoding="utf-8", delay=True)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                records = queue.SimpleQueue()
+                listener = logging.handlers.QueueListener(records, handler)
+                listener.start()
+                atexit.register(listener.stop)  # writes what's still queued
+                logger = logging.getLogger("platform.slow_queries")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                logger.handlers[:] = [logging.handlers.QueueHandler(records)]
+                self._slow_logger = logger
+            return self._slow_logger
+
+    def record_slow_query(self, entry):
+        with self._lock:
+            self._slow.append(entry)
+            self._slow_total += 1
+        logger = self._file_logger()
+        if logger is not None:
+            logger.info(json.dumps(entry))
+
+    def functions(self):
+        """One row per instrumented function: calls, errors, p50/p95/p99 (ms), rows, bytes."""
+        rows = []
+        with self._lock:
+            for name, s in self._functions.items():
+                ordered = sorted(s.samples)
+                rows.append({
+                    "function": name, "calls": s.calls, "errors": s.errors,
+                    "p50_ms": _percentile(ordered, 0.50) * 1000,
+                    "p95_ms": _percentile(ordered, 0.95) * 1000,
+                    "p99_ms": _percentile(ordered, 0.99) * 1000,
+                    "total_s": s.seconds, "rows": s.rows, "bytes": s.bytes,
+                })
+        columns = ["function", "calls", "errors", "p50_ms", "p95_ms", "p99_ms", "total_s", "rows", "bytes"]
+        return pd.DataFrame(rows, columns=columns).sort_values("total_s", ascending=False, ignore_index=True)
+
+    def slow_queries(self):
+        """Newest first."""
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._functions.clear()
+            self._slow.clear()
+            self._slow_total = 0
+
+    def prometheus_text(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def family(metric, kind, help_text):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+
+        with self._lock:
+            items = sorted(self._functions.items())
+            family("platform_data_calls_total", "counter", "Calls per data-access function.")
+            lines += [f'platform_data_calls_total{{function="{n}"}} {s.calls}' for n, s in items]
+            family("platform_data_errors_total", "counter", "Calls that raised.")
+            lines += [f'platform_data_errors_total{{function="{n}"}} {s.errors}' for n, s in items]
+            family("platform_data_rows_total", "counter", "Rows returned.")
+            lines += [f'platform_data_rows_total{{function="{n}"}} {s.rows}' for n, s in items]
+            family("platform_data_bytes_total", "counter", "Bytes materialized in returned DataFrames.")
+            lines += [f'platform_data_bytes_total{{function="{n}"}} {s.bytes}' for n, s in items]
+            family("platform_data_duration_seconds", "histogram", "Latency of data-access functions.")
+            for name, s in items:
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float("inf"),), s.buckets):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'platform_data_duration_seconds_bucket{{function="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'platform_data_duration_seconds_sum{{function="{name}"}} {s.seconds}')
+                lines.append(f'platform_data_duration_seconds_count{{function="{name}"}} {s.calls}')
+            family("platform_slow_queries_total", "counter", "Statements slower than the slow-query threshold.")
+            lines.append(f"platform_slow_queries_total {self._slow_total}")
+        return "\n".join(lines) + "\n"
+
+    def export_prometheus(self, path=None):
+        """Write prometheus_text() atomically (for a node_exporter textfile collector)."""
+        path = Path(path or PROMETHEUS_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.prometheus_text(), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+
+metrics = Metrics()
+
+
+def _size(result):
+    """(rows, bytes) for a returned value: DataFrames and lists of rows count."""
+    if isinstance(result, pd.DataFrame):
+        return len(result), int(result.memory_usage(index=True, deep=True).sum())
+    if isinstance(result, list):
+        return len(result), None
+    return None, None
+
+
+def instrumented(fn):
+    """Decorator: record calls/latency/rows/bytes of ``fn`` under module.qualname."""
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            metrics.record_call(name, time.perf_counter() - start, error=True)
+            raise
+        rows, size = _size(result)
+        metrics.record_call(name, time.perf_counter() - start, rows, size)
+        return result
+
+    return wrapper
+
+
+# ---------- statement timing / slow-query log ----------
+
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+def _params_shape(params):
+    """How many/what kind of parameters, without their values."""
+    if isinstance(params, dict):
+        return f"named: {', '.join(sorted(params))}"
+    if not params:
+        return "none"
+    return f"{len(params)} positional: {', '.join(type(p).__name__ for p in params)}"
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor timing each statement from execute through its fetches."""
+
+    _sql, _params, _elapsed, _logged = None, None, 0.0, True
+
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self._elapsed += time.perf_counter() - start
+            if not self._logged and self._elapsed >= metrics.slow_query_seconds:
+                self._logged = True
+                log_slow_query(self.connection, self._sql, self._params, self._elapsed)
+
+    def execute(self, sql, params=()):
+        self._sql, self._params, self._elapsed, self._logged = sql, params, 0.0, False
+        return self._timed(super().execute, sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        self._sql, self._params, self._elapsed, self._logged = sql, None, 0.0, False
+        return self._timed(super().executemany, sql, seq_of_params)
+
+    def fetchone(self):
+        return self._timed(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._timed(super().fetchmany, *(() if size is None else (size,)))
+
+    def fetchall(self):
+        return self._timed(super().fetchall)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection whose cursors (and execute shortcuts) are timed."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+
+def log_slow_query(conn, sql, params, seconds):
+    """Record one slow statement with its query plan (params=None: executemany)."""
+    statement = " ".join(sql.split())
+    plan = []
+    if params is not None and statement.split(" ", 1)[0].upper() in EXPLAINABLE:
+        try:
+            # the plain sqlite3 method: not timed, so it can't log itself
+            cursor = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {statement}", params)
+            plan = [row[-1] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            plan = [f"(plan unavailable: {e})"]
+    metrics.record_slow_query({
+        "at": datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(seconds, 6),
+        "sql": statement,
+        "params": "executemany" if params is None else _params_shape(params),
+        "plan": plan,
+    })
@@ -0,0 +1,190 @@
+# app/data/migrations.py
+# Versioned schema migrations applied on top of create_all_tables().
+# Each migration has a version, a name, the SQL it runs and a few "probe"
+# queries whose EXPLAIN QUERY PLAN is printed before and after it is applied
+# (apply_migrations(conn, report=True)). A "sql" step is either a statement
+# or a callable taking the connection. Append new ones; never renumber.
+from app.data.changes import setup_change_log
+from app.data.counters import setup_counters
+from app.data.dates import backfill_iso_dates
+from app.data.rollups import setup_rollups
+from app.data.search import setup_search
+from app.data.versions import setup_versions
+
+MIGRATIONS = [
+    {
+        "version": 1,
+        "name": "cyber_incidents filter indexes",
+        "sql": [
+            "CREATE INDEX IF NOT EXISTS idx_cyber_incidents_severity ON cyber_incidents(severity)",
+            "CREATE INDEX IF NOT EXISTS idx_cyber_incidents_status ON cyber_incidents(status)",
+            "CREATE INDEX IF NOT EXISTS idx_cyber_incidents_date_reported ON cyber_incidents(date_reported)",
+        ],
+        "probes": [
+            ("SELECT COUNT(*) FROM cyber_incidents WHERE severity IN (?, ?)", ("High", "Critical")),
+            ("SELECT severity, COUNT(*) FROM cyber_incidents GROUP BY severity", ()),
+            ("SELECT id FROM cyber_incidents WHERE status = ?", ("Open",)),
+            ("SELECT id FROM cyber_incidents WHERE date_reported BETWEEN ? AND ?",
+             ("2024-01-01", "2024-03-31")),
+        ],
+    },
+    {
+        "version": 2,
+        "name": "it_tickets status/priority index",
+        "sql": [
+            "CREATE INDEX IF NOT EXISTS idx_it_tickets_status_priority ON it_tickets(status, priority)",
+        ],
+        "probes": [
+            ("SELECT COUNT(*) FROM it_tickets WHERE status = ?", ("Open",)),
+            ("SELECT COUNT(*) FROM it_tickets WHERE status = ? AND priority = ?", ("Open", "High")),
+            ("SELECT status, COUNT(*) FROM it_tickets GROUP BY status", ()),
+        ],
+    },
+    {
+        "version": 3,
+        "name": "datasets_metadata source index",
+        "sql": [
+            "CREATE INDEX IF NOT EXISTS idx_datasets_metadata_source ON datasets_metadata(source)",
+        ],
+        "probes": [
+            ("SELECT source, COUNT(*) FROM datasets_metadata GROUP BY source", ()),
+            ("SELECT COUNT(DISTINCT source) FROM datasets_metadata", ()),
+        ],
+    },
+    {
+        "version": 4,
+        "name": "analyze",
+        "sql": ["ANALYZE"],
+        "probes": [],
+    },
+    {
+        "version": 5,
+        "name": "trigger-maintained kpi_counters",
+        "sql": [setup_counters],
+        "probes": [
+            ("SELECT count FROM kpi_counters WHERE table_name = ? AND dimension = ? AND value = ?",
+             ("cyber_incidents", "total", "")),
+        ],
+    },
+    {
+        "version": 6,
+        "name": "trigger-maintained table_versions",
+        "sql": [setup_versions],
+        "probes": [],
+    },
+    {
+        "version": 7,
+        "name": "FTS5 search over incidents and tickets",
+        "sql": [setup_search],
+        "probes": [],
+    },
+    {
+        "version": 8,
+        "name": "ISO-8601 dates + date range indexes",
+        "sql": [
+            backfill_iso_dates,
+            "CREATE INDEX IF NOT EXISTS idx_it_tickets_created_date ON it_tickets(created_date)",
+            "CREATE INDEX IF NOT EXISTS idx_datasets_metadata_last_updated ON datasets_metadata(last_updated)",
+            "ANALYZE",
+        ],
+        "probes": [
+            ("SELECT id FROM cyber_incidents WHERE date_reported BETWEEN ? AND ? ORDER BY date_reported",
+             ("2024-01-01", "2024-03-31")),
+            ("SELECT id FROM it_tickets WHERE created_date >= ? ORDER BY created_date", ("2024-01-01",)),
+        ],
+    },
+    {
+        "version": 9,
+        "name": "trigger-maintained trend rollups",
+        "sql": [setup_rollups],
+        "probes": [
+            ("SELECT bucket, SUM(count) FROM rollups WHERE series = ? AND granularity = ? GROUP BY bucket",
+             ("incidents", "month")),
+        ],
+    },
+    {
+        "version": 10,
+        "name": "change_log for delta polling",
+        "sql": [setup_change_log],
+        "probes": [
+            ("SELECT seq, table_name, op, row_id FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?",
+             (0, 100)),
+        ],
+    },
+]
+
+
+def create_schema_version_table(conn):
+    """Create the schema_version table (one row per applied migration)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+
+
+def current_version(conn):
+    """Highest applied migration version (0 for a fresh database)."""
+    create_schema_version_table(conn)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def query_plan(conn, sql, params=()):
+    """EXPLAIN QUERY PLAN detail lines for a statement."""
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def _print_plans(conn, probes, label):
+    for sql, params in probes:
+        print(f"    {label}: {sql}")
+        for line in query_plan(conn, sql, params):
+            print(f"      {line}")
+
+
+def apply_migrations(conn, target=None, report=False):
+    """Apply every pending migration up to ``target`` (default: latest).
+
+    Each migration runs in its own transaction together with its
+    schema_version row, so a failure leaves the database at the previous
+    version. Returns the list of versions applied.
+    """
+    version = current_version(conn)
+    applied = []
+
+    for migration in MIGRATIONS:
+        if migration["version"] <= version:
+            continue
+        if target is not None and migration["version"] > target:
+            break
+
+        print(f"🔧 Migration {migration['version']}: {migration['name']}")
+        if report:
+            _print_plans(conn, migration["probes"], "before")
+
+        conn.execute("BEGIN")
+        try:
+            for step in migration["sql"]:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(
+                "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+                (migration["version"], migration["name"]),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        if report:
+            _print_plans(conn, migration["probes"], "after")
+        applied.append(migration["version"])
+
+    if applied:
+        print(f"✅ Schema now at version {applied[-1]}")
+    return applied
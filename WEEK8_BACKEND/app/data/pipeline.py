@@ -0,0 +1,224 @@
+# app/data/pipeline.py
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.data import manifest
+from app.data.db import connect_database
+from app.data.ingest import (
+    DEFAULT_CHUNK_SIZE, RowKeys, add_counts, delete_missing_rows, empty_stats, insert_rows,
+    map_chunk, plan_files, prepare_chunk, read_chunks, remember_keys, table_columns,
+)
+
+DEFAULT_QUEUE_DEPTH = 8
+
+# Set in each worker process by _init_worker.
+_batches = None
+_cancel = None
+
+
+def _init_worker(batch_queue, cancel):
+    global _batches, _cancel
+    _batches, _cancel = batch_queue, cancel
+
+
+def _parse_file(task):
+    """Worker process: read, map and prepare one CSV, one batch per chunk.
+
+    Batches go onto the shared bounded queue, so a worker blocks (instead of
+    buffering the file) when the writer falls behind. Finishes with a
+    "done" or "error" message for the file, unless the load was cancelled.
+    """
+    path = task["file"]
+    try:
+        keys = RowKeys(path, task["table"])
+        if task["byte_offset"]:
+            keys.prime(path, task["first_row"], task["chunk_size"])
+        chunks = read_chunks(path, task["chunk_size"], task["byte_offset"], task["first_row"])
+        while True:
+            start = time.perf_counter()
+            raw = next(chunks, None)
+            if raw is None:
+                break
+            if _cancel.is_set():  # the writer failed: nobody will store this file
+                return
+            mapped = map_chunk(raw, task["mapper"], keys)
+            columns, rows = prepare_chunk(task["table"], mapped, task["columns"])
+            busy = time.perf_counter() - start
+            _batches.put(("batch", path, len(raw), columns, rows, busy))
+        _batches.put(("done", path))
+    except Exception as e:
+        _batches.put(("error", path, f"{type(e).__name__}: {e}"))
+
+
+def _drain(batch_queue, finished):
+    """Keep emptying the queue until the workers are gone, so none blocks on put()."""
+    while not finished.is_set():
+        try:
+            batch_queue.get(timeout=0.1)
+        except queue.Empty:
+            pass
+
+
+def _write_batches(db_path, batch_queue, tasks, results, stages, cancel, finished, failure):
+    """Writer thread: the only connection that writes during the pipeline.
+
+    Any error outside a single batch (connecting, deleting vanished rows,
+    saving the manifest) is put in ``failure`` for run_pipeline() to
+    re-raise; the writer then cancels the workers and drains the queue
+    until they have exited.
+    """
+    conn = None
+    pending = set(tasks)
+    try:
+        conn = connect_database(db_path)
+        while pending and not cancel.is_set():
+            start = time.perf_counter()
+            try:
+                message = batch_queue.get(timeout=1.0)
+            except queue.Empty:
+                stages["write"]["idle_s"] += time.perf_counter() - start
+                continue
+            stages["write"]["idle_s"] += time.perf_counter() - start
+
+            kind, path = message[0], message[1]
+            task, result = tasks[path], results[path]
+
+            if kind == "batch":
+                _, _, n_rows, columns, rows, parse_s = message
+                stages["parse"]["rows"] += n_rows
+                stages["parse"]["busy_s"] += parse_s
+                if result.get("error"):
+                    continue  # drain the rest of a failed file
+                start = time.perf_counter()
+                try:
+                    add_counts(result, insert_rows(conn, task["table"], columns, rows,
+                                                   upsert=task["upsert"]))
+                    if task["track"]:
+                        remember_keys(conn, path, rows, columns)
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    result["error"] = f"{type(e).__name__}: {e}"
+                busy = time.perf_counter() - start
+                result["rows_read"] += n_rows
+                result["chunks"] += 1
+                result["seconds"] += busy
+                stages["write"]["rows"] += n_rows
+                stages["write"]["busy_s"] += busy
+
+            elif kind == "done":
+                pending.discard(path)
+                if not result.get("error"):
+                    rows_loaded = task["base_rows"] + result["rows_read"]
+                    if task["track"]:  # re-read in full: drop rows no longer in the file
+                        result["rows_deleted"] = delete_missing_rows(conn, task["table"], path)
+                    manifest.save_entry(conn, path, task["table"], task["fp"], rows_loaded)
+                    conn.commit()
+
+            else:  # "error" from the worker
+                pending.discard(path)
+                result["error"] = message[2]
+    except BaseException as e:
+        failure.append(e)
+        cancel.set()
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
+    finally:
+        if conn is not None:
+            conn.close()
+        _drain(batch_queue, finished)
+
+
+def _rate(rows, seconds):
+    return rows / seconds if seconds else 0.0
+
+
+def run_pipeline(conn, files, mappers, workers=None, queue_depth=DEFAULT_QUEUE_DEPTH,
+                 chunk_size=DEFAULT_CHUNK_SIZE, plans=None):
+    """Load many CSVs in parallel: N parser processes, one SQLite writer.
+
+    ``files`` maps CSV path -> table, ``mappers`` maps table -> mapper.
+    Planning (skip / append / upsert / full) uses the same ingest manifest
+    as the serial loader; pass ``plans`` from plan_files() if they were
+    already made. Tables loaded for the first time are cleared up front so
+    parallel files can never race with a DELETE.
+
+    Returns {"files": [per-file stats], "stages": {...}} where stages holds
+    rows, busy seconds and rows/sec for the parse and write stages.
+    """
+    db_path = conn.execute("PRAGMA database_list").fetchone()[2]
+    plans = plans or plan_files(conn, files)
+
+    tasks, results = {}, {}
+    for csv_path, table in files.items():
+        path = str(csv_path)
+        action, entry, fp = plans[csv_path]
+        results[path] = {**empty_stats(path, table), "action": action, "seconds": 0.0}
+        if action == "skip":
+            if fp is not None:
+                manifest.save_entry(conn, path, table, fp, entry["rows_loaded"])
+            continue
+        if action == "full":  # plan_files() gives each table at most one
+            conn.execute(f"DELETE FROM {table}")
+        append = action == "append"
+        tasks[path] = {
+            "file": path,
+            "table": table,
+            "mapper": mappers[table],
+            "columns": table_columns(conn, table),
+            "chunk_size": chunk_size,
+            "byte_offset": entry["size_bytes"] if append else 0,
+            "first_row": entry["rows_loaded"] if append else 0,
+            "base_rows": entry["rows_loaded"] if append else 0,
+            "track": action == "upsert",
+            "upsert": action != "full",
+            "fp": fp,
+        }
+    conn.commit()
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    stages = {
+        "parse": {"workers": workers, "rows": 0, "busy_s": 0.0},
+        "write": {"rows": 0, "busy_s": 0.0, "idle_s": 0.0},
+    }
+    start = time.perf_counter()
+
+    if tasks:
+        batch_queue = multiprocessing.Queue(maxsize=queue_depth)
+        cancel = multiprocessing.Event()  # seen by the workers and the writer
+        finished = threading.Event()      # set once every worker has exited
+        failure = []
+        writer = threading.Thread(
+            target=_write_batches,
+            args=(db_path, batch_queue, tasks, results, stages, cancel, finished, failure),
+            name="sqlite-writer",
+        )
+        writer.start()
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(batch_queue, cancel)) as pool:
+                list(pool.map(_parse_file, tasks.values()))
+        except BaseException:
+            cancel.set()  # a worker died without reporting: don't wait for it
+            raise
+        finally:
+            finished.set()
+            writer.join()
+        if failure:
+            raise failure[0]
+
+    wall = time.perf_counter() - start
+    for result in results.values():
+        result["rows_per_sec"] = _rate(result["rows_read"], result["seconds"])
+    stages["parse"]["rows_per_sec"] = _rate(stages["parse"]["rows"], stages["parse"]["busy_s"])
+    stages["write"]["rows_per_sec"] = _rate(stages["write"]["rows"], stages["write"]["busy_s"])
+    stages["total"] = {
+        "rows": stages["write"]["rows"],
+        "wall_s": wall,
+        "rows_per_sec": _rate(stages["write"]["rows"], wall),
+    }
+    return {"files": list(results.values()), "stages": stages}
@@ -0,0 +1,190 @@
+# app/data/pool.py
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.data.metrics import InstrumentedConnection
+
+# Applied once, when a connection is first opened.
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "busy_timeout": 5000,          # ms to wait on a locked database
+    "synchronous": "NORMAL",       # safe with WAL, far fewer fsyncs
+    "mmap_size": 268435456,        # 256 MB memory-mapped reads
+    "cache_size": -65536,          # negative = KiB, so 64 MB page cache
+    "temp_store": "MEMORY",
+}
+
+
+def apply_pragmas(conn, pragmas=None):
+    """Apply the tuning pragmas to a freshly opened connection."""
+    for name, value in (pragmas or PRAGMAS).items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+class ConnectionPool:
+    """Bounded pool of tuned SQLite connections for one database file.
+
+    A thread that already holds a connection gets the same one back on a
+    nested ``connection()`` call, so helpers can call each other freely.
+    """
+
+    def __init__(self, db_path, max_size=8, timeout=30.0, pragmas=None):
+        self.db_path = str(db_path)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = pragmas or PRAGMAS
+        self._idle = queue.LifoQueue()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._stats = {
+            "acquired": 0,
+            "hits": 0,
+            "misses": 0,
+            "reentrant": 0,
+            "waits": 0,
+            "wait_time_s": 0.0,
+            "max_wait_s": 0.0,
+        }
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               factory=InstrumentedConnection)
+        return apply_pragmas(conn, self.pragmas)
+
+    def acquire(self):
+        """Check out a connection (reusing an idle one when possible)."""
+        try:
+            conn = self._idle.get_nowait()
+            self._count(hits=1)
+            return conn
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.max_size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                conn = self._open()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+            self._count(misses=1)
+            return conn
+
+        start = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No SQLite connection free after {self.timeout}s (pool size {self.max_size})"
+            )
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._stats["acquired"] += 1
+            self._stats["hits"] += 1
+            self._stats["waits"] += 1
+            self._stats["wait_time_s"] += waited
+            self._stats["max_wait_s"] = max(self._stats["max_wait_s"], waited)
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding any open transaction."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def _count(self, **deltas):
+        with self._lock:
+            self._stats["acquired"] += 1
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    @contextmanager
+    def connection(self):
+        """Context manager yielding a pooled connection.
+
+        The caller is responsible for ``conn.commit()``; anything left
+        uncommitted is rolled back when the connection goes back to the pool.
+        """
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            self._count(reentrant=1)
+            try:
+                yield held
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self.acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self.release(conn)
+
+    @contextmanager
+    def dedicated(self):
+        """Context manager yielding a pooled connection nobody else will share.
+
+        Unlike ``connection()`` it is never handed to nested calls on this
+        thread, so it is safe to hold across ``yield`` in a generator that
+        may be resumed, or closed, from another thread.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def stats(self):
+        """Snapshot of pool hit/wait metrics."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = self._created
+        snapshot["idle"] = self._idle.qsize()
+        snapshot["in_use"] = snapshot["size"] - snapshot["idle"]
+        fresh = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = snapshot["hits"] / fresh if fresh else 0.0
+        snapshot["avg_wait_s"] = (
+            snapshot["wait_time_s"] / snapshot["waits"] if snapshot["waits"] else 0.0
+        )
+        return snapshot
+
+    def close_all(self):
+        """Close every idle connection (used on shutdown and in benchmarks)."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path, **kwargs):
+    """Return the process-wide pool for ``db_path`` (created on first use)."""
+    key = str(Path(db_path).resolve())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(key, **kwargs)
+            _pools[key] = pool
+        return pool
@@ -0,0 +1,219 @@
+# app/data/query.py
+# Small query builder so callers push filters, projections, ordering and
+# limits down into SQLite instead of loading a table and filtering it in
+# pandas:
+#
+#   query("cyber_incidents").select("id", "severity", "date_reported") \
+#       .where(severity__in=["High", "Critical"], date_reported__gte="2024-01-01") \
+#       .order_by("-date_reported").limit(20).to_frame()
+#
+# iter_batches() / iter_table() stream a result through one cursor with
+# fetchmany(), so batch jobs over a large table keep only one batch in
+# memory.
+#
+# Identifiers are checked against schema.QUERYABLE_COLUMNS; values are
+# always bound as parameters.
+import pandas as pd
+
+from app.data.db import connection, dedicated_connection
+from app.data.frames import compact_frame
+from app.data.metrics import instrumented
+from app.data.schema import QUERYABLE_COLUMNS
+
+ITER_BATCH_SIZE = 10_000  # rows per fetchmany() in iter_batches()
+
+# lookup suffix -> SQL template for one bound value
+COMPARISONS = {
+    "eq": "{column} = ?",
+    "ne": "{column} != ?",
+    "lt": "{column} < ?",
+    "lte": "{column} <= ?",
+    "gt": "{column} > ?",
+    "gte": "{column} >= ?",
+    "like": "{column} LIKE ?",
+}
+
+
+def check_columns(table, *columns):
+    """ValueError unless ``table`` and every column are in the whitelist."""
+    if table not in QUERYABLE_COLUMNS:
+        raise ValueError(f"Unknown table: {table}")
+    for column in columns:
+        if column not in QUERYABLE_COLUMNS[table]:
+            raise ValueError(f"Unknown column {table}.{column}")
+
+
+def compile_condition(table, key, value):
+    """One ``column__op=value`` keyword -> (sql, params).
+
+    Without an operator a list means IN, None means IS NULL and anything
+    else is equality. Operators: eq ne lt lte gt gte like in not_in
+    between isnull.
+    """
+    column, _, op = key.partition("__")
+    check_columns(table, column)
+    if not op:
+        op = "isnull" if value is None else "in" if isinstance(value, (list, tuple, set)) else "eq"
+        value = True if value is None else value
+    if op in COMPARISONS:
+        return COMPARISONS[op].format(column=column), [value]
+    if op in ("in", "not_in"):
+        values = list(value)
+        if not values:
+            return ("0" if op == "in" else "1"), []  # IN () matches nothing
+        placeholders = ", ".join("?" for _ in values)
+        return f"{column} {'NOT IN' if op == 'not_in' else 'IN'} ({placeholders})", values
+    if op == "between":
+        low, high = value
+        return f"{column} BETWEEN ? AND ?", [low, high]
+    if op == "isnull":
+        return f"{column} IS {'' if value else 'NOT '}NULL", []
+    raise ValueError(f"Unknown operator '{op}' in {key}")
+
+
+def compile_filters(table, conditions):
+    """{key: value} (or (key, value) pairs) -> ("a = ? AND b IN (?, ?)", params).
+
+    Returns ("", []) when there is nothing to filter on.
+    """
+    if isinstance(conditions, dict):
+        conditions = conditions.items()
+    clauses, params = [], []
+    for key, value in conditions or ():
+        sql, values = compile_condition(table, key, value)
+        clauses.append(sql)
+        params.extend(values)
+    return " AND ".join(clauses), params
+
+
+class Query:
+    """Immutable SELECT builder: each method returns a new Query."""
+
+    def __init__(self, table):
+        check_columns(table)
+        self.table = table
+        self._columns = []
+        self._conditions = []
+        self._order = []
+        self._limit = None
+        self._offset = None
+
+    def _copy(self, **changes):
+        clone = Query.__new__(Query)
+        clone.__dict__ = {**self.__dict__, **changes}
+        return clone
+
+    def select(self, *columns):
+        check_columns(self.table, *columns)
+        return self._copy(_columns=self._columns + list(columns))
+
+    def where(self, **conditions):
+        for key, value in conditions.items():
+            compile_condition(self.table, key, value)  # validate now, not at run time
+        return self._copy(_conditions=self._conditions + list(conditions.items()))
+
+    def order_by(self, *columns):
+        """Columns to sort by; prefix with '-' for descending."""
+        check_columns(self.table, *(c.lstrip("-") for c in columns))
+        return self._copy(_order=self._order + list(columns))
+
+    def limit(self, n):
+        return self._copy(_limit=int(n))
+
+    def offset(self, n):
+        return self._copy(_offset=int(n))
+
+    def sql(self):
+        """(sql, params) for this query."""
+        columns = ", ".join(self._columns) or "*"
+        sql = f"SELECT {columns} FROM {self.table}"
+        where, params = compile_filters(self.table, self._conditions)
+        if where:
+            sql += f" WHERE {where}"
+        if self._order:
+            sql += " ORDER BY " + ", ".join(
+                f"{c[1:]} DESC" if c.startswith("-") else f"{c} ASC" for c in self._order
+            )
+        if self._limit is not None or self._offset is not None:
+            sql += " LIMIT ?"
+            params.append(self._limit if self._limit is not None else -1)
+        if self._offset is not None:
+            sql += " OFFSET ?"
+            params.append(self._offset)
+        return sql, params
+
+    @instrumented
+    def to_frame(self, compact=True):
+        """Run the query and return a DataFrame (compact dtypes by default)."""
+        sql, params = self.sql()
+        with connection() as conn:
+            df = pd.read_sql(sql, conn, params=params)
+        return compact_frame(df) if compact else df
+
+    @instrumented
+    def fetchall(self):
+        """Run the query and return plain tuples."""
+        sql, params = self.sql()
+        with connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    @instrumented
+    def count(self):
+        """COUNT(*) of the rows matching the filters (ignores select/order/limit)."""
+        base = self._copy(_columns=[], _order=[], _limit=None, _offset=None)
+        sql, params = base.sql()
+        with connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+
+    def iter_batches(self, batch_size=ITER_BATCH_SIZE, frames=True, compact=True):
+        """Stream the result ``batch_size`` rows at a time from one cursor.
+
+        Yields a DataFrame per batch (compact dtypes by default; categories
+        are per batch, so re-categorize before concatenating), or with
+        ``frames=False`` one plain tuple per row. A dedicated pooled
+        connection (not the thread's shared one) and its read snapshot are
+        held until the generator is exhausted or closed, so use it in a for
+        loop (or close() it) rather than leaving it half-consumed.
+        """
+        sql, params = self.sql()
+        with dedicated_connection() as conn:
+            cursor = conn.execute(sql, params)
+            try:
+                columns = [d[0] for d in cursor.description]
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    if not frames:
+                        yield from rows
+                        continue
+                    df = pd.DataFrame.from_records(rows, columns=columns)
+                    yield compact_frame(df) if compact else df
+            finally:
+                cursor.close()
+
+    def explain(self):
+        """SQLite's EXPLAIN QUERY PLAN lines for this query."""
+        sql, params = self.sql()
+        with connection() as conn:
+            return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    def __repr__(self):
+        sql, params = self.sql()
+        return f"<Query {sql} {params}>"
+
+
+def query(table):
+    """Start a query on one of the data tables."""
+    return Query(table)
+
+
+def iter_table(table, batch_size=ITER_BATCH_SIZE, columns=None, where=None, frames=True, compact=True):
+    """Rows of ``table`` in id order, streamed in batches (see Query.iter_batches).
+
+    ``where`` holds query() filters, e.g. {"severity__in": ["High", "Critical"]}.
+    """
+    q = query(table).where(**(where or {})).order_by("id")
+    if columns:
+        q = q.select(*columns)
+    return q.iter_batches(batch_size, frames, compact)
@@ -0,0 +1,151 @@
+# app/data/rollups.py
+# Pre-aggregated time series for the trend charts. rollups holds one row
+# per (series, granularity, bucket, dimension values) with a row count,
+# kept current by triggers on the base tables and rebuilt in one
+# GROUP BY after bulk loads, so a chart reads a few hundred rollup rows
+# instead of scanning and resampling the whole table. Buckets are ISO
+# dates: the day itself, the Monday of the week, or the 1st of the month.
+# NULL dimension values are stored as ''. Rows without a usable date are
+# not counted.
+import pandas as pd
+
+from app.data.dates import to_iso
+
+ROLLUPS = {
+    "incidents": {
+        "table": "cyber_incidents",
+        "date": "date_reported",
+        "dimensions": ["incident_type", "severity"],
+        "granularities": ["day", "week", "month"],
+    },
+    "tickets": {
+        "table": "it_tickets",
+        "date": "created_date",
+        "dimensions": ["status", "priority"],
+        "granularities": ["day"],
+    },
+}
+
+BUCKETS = {
+    "day": "date({d})",
+    "week": "date({d}, 'weekday 0', '-6 days')",
+    "month": "strftime('%Y-%m-01', {d})",
+}
+
+# tables that have at least one rollup series
+ROLLUP_TABLES = sorted({spec["table"] for spec in ROLLUPS.values()})
+
+
+def create_rollups_table(conn):
+    """Create the rollups table."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rollups (
+            series TEXT NOT NULL,
+            granularity TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            dim1 TEXT NOT NULL,
+            dim2 TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (series, granularity, bucket, dim1, dim2)
+        ) WITHOUT ROWID
+    """)
+
+
+def _series_for(tables):
+    return [name for name, spec in ROLLUPS.items() if spec["table"] in tables]
+
+
+def _bump(name, spec, granularity, row, delta):
+    bucket = BUCKETS[granularity].format(d=f"{row}.{spec['date']}")
+    dim1, dim2 = (f"COALESCE({row}.{d}, '')" for d in spec["dimensions"])
+    return (
+        f"INSERT INTO rollups (series, granularity, bucket, dim1, dim2, count) "
+        f"SELECT '{name}', '{granularity}', {bucket}, {dim1}, {dim2}, {delta} WHERE {bucket} IS NOT NULL "
+        f"ON CONFLICT(series, granularity, bucket, dim1, dim2) DO UPDATE SET count = count + {delta};"
+    )
+
+
+def install_triggers(conn, tables=None):
+    for name in _series_for(tables or ROLLUP_TABLES):
+        spec = ROLLUPS[name]
+        table = spec["table"]
+        insert = "".join(_bump(name, spec, g, "NEW", 1) for g in spec["granularities"])
+        delete = "".join(_bump(name, spec, g, "OLD", -1) for g in spec["granularities"])
+        watched = ", ".join([spec["date"]] + spec["dimensions"])
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_rollup_{name}_insert AFTER INSERT ON {table} BEGIN {insert} END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_rollup_{name}_delete AFTER DELETE ON {table} BEGIN {delete} END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_rollup_{name}_update AFTER UPDATE OF {watched} ON {table} "
+            f"BEGIN {delete} {insert} END"
+        )
+
+
+def drop_triggers(conn, tables=None):
+    for name in _series_for(tables or ROLLUP_TABLES):
+        for op in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_rollup_{name}_{op}")
+
+
+def rebuild_rollups(conn, tables=None):
+    """Batch builder: recompute the series of ``tables`` with one GROUP BY each. Caller commits."""
+    for name in _series_for(tables or ROLLUP_TABLES):
+        spec = ROLLUPS[name]
+        dim1, dim2 = (f"COALESCE({d}, '')" for d in spec["dimensions"])
+        conn.execute("DELETE FROM rollups WHERE series = ?", (name,))
+        for granularity in spec["granularities"]:
+            bucket = BUCKETS[granularity].format(d=spec["date"])
+            conn.execute(
+                f"INSERT INTO rollups (series, granularity, bucket, dim1, dim2, count) "
+                f"SELECT ?, ?, {bucket} AS b, {dim1}, {dim2}, COUNT(*) FROM {spec['table']} "
+                f"WHERE b IS NOT NULL GROUP BY b, 4, 5",
+                (name, granularity),
+            )
+
+
+def rollups_installed(conn):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollups'"
+    ).fetchone()
+    return row is not None
+
+
+def setup_rollups(conn):
+    """Migration step: table + triggers + initial build."""
+    create_rollups_table(conn)
+    install_triggers(conn)
+    rebuild_rollups(conn)
+
+
+def trend(conn, series, granularity="day", start=None, end=None, by=None):
+    """Counts per bucket from the rollups table.
+
+    ``start``/``end`` are inclusive dates (or date strings) matched
+    against the bucket start. With ``by`` (one of the series' dimensions) returns
+    [bucket, <by>, count], otherwise [bucket, count]; oldest bucket first.
+    """
+    spec = ROLLUPS.get(series)
+    if spec is None:
+        raise ValueError(f"Unknown series: {series}")
+    if granularity not in spec["granularities"]:
+        raise ValueError(f"Series '{series}' has no '{granularity}' rollup")
+    if by is not None and by not in spec["dimensions"]:
+        raise ValueError(f"Series '{series}' can't be split by '{by}'")
+
+    group = ["bucket"]
+    if by is not None:
+        group.append(f"NULLIF(dim{spec['dimensions'].index(by) + 1}, '') AS {by}")
+    sql = (f"SELECT {', '.join(group)}, SUM(count) AS count FROM rollups "
+           f"WHERE series = ? AND granularity = ?")
+    params = [series, granularity]
+    if start is not None:
+        sql += " AND bucket >= ?"
+        params.append(to_iso(start))
+    if end is not None:
+        sql += " AND bucket <= ?"
+        params.append(to_iso(end))
+    sql += f" GROUP BY {', '.join(str(i + 1) for i in range(len(group)))} HAVING SUM(count) > 0 ORDER BY 1"
+    return pd.read_sql(sql, conn, params=params)
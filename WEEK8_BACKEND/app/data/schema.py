@@ -27,6 +27,8 @@ def create_cyber_incidents_table(conn):
             status TEXT,
             description TEXT,
             reported_by TEXT,
+            source_key INTEGER,
+            source_file TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
@@ -45,6 +47,8 @@ def create_datasets_metadata_table(conn):
             last_updated TEXT,
             record_count INTEGER,
             file_size_mb REAL,
+            source_key INTEGER,
+            source_file TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
@@ -66,16 +70,72 @@ def create_it_tickets_table(conn):
             created_date TEXT,
             resolved_date TEXT,
             assigned_to TEXT,
+            source_key INTEGER,
+            source_file TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
     conn.commit()
     print("✅ IT tickets table created successfully!")
 
+def create_ingest_manifest_table(conn):
+    """Create the ingest_manifest table (one row per loaded CSV file)."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_manifest (
+            source_file TEXT PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            rows_loaded INTEGER NOT NULL DEFAULT 0,
+            loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+    print("✅ Ingest manifest table created successfully!")
+
+# Tables filled from CSV: source_key holds a hash of the source file name, the
+# row's natural key and its occurrence (see ingest.RowKeys); source_file is the
+# CSV's name, so rows that vanish from a file can be found again.
+SOURCE_KEY_TABLES = ["cyber_incidents", "datasets_metadata", "it_tickets"]
+
+def ensure_source_keys(conn):
+    """Add source_key / source_file (+ indexes) to tables created before they existed."""
+    cursor = conn.cursor()
+    for table in SOURCE_KEY_TABLES:
+        columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+        if "source_key" not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN source_key INTEGER")
+        if "source_file" not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN source_file TEXT")
+        cursor.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_source_key ON {table}(source_key)"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_source_file ON {table}(source_file)"
+        )
+    conn.commit()
+
+# Columns of the data tables, the identifier whitelist for app.data.query.
+# Keep in step with the CREATE TABLE statements above. users is left out
+# on purpose: nothing generic should be able to select password hashes.
+QUERYABLE_COLUMNS = {
+    "cyber_incidents": ["id", "date_reported", "incident_type", "severity", "status",
+                        "description", "reported_by", "source_key", "source_file", "created_at"],
+    "datasets_metadata": ["id", "dataset_name", "category", "source", "last_updated",
+                          "record_count", "file_size_mb", "source_key", "source_file", "created_at"],
+    "it_tickets": ["id", "ticket_id", "priority", "status", "category", "subject",
+                   "description", "created_date", "resolved_date", "assigned_to",
+                   "source_key", "source_file", "created_at"],
+}
+
 def create_all_tables(conn):
     """Create all tables."""
     create_users_table(conn)
     create_cyber_incidents_table(conn)
     create_datasets_metadata_table(conn)
     create_it_tickets_table(conn)
+    create_ingest_manifest_table(conn)
+    ensure_source_keys(conn)
     print("🎉 All tables created successfully!")
\ No newline at end of file
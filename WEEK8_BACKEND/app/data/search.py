@@ -0,0 +1,145 @@
+# app/data/search.py
+# FTS5 full-text indexes over incident and ticket text. The indexes are
+# external-content tables (they store only the index, the text stays in the
+# base table) kept in sync by triggers, so a search is an index lookup
+# ranked by bm25 instead of a LIKE '%term%' scan.
+import re
+
+import pandas as pd
+
+# base table -> FTS table, indexed columns, extra columns returned with hits
+SEARCH_INDEXES = {
+    "cyber_incidents": {
+        "fts": "cyber_incidents_fts",
+        "columns": ["description", "incident_type"],
+        "extra": ["date_reported", "severity", "status"],
+    },
+    "it_tickets": {
+        "fts": "it_tickets_fts",
+        "columns": ["subject", "description"],
+        "extra": ["ticket_id", "priority", "status"],
+    },
+}
+
+
+def create_search_tables(conn):
+    """Create the FTS5 virtual tables (porter stemming, unicode tokenizer)."""
+    for table, index in SEARCH_INDEXES.items():
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {index['fts']} USING fts5("
+            f"{', '.join(index['columns'])}, content='{table}', content_rowid='id', "
+            f"tokenize='porter unicode61')"
+        )
+
+
+def install_triggers(conn, tables=None):
+    for table in tables or SEARCH_INDEXES:
+        index = SEARCH_INDEXES[table]
+        fts, columns = index["fts"], index["columns"]
+        cols = ", ".join(columns)
+        new = ", ".join(f"NEW.{c}" for c in columns)
+        old = ", ".join(f"OLD.{c}" for c in columns)
+        add = f"INSERT INTO {fts} (rowid, {cols}) VALUES (NEW.id, {new});"
+        remove = f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', OLD.id, {old});"
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_fts_{table}_insert AFTER INSERT ON {table} BEGIN {add} END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_fts_{table}_delete AFTER DELETE ON {table} BEGIN {remove} END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_fts_{table}_update AFTER UPDATE OF {cols} ON {table} "
+            f"BEGIN {remove} {add} END"
+        )
+
+
+def drop_triggers(conn, tables=None):
+    for table in tables or SEARCH_INDEXES:
+        for op in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_fts_{table}_{op}")
+
+
+def rebuild_search(conn, tables=None):
+    """Rebuild FTS indexes from the base tables. Caller commits."""
+    for table in tables or SEARCH_INDEXES:
+        fts = SEARCH_INDEXES[table]["fts"]
+        conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def index_rows(conn, table, first_id, last_id):
+    """Add base rows with ids in [first_id, last_id] to the FTS index in one
+    statement (for bulk inserts made with the triggers dropped)."""
+    index = SEARCH_INDEXES[table]
+    cols = ", ".join(index["columns"])
+    conn.execute(
+        f"INSERT INTO {index['fts']} (rowid, {cols}) "
+        f"SELECT id, {cols} FROM {table} WHERE id BETWEEN ? AND ?",
+        (first_id, last_id),
+    )
+
+
+def search_installed(conn):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (SEARCH_INDEXES["cyber_incidents"]["fts"],),
+    ).fetchone()
+    return row is not None
+
+
+def setup_search(conn):
+    """Migration step: FTS tables + triggers + initial index build."""
+    create_search_tables(conn)
+    install_triggers(conn)
+    rebuild_search(conn)
+
+
+def match_expression(text):
+    """Turn free text typed by a user into a safe FTS5 MATCH expression.
+
+    Every word is quoted, so FTS operators and stray quotes can't cause a
+    syntax error; a trailing * keeps its prefix meaning:
+    'phish* "cred' -> '"phish"* "cred"'.
+    """
+    terms = re.findall(r"\w+\*?", text or "")
+    if not terms:
+        return None
+    return " ".join(f'"{t.rstrip("*")}"' + ("*" if t.endswith("*") else "") for t in terms)
+
+
+def search(conn, table, text, limit=50):
+    """bm25-ranked hits for ``text`` in ``table`` with a highlighted snippet.
+
+    Returns a DataFrame [id, <extra columns>, <indexed columns>, snippet,
+    rank] ordered best match first (lower rank is better); an empty query
+    returns no rows.
+
+    The ranking query touches only the FTS index; snippets and base-table
+    columns are then fetched for the top ``limit`` rowids alone, so the
+    cost of a common term doesn't include a join per matching row.
+    """
+    index = SEARCH_INDEXES[table]
+    fts = index["fts"]
+    columns = ["id"] + index["extra"] + index["columns"]
+    match = match_expression(text)
+    if match is None:
+        return pd.DataFrame(columns=columns + ["snippet", "rank"])
+
+    top = conn.execute(
+        f"SELECT rowid, rank FROM {fts} WHERE {fts} MATCH ? ORDER BY rank LIMIT ?",
+        (match, int(limit)),
+    ).fetchall()
+    snippet_sql = (f"SELECT snippet({fts}, -1, '**', '**', ' … ', 12) "
+                   f"FROM {fts} WHERE {fts} MATCH ? AND rowid = ?")
+    snippets = {rowid: conn.execute(snippet_sql, (match, rowid)).fetchone()[0] for rowid, _ in top}
+
+    ids = [rowid for rowid, _ in top]
+    if not ids:
+        return pd.DataFrame(columns=columns + ["snippet", "rank"])
+    rows = pd.read_sql(
+        f"SELECT {', '.join(columns)} FROM {table} WHERE id IN ({', '.join('?' for _ in ids)})",
+        conn, params=ids,
+    )
+    rows = rows.set_index("id").loc[ids].reset_index()  # back into rank order
+    rows["snippet"] = [snippets[i] for i in ids]
+    rows["rank"] = [rank for _, rank in top]
+    return rows
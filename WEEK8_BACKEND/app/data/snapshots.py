@@ -0,0 +1,175 @@
+# app/data/snapshots.py
+# Columnar snapshots for fast cold starts. export_snapshot() writes a table
+# (already compacted: categories as dictionary columns, dates as timestamps)
+# to an uncompressed Arrow IPC file next to the database, tagged with the
+# table's table_versions counter. load_table() memory-maps that file instead
+# of running SELECT * when the tag still matches the live version, so a new
+# process gets its frames without parsing every row through sqlite3; a
+# missing or stale snapshot falls back to SQLite, and a stale one is
+# rewritten in the background for the next start.
+# pyarrow is optional (it ships with Streamlit): without it every load goes
+# to SQLite.
+import os
+import threading
+import time
+from pathlib import Path
+
+from app.data import db
+from app.data.frames import read_table
+from app.data.versions import VERSIONED_TABLES, get_versions
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+ENABLED = pa is not None
+SUFFIX = ".arrow"
+MIN_EXPORT_INTERVAL = 60.0  # seconds between background re-exports of one table
+
+_exports = {}  # (snapshot path) -> monotonic time of the last background export
+_exports_lock = threading.Lock()
+
+
+def _db_file(conn):
+    for _, name, path in conn.execute("PRAGMA database_list"):
+        if name == "main":
+            return path or None  # "" for an in-memory database
+    return None
+
+
+def snapshot_path(conn, table):
+    """DATA/snapshots/<table>.arrow beside the database file (None for :memory:)."""
+    path = _db_file(conn)
+    return Path(path).parent / "snapshots" / f"{table}{SUFFIX}" if path else None
+
+
+def _tag(conn, table):
+    """What a snapshot must carry to be fresh: database file identity + table version."""
+    versions = get_versions(conn, [table])
+    if not versions or table not in versions:
+        return None
+    return f"{os.stat(_db_file(conn)).st_ino}:{versions[table]}"
+
+
+def _stored_tag(path):
+    """The tag a snapshot file carries (None if there is no readable file)."""
+    try:
+        with pa.memory_map(str(path), "r") as source:
+            tag = (pa.ipc.open_file(source).schema.metadata or {}).get(b"snapshot_tag")
+    except (OSError, pa.ArrowInvalid):
+        return None
+    return tag.decode() if tag else None
+
+
+def export_snapshot(conn, table, force=False):
+    """Write ``table`` to its snapshot file; returns the row count.
+
+    None when nothing was written: no pyarrow / in-memory database, or the
+    existing file already carries the table's current tag (unless
+    ``force``). The version and the rows are read in one read transaction,
+    so the tag always describes exactly the rows in the file. The file is
+    replaced atomically; readers that still have the old one mapped keep
+    reading it.
+    """
+    path = snapshot_path(conn, table)
+    if not ENABLED or path is None:
+        return None
+    started = not conn.in_transaction
+    if started:
+        conn.execute("BEGIN")
+    try:
+        tag = _tag(conn, table)
+        if tag is None or (not force and tag == _stored_tag(path)):
+            return None
+        df = read_table(conn, table)
+    finally:
+        if started:
+            conn.rollback()
+
+    arrow = pa.Table.from_pandas(df, preserve_index=False)
+    arrow = arrow.replace_schema_metadata({**(arrow.schema.metadata or {}), b"snapshot_tag": tag.encode()})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(SUFFIX + ".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, arrow.schema) as out:
+        out.write_table(arrow)
+    os.replace(tmp, path)
+    return len(df)
+
+
+def export_snapshots(conn, tables=None, force=False):
+    """Snapshot every versioned table whose file is missing or stale; {table: rows written or None}."""
+    return {table: export_snapshot(conn, table, force) for table in tables or VERSIONED_TABLES}
+
+
+def read_snapshot(conn, table, columns=None):
+    """The snapshot of ``table`` as a compact DataFrame, or None if missing or stale."""
+    path = snapshot_path(conn, table)
+    if not ENABLED or path is None or not path.exists():
+        return None
+    tag = _tag(conn, table)
+    with pa.memory_map(str(path), "r") as source:
+        reader = pa.ipc.open_file(source)
+        metadata = reader.schema.metadata or {}
+        if tag is None or metadata.get(b"snapshot_tag") != tag.encode():
+            return None
+        if columns and not set(columns) <= set(reader.schema.names):
+            return None  # let read_table() report the unknown column
+        arrow = reader.read_all()
+    if columns:
+        arrow = arrow.select(list(columns))
+    return arrow.to_pandas()
+
+
+def _export_in_background(db_path, table, path):
+    with _exports_lock:
+        last = _exports.get(path)
+        if last is not None and time.monotonic() - last < MIN_EXPORT_INTERVAL:
+            return
+        _exports[path] = time.monotonic()
+
+    def run():
+        try:
+            with db.connection(db_path) as conn:
+                export_snapshot(conn, table)
+        except Exception as e:
+            print(f"⚠️ Snapshot export of {table} failed: {e}")
+
+    # not a daemon: exiting mid-write would leave only the .tmp behind
+    threading.Thread(target=run, name=f"snapshot-{table}").start()
+
+
+def load_table(conn, table, columns=None, compact=True):
+    """read_table(), served from a fresh snapshot when there is one.
+
+    Snapshots hold compact frames, so ``compact=False`` always reads
+    SQLite. A stale snapshot is rewritten in the background (at most once
+    per MIN_EXPORT_INTERVAL per table); tables nobody exported are left
+    alone.
+    """
+    if compact and ENABLED:
+        df = read_snapshot(conn, table, columns)
+        if df is not None:
+            return df
+        path = snapshot_path(conn, table)
+        if path is not None and path.exists():
+            _export_in_background(_db_file(conn), table, path)
+    return read_table(conn, table, columns, compact)
+
+
+def snapshot_stats(conn, tables=None):
+    """One dict per table: file size, rows and whether it is fresh."""
+    stats = []
+    for table in tables or VERSIONED_TABLES:
+        path = snapshot_path(conn, table)
+        entry = {"table": table, "exists": bool(path and path.exists()), "fresh": False,
+                 "rows": 0, "bytes": 0}
+        if entry["exists"] and ENABLED:
+            with pa.memory_map(str(path), "r") as source:
+                reader = pa.ipc.open_file(source)
+                tag = (reader.schema.metadata or {}).get(b"snapshot_tag")
+                entry["rows"] = reader.count_rows()
+            entry["fresh"] = tag is not None and tag == (_tag(conn, table) or "").encode()
+            entry["bytes"] = path.stat().st_size
+        stats.append(entry)
+    return stats
@@ -1,9 +1,31 @@
 # app/data/tickets.py  
-import pandas as pd
-from app.data.db import connect_database
-
-def get_all_tickets():
-    conn = connect_database()
-    df = pd.read_sql_query("SELECT * FROM it_tickets", conn)
-    conn.close()
-    return df
\ No newline at end of file
+from app.data.db import connection
+from app.data.dates import to_iso
+from app.data.snapshots import load_table
+from app.data.metrics import instrumented
+from app.data.query import ITER_BATCH_SIZE, iter_table, query
+from app.data.search import search
+
+@instrumented
+def get_all_tickets(columns=None, compact=True):
+    """All tickets as a DataFrame (see app.data.snapshots.load_table)."""
+    with connection() as conn:
+        return load_table(conn, "it_tickets", columns, compact)
+
+def iter_tickets(batch_size=ITER_BATCH_SIZE, columns=None, where=None, frames=True, compact=True):
+    """Tickets in id order, streamed like app.data.incidents.iter_incidents."""
+    return iter_table("it_tickets", batch_size, columns, where, frames, compact)
+
+@instrumented
+def search_tickets(query, limit=50):
+    """Full-text search over ticket subjects/descriptions, best match first."""
+    with connection() as conn:
+        return search(conn, "it_tickets", query, limit)
+
+@instrumented
+def tickets_between(start, end, columns=None, compact=True):
+    """Tickets with created_date in [start, end], oldest first (index-served)."""
+    q = query("it_tickets").where(created_date__between=(to_iso(start), to_iso(end)))
+    if columns:
+        q = q.select(*columns)
+    return q.order_by("created_date", "id").to_frame(compact)
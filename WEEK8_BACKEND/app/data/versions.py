@@ -0,0 +1,69 @@
+# app/data/versions.py
+# table_versions holds a counter per data table that triggers bump on every
+# INSERT/UPDATE/DELETE, from any connection or process. Readers compare it
+# with the version they cached to know whether a table really changed.
+
+VERSIONED_TABLES = ["cyber_incidents", "it_tickets", "datasets_metadata"]
+
+
+def create_versions_table(conn):
+    """Create the table_versions table with a row per versioned table."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    conn.executemany(
+        "INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (?, 0)",
+        [(t,) for t in VERSIONED_TABLES],
+    )
+
+
+def install_triggers(conn, tables=None):
+    for table in tables or VERSIONED_TABLES:
+        bump = f"UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';"
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_version_{table}_{op.lower()} "
+                f"AFTER {op} ON {table} BEGIN {bump} END"
+            )
+
+
+def drop_triggers(conn, tables=None):
+    for table in tables or VERSIONED_TABLES:
+        for op in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_version_{table}_{op}")
+
+
+def bump_versions(conn, tables=None):
+    """Mark tables as changed (used after a bulk load with triggers paused)."""
+    conn.executemany(
+        "UPDATE table_versions SET version = version + 1 WHERE table_name = ?",
+        [(t,) for t in tables or VERSIONED_TABLES],
+    )
+
+
+def versions_installed(conn):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'table_versions'"
+    ).fetchone()
+    return row is not None
+
+
+def setup_versions(conn):
+    """Migration step: table + triggers."""
+    create_versions_table(conn)
+    install_triggers(conn)
+
+
+def get_versions(conn, tables):
+    """{table: version} for the given tables, or None if not migrated yet."""
+    if not versions_installed(conn):
+        return None
+    placeholders = ", ".join("?" for _ in tables)
+    rows = conn.execute(
+        f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})",
+        list(tables),
+    ).fetchall()
+    return dict(rows)
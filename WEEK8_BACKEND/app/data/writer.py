@@ -0,0 +1,192 @@
+# app/data/writer.py
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+from app.data.metrics import InstrumentedConnection
+from app.data.pool import apply_pragmas
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_DELAY = 0.0  # extra seconds a batch waits for more writes
+WRITE_TIMEOUT = 30.0     # seconds execute() waits for its batch to commit
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """Single background thread that owns the write side of one database.
+
+    Writes submitted from any thread queue up. The writer takes whatever
+    has arrived (up to ``max_batch``, optionally waiting ``max_delay`` for
+    more; by default batches simply form while the previous commit runs),
+    runs it all in one transaction and commits once. Each
+    caller gets a Future resolving to its statement's lastrowid after
+    that commit, so N concurrent saves cost one lock acquisition and one
+    commit instead of N.
+
+    Every statement runs under its own SAVEPOINT, so one failing write only
+    fails its own future. If the batch as a whole fails (e.g. "database is
+    locked" because a bulk load held the write lock past busy_timeout),
+    every future in it fails and the thread carries on with the next batch.
+    """
+
+    def __init__(self, db_path, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY,
+                 pragmas=None):
+        self.db_path = str(db_path)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.pragmas = pragmas
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "committed": 0, "failed": 0, "batches": 0,
+                       "max_batch_seen": 0}
+        self._error = None  # set if the writer couldn't open its connection
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, sql, params=()):
+        """Queue one write; returns a Future for its lastrowid."""
+        future = Future()
+        with self._lock:
+            self._stats["submitted"] += 1
+            if self._error is None:
+                self._queue.put((sql, params, future))
+                return future
+        _fail(future, self._error)
+        return future
+
+    def execute(self, sql, params=(), timeout=WRITE_TIMEOUT):
+        """submit() and wait: returns lastrowid or raises the write's error.
+
+        Raises concurrent.futures.TimeoutError after ``timeout`` seconds;
+        the write may still commit later.
+        """
+        return self.submit(sql, params).result(timeout)
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.perf_counter() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)  # finish this batch, then stop
+                break
+            batch.append(item)
+        return batch
+
+    def _write(self, conn, batch):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, params, future in batch:
+                conn.execute("SAVEPOINT write")
+                try:
+                    cursor = conn.execute(sql, params)
+                except Exception as exc:
+                    conn.execute("ROLLBACK TO write")
+                    results.append((future, None, exc))
+                else:
+                    results.append((future, cursor.lastrowid, None))
+                conn.execute("RELEASE write")
+            conn.commit()
+        except Exception as exc:
+            if conn.in_transaction:
+                conn.rollback()
+            results = [(future, None, exc) for _, _, future in batch]
+
+        failed = 0
+        for future, row_id, error in results:
+            if error is None:
+                if not future.done():
+                    future.set_result(row_id)
+            else:
+                failed += 1
+                _fail(future, error)
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["committed"] += len(batch) - failed
+            self._stats["failed"] += failed
+            self._stats["max_batch_seen"] = max(self._stats["max_batch_seen"], len(batch))
+
+    def _run(self):
+        try:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False,
+                                   factory=InstrumentedConnection)
+            apply_pragmas(conn, self.pragmas)
+        except Exception as exc:
+            print(f"⚠️ Group-commit writer could not open {self.db_path}: {exc}")
+            with self._lock:
+                self._error = exc
+            self._fail_pending(exc)
+            return
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                batch = self._collect(item)
+                try:
+                    self._write(conn, batch)
+                except Exception as exc:  # never let one batch kill the thread
+                    print(f"⚠️ Group-commit batch failed: {exc}")
+                    for _, _, future in batch:
+                        _fail(future, exc)
+        finally:
+            conn.close()
+
+    def _fail_pending(self, exc):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP:
+                _fail(item[2], exc)
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot["pending"] = self._queue.qsize()
+        snapshot["avg_batch"] = snapshot["committed"] / snapshot["batches"] if snapshot["batches"] else 0.0
+        return snapshot
+
+    def close(self, timeout=5.0):
+        """Finish queued writes and stop the thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+
+def _fail(future, exc):
+    if not future.done():
+        future.set_exception(exc)
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(db_path, **kwargs):
+    """Return the process-wide writer for ``db_path`` (started on first use)."""
+    key = str(Path(db_path).resolve())
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or not writer._thread.is_alive():  # e.g. it couldn't open the file
+            writer = GroupCommitWriter(key, **kwargs)
+            _writers[key] = writer
+        return writer
+
+
+@atexit.register
+def _close_writers():
+    with _writers_lock:
+        for writer in _writers.values():
+            writer.close()
+        _writers.clear()
@@ -0,0 +1,133 @@
+# app/services/auth.py
+# Password hashing and the pieces of login that don't touch the database.
+# bcrypt is slow on purpose, so hashing and verifying run on a small,
+# dedicated thread pool (bcrypt releases the GIL while it works): a burst
+# of logins queues there instead of pinning every Streamlit script thread
+# to the CPU, and the work factor can be tuned without touching callers.
+# Hashes that are weaker than today's setting (legacy unsalted SHA-256
+# from the old Streamlit backend, or bcrypt at a lower cost) are reported
+# as stale by verify_password() so the caller can upgrade them.
+import hashlib
+import hmac
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+BCRYPT_ROUNDS = 12            # work factor for new hashes (each +1 doubles the cost)
+HASH_WORKERS = 2              # hashes computed at once; further logins wait in line
+NEGATIVE_CACHE_TTL = 30.0     # seconds an unknown username is remembered
+NEGATIVE_CACHE_SIZE = 10_000
+
+_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def configure(rounds=None, workers=None):
+    """Change the bcrypt work factor and/or the number of hashing threads."""
+    global BCRYPT_ROUNDS, HASH_WORKERS, _executor
+    if rounds is not None:
+        BCRYPT_ROUNDS = rounds
+    if workers is not None and workers != HASH_WORKERS:
+        HASH_WORKERS = workers
+        with _executor_lock:
+            old, _executor = _executor, None
+        if old is not None:
+            old.shutdown(wait=False)
+
+
+def _hash_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(HASH_WORKERS, thread_name_prefix="auth")
+        return _executor
+
+
+def hash_cost(stored_hash):
+    """bcrypt work factor of a stored hash (0 for anything that isn't bcrypt)."""
+    parts = stored_hash.split("$")
+    if len(parts) >= 4 and parts[1] in ("2a", "2b", "2y") and parts[2].isdigit():
+        return int(parts[2])
+    return 0
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _verify(password, stored_hash):
+    if _SHA256_HEX.fullmatch(stored_hash):  # legacy app_backend hash
+        legacy = hashlib.sha256(password.encode("utf-8")).hexdigest()
+        return hmac.compare_digest(legacy, stored_hash), True
+    try:
+        ok = bcrypt.checkpw(password.encode("utf-8"), stored_hash.encode("utf-8"))
+    except ValueError:  # not a hash we understand
+        return False, False
+    return ok, hash_cost(stored_hash) < BCRYPT_ROUNDS
+
+
+def submit_hash(password, rounds=None):
+    """Future of a new bcrypt hash (at ``rounds``, default BCRYPT_ROUNDS)."""
+    return _hash_executor().submit(_hash, password, rounds or BCRYPT_ROUNDS)
+
+
+def submit_verify(password, stored_hash):
+    """Future of (matches, stale) for a password against a stored hash."""
+    return _hash_executor().submit(_verify, password, stored_hash)
+
+
+def hash_password(password, rounds=None):
+    return submit_hash(password, rounds).result()
+
+
+def verify_password(password, stored_hash):
+    """(matches, stale): stale means the hash should be replaced after a successful login."""
+    return submit_verify(password, stored_hash).result()
+
+
+class NegativeCache:
+    """Usernames recently found not to exist, each forgotten after ``ttl`` seconds.
+
+    Lets repeated logins for unknown names skip the database. Per process,
+    so a user registered elsewhere can be reported missing for up to ``ttl``.
+    """
+
+    def __init__(self, ttl=NEGATIVE_CACHE_TTL, max_size=NEGATIVE_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._expiry = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key):
+        with self._lock:
+            self._expiry.pop(key, None)
+            self._expiry[key] = time.monotonic() + self.ttl
+            while len(self._expiry) > self.max_size:
+                self._expiry.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            expiry = self._expiry.get(key)
+            if expiry is None:
+                return False
+            if expiry < time.monotonic():
+                del self._expiry[key]
+                return False
+            return True
+
+    def discard(self, key):
+        with self._lock:
+            self._expiry.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._expiry.clear()
+
+
+unknown_users = NegativeCache()
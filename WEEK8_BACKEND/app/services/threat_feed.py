@@ -0,0 +1,533 @@
+# app/services/threat_feed.py
+"""Streaming threat feed: alert files/socket -> cyber_incidents + ring buffer.
+
+Alerts arrive as lines appended to *.ndjson / *.csv files in DATA/feeds/
+(CSV files start with a header line) or, optionally, as JSON lines sent to
+a local TCP socket. An asyncio loop tails every source and pushes parsed
+events into a bounded queue; when the database falls behind the queue
+fills and the tailers simply stop reading (on the socket that becomes TCP
+backpressure on the sender), so memory stays bounded. One consumer drains
+the queue in micro-batches, writes each batch with insert_incidents_bulk
+in a worker thread, and appends the stored events to an in-memory ring
+buffer the dashboard reads without touching the database.
+
+Files are followed by inode: a rotated file (renamed, then recreated) is
+finished and the new one read from its start. The byte offset reached in
+each file is saved to DATA/feeds/.offsets.json once its events are stored,
+so a restart resumes where the last run stopped; a batch the database
+keeps rejecting freezes its files' offsets before it, so the next run
+reads those events again. Only one process ingests
+a feed directory at a time (a lock on DATA/feeds/.lock); the others wait
+and take over when it exits.
+
+Run from WEEK8_BACKEND:
+    python -m app.services.threat_feed                 # ingest in the foreground
+    python -m app.services.threat_feed --simulate 50   # append demo alerts
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+
+from app.data.dates import to_iso
+from app.data.incidents import INCIDENT_COLUMNS, insert_incidents_bulk
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+FEED_DIR = Path(__file__).resolve().parents[2] / "DATA" / "feeds"
+FEED_PATTERNS = ("*.ndjson", "*.jsonl", "*.csv")
+QUEUE_SIZE = 10_000     # events waiting for the database before tailers block
+BATCH_SIZE = 500        # most events written per transaction
+BATCH_DELAY = 0.25      # seconds a batch waits to fill up
+BUFFER_SIZE = 200       # events kept in memory for the dashboard
+POLL_INTERVAL = 0.5     # seconds between checks for new lines / files
+LOCK_RETRY = 2.0        # seconds between attempts to become the feed's owner
+FLUSH_RETRIES = 3       # extra attempts for a batch the database rejected
+RETRY_DELAY = 0.5       # seconds before the first retry, doubled for each next one
+OFFSETS_FILE = ".offsets.json"
+LOCK_FILE = ".lock"
+
+# accepted spellings for each field, first match wins
+FIELD_ALIASES = {
+    "date_reported": ("date_reported", "timestamp", "time", "date"),
+    "incident_type": ("incident_type", "type", "threat", "category"),
+    "severity": ("severity", "level"),
+    "status": ("status",),
+    "description": ("description", "message", "summary"),
+    "asset": ("asset", "target", "host"),
+    "region": ("region",),
+    "reported_by": ("reported_by", "source", "sensor"),
+}
+SEVERITIES = {s.lower(): s for s in ("Low", "Medium", "High", "Critical")}
+
+# vocabulary of the demo generator (the old simulated dashboard feed)
+THREAT_TYPES = ["Phishing", "Ransomware", "DDoS", "Bruteforce", "Data Exfiltration"]
+REGIONS = ["EMEA", "APAC", "NA", "LATAM"]
+ASSETS = ["Email Gateway", "Web Server", "Database Cluster", "VPN Gateway", "User Endpoint"]
+
+
+class RingBuffer:
+    """The last ``size`` events, newest at the right.
+
+    Appending is O(1) and the oldest event falls off; ``latest(n)`` walks n
+    items from the newest end, so a reader's cost doesn't depend on how
+    many events have gone through.
+    """
+
+    def __init__(self, size=BUFFER_SIZE):
+        self._events = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def extend(self, events):
+        with self._lock:
+            self._events.extend(events)
+            self.total += len(events)
+
+    def latest(self, n=None):
+        """Newest first."""
+        with self._lock:
+            return list(islice(reversed(self._events), n))
+
+    def __len__(self):
+        return len(self._events)
+
+
+def _pick(record, field):
+    for key in FIELD_ALIASES[field]:
+        value = record.get(key)
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+
+def parse_event(record):
+    """Normalize one alert dict into an incident event (None if unusable).
+
+    Needs at least a type or a description. Missing dates become today,
+    severities are title-cased (unknown ones are kept as given) and a
+    description is composed from type/asset/region when absent.
+    """
+    if not isinstance(record, dict):
+        return None
+    event = {field: _pick(record, field) for field in FIELD_ALIASES}
+    if not event["incident_type"] and not event["description"]:
+        return None
+    try:
+        event["date_reported"] = to_iso(event["date_reported"]) if event["date_reported"] else None
+    except (ValueError, TypeError):
+        event["date_reported"] = None
+    event["date_reported"] = event["date_reported"] or date.today().isoformat()
+    if event["severity"]:
+        event["severity"] = SEVERITIES.get(event["severity"].lower(), event["severity"])
+    event["incident_type"] = event["incident_type"] or "Unknown"
+    event["status"] = event["status"] or "Open"
+    event["reported_by"] = event["reported_by"] or "threat-feed"
+    if not event["description"]:
+        where = " ".join(filter(None, [f"targeting {event['asset']}" if event["asset"] else None,
+                                       f"in {event['region']}" if event["region"] else None]))
+        event["description"] = f"{event['incident_type']} {where}".strip()
+    return event
+
+
+def _lock(path):
+    """Open ``path`` and take an exclusive non-blocking lock; None if someone holds it."""
+    f = open(path, "a+")
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+def _file_id(stat):
+    return f"{stat.st_dev}:{stat.st_ino}"
+
+
+class ThreatFeed:
+    """asyncio ingestor for the alert sources of one feed directory."""
+
+    def __init__(self, feed_dir=FEED_DIR, port=None, host="127.0.0.1", queue_size=QUEUE_SIZE,
+                 batch_size=BATCH_SIZE, batch_delay=BATCH_DELAY, buffer_size=BUFFER_SIZE,
+                 from_start=False):
+        self.feed_dir = Path(feed_dir)
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.from_start = from_start  # also ingest what's already in files present at startup
+        self.buffer = RingBuffer(buffer_size)
+        self._stats = {"received": 0, "rejected": 0, "written": 0, "failed": 0, "batches": 0,
+                       "backpressure_waits": 0, "sources": 0, "owner": False}
+        self._offsets = {}  # file id (dev:ino) -> {"file": name, "offset": bytes stored}
+        self._lock_file = None
+        self._tailing = set()  # file ids with a live tailer (a rotated file may match twice)
+        self._held = set()     # file ids whose offset stays before events that failed to store
+        self._queue = None
+        self._loop = None
+        self._task = None
+        self._thread = None
+        self._stopping = False
+
+    # ---------- producers ----------
+    async def _publish(self, record, source=None):
+        event = parse_event(record)
+        if event is None:
+            self._stats["rejected"] += 1
+            return
+        event["received_at"] = datetime.now().isoformat(timespec="seconds")
+        event["_source"] = source  # (file id, offset after the line) for files
+        self._stats["received"] += 1
+        if self._queue.full():
+            self._stats["backpressure_waits"] += 1
+        await self._queue.put(event)  # blocks this source while the writer catches up
+
+    async def _publish_line(self, line, header=None, source=None):
+        line = line.strip()
+        if not line:
+            return
+        if header is not None:
+            values = next(csv.reader([line]))
+            await self._publish(dict(zip(header, values)), source)
+            return
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            self._stats["rejected"] += 1
+            return
+        await self._publish(record, source)
+
+    async def _tail(self, path, from_end):
+        """Follow one file like ``tail -F``: new complete lines, truncation restarts.
+
+        Starts at the saved offset for this inode if there is one, else at
+        the end (``from_end``) or the start. Returns when the path is
+        deleted or now names another file (rotation); _watch then tails
+        whatever appears there from its start.
+        """
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            file_id = _file_id(stat)
+            if file_id in self._tailing:  # still being read under its old name
+                return
+            self._tailing.add(file_id)
+            try:
+                await self._follow(f, path, stat, file_id, from_end)
+            finally:
+                self._tailing.discard(file_id)
+
+    async def _follow(self, f, path, stat, file_id, from_end):
+        """Publish the lines of the open file ``f`` until ``path`` stops naming it."""
+        is_csv = path.suffix.lower() == ".csv"
+        header = None
+        if is_csv:
+            first = f.readline()
+            if first.endswith(b"\n"):
+                header = next(csv.reader([first.decode("utf-8", "replace").strip()]))
+            else:
+                f.seek(0)
+        saved = self._offsets.get(file_id)
+        if saved is not None and saved["offset"] <= stat.st_size:
+            f.seek(max(saved["offset"], f.tell()))
+        elif from_end:
+            f.seek(0, 2)
+        partial = b""
+        while not self._stopping:
+            line = f.readline()
+            if not line:
+                try:
+                    current = path.stat()
+                except FileNotFoundError:  # deleted; _watch restarts us if it comes back
+                    return
+                if _file_id(current) != file_id:  # rotated: the old file is done
+                    return
+                if current.st_size < f.tell():  # truncated: start over
+                    f.seek(0)
+                    header, partial = None, b""
+                    self._offsets.pop(file_id, None)
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+            if not line.endswith(b"\n"):  # writer is mid-line; wait for the rest
+                partial += line
+                continue
+            line, partial = (partial + line).decode("utf-8", "replace"), b""
+            if is_csv and header is None:
+                header = next(csv.reader([line.strip()]))
+                continue
+            await self._publish_line(line, header, (file_id, path.name, f.tell()))
+
+    def _load_offsets(self):
+        try:
+            self._offsets = json.loads((self.feed_dir / OFFSETS_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._offsets = {}
+
+    def _save_offsets(self):
+        """Write the offsets (atomically), forgetting files no longer in the feed dir."""
+        present = set()
+        for pattern in FEED_PATTERNS:
+            for p in self.feed_dir.glob(pattern):
+                try:
+                    present.add(_file_id(p.stat()))
+                except FileNotFoundError:
+                    pass
+        self._offsets = {k: v for k, v in self._offsets.items() if k in present}
+        path = self.feed_dir / OFFSETS_FILE
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(self._offsets), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️ Threat feed: could not save offsets: {e}")
+
+    async def _watch(self):
+        """Start a tailer for every feed file, including ones created later."""
+        self.feed_dir.mkdir(parents=True, exist_ok=True)
+        tails = {}
+        first_scan = True
+        while not self._stopping:
+            for pattern in FEED_PATTERNS:
+                for path in self.feed_dir.glob(pattern):
+                    task = tails.get(path)
+                    if task is None or task.done():  # new, or deleted and back again
+                        from_end = first_scan and not self.from_start
+                        tails[path] = asyncio.create_task(self._tail(path, from_end))
+            self._stats["sources"] = sum(not t.done() for t in tails.values())
+            first_scan = False
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while line := await reader.readline():  # not read while the queue is full
+                await self._publish_line(line.decode("utf-8", "replace"))
+        finally:
+            writer.close()
+
+    async def _serve(self):
+        server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        async with server:
+            await server.serve_forever()
+
+    # ---------- consumer ----------
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.batch_delay
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch):
+        rows = [tuple(event[c] for c in INCIDENT_COLUMNS) for event in batch]
+        sources = [event.pop("_source") for event in batch]
+        for attempt in range(FLUSH_RETRIES + 1):
+            try:
+                ranges = await asyncio.to_thread(insert_incidents_bulk, rows)
+                break
+            except Exception as e:
+                if attempt < FLUSH_RETRIES:
+                    await asyncio.sleep(RETRY_DELAY * 2 ** attempt)
+                    continue
+                # keep the saved offsets of these files before the lost events,
+                # so the next run reads them again (later events may repeat)
+                self._held.update(source[0] for source in sources if source)
+                self._stats["failed"] += len(batch)
+                print(f"❌ Threat feed: could not store {len(batch)} event(s) "
+                      f"after {attempt + 1} attempts: {e}")
+                return
+        for event, incident_id in zip(batch, (i for r in ranges for i in r)):
+            event["id"] = incident_id
+        # stored: move each file's offset past its last event (in queue order)
+        for source in filter(None, sources):
+            file_id, name, offset = source
+            if file_id not in self._held:
+                self._offsets[file_id] = {"file": name, "offset": offset}
+        if any(sources):
+            await asyncio.to_thread(self._save_offsets)
+        self.buffer.extend(batch)
+        self._stats["written"] += len(batch)
+        self._stats["batches"] += 1
+
+    async def _consume(self):
+        while True:
+            await self._flush(await self._next_batch())
+
+    def _try_lock(self):
+        if self._lock_file is None:
+            self.feed_dir.mkdir(parents=True, exist_ok=True)
+            self._lock_file = _lock(self.feed_dir / LOCK_FILE)
+        self._stats["owner"] = self._lock_file is not None
+        return self._stats["owner"]
+
+    async def _acquire(self):
+        """Wait until this process owns the feed directory."""
+        while not self._try_lock():
+            await asyncio.sleep(LOCK_RETRY)
+        self._load_offsets()
+
+    def _release(self):
+        if self._lock_file is not None:
+            self._lock_file.close()  # closing drops the lock
+            self._lock_file = None
+        self._stats["owner"] = False
+
+    async def run(self):
+        """Ingest until cancelled; queued events are written before returning.
+
+        Waits first until no other process is ingesting the same feed dir.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        try:
+            await self._acquire()
+        except asyncio.CancelledError:
+            return
+        try:
+            await self._ingest()
+        finally:
+            self._release()
+
+    async def _ingest(self):
+        producers = [asyncio.create_task(self._watch())]
+        if self.port:
+            producers.append(asyncio.create_task(self._serve()))
+        consumer = asyncio.create_task(self._consume())
+        try:
+            await asyncio.gather(*producers, consumer)
+        finally:
+            self._stopping = True
+            for task in producers + [consumer]:
+                task.cancel()
+            await asyncio.gather(*producers, consumer, return_exceptions=True)
+            while not self._queue.empty():
+                await self._flush([self._queue.get_nowait()
+                                   for _ in range(min(self.batch_size, self._queue.qsize()))])
+
+    # ---------- background thread ----------
+    def start(self):
+        """Run the feed on its own event loop in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        ready = threading.Event()
+
+        def _main():
+            async def _runner():
+                self._task = asyncio.current_task()
+                ready.set()
+                await self.run()
+            try:
+                asyncio.run(_runner())
+            except asyncio.CancelledError:
+                pass
+
+        self._stopping = False
+        self._try_lock()  # so stats() says who owns the feed right away
+        self._thread = threading.Thread(target=_main, name="threat-feed", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self, timeout=5.0):
+        """Stop the sources, write what's queued and join the thread."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._task.cancel)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self):
+        snapshot = dict(self._stats)
+        snapshot["queued"] = self._queue.qsize() if self._queue else 0
+        snapshot["running"] = self._thread is not None and self._thread.is_alive()
+        return snapshot
+
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+
+def get_feed(feed_dir=FEED_DIR, **kwargs):
+    """Return the process-wide running feed for ``feed_dir`` (started on first use)."""
+    key = str(Path(feed_dir).resolve())
+    with _feeds_lock:
+        feed = _feeds.get(key)
+        if feed is None:
+            feed = ThreatFeed(key, **kwargs).start()
+            _feeds[key] = feed
+        return feed
+
+
+def simulate(count, path=None, delay=0.0):
+    """Append ``count`` random demo alerts to an NDJSON feed file."""
+    path = Path(path or FEED_DIR / "simulated.ndjson")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for _ in range(count):
+        alert = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "type": random.choice(THREAT_TYPES),
+            "severity": random.choice(list(SEVERITIES.values())),
+            "asset": random.choice(ASSETS),
+            "region": random.choice(REGIONS),
+            "source": "simulator",
+        }
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(alert) + "\n")
+        if delay:
+            time.sleep(delay)
+    print(f"✅ Appended {count} alert(s) to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feed-dir", type=Path, default=FEED_DIR)
+    parser.add_argument("--port", type=int, help="also accept JSON lines on this local TCP port")
+    parser.add_argument("--from-start", action="store_true",
+                        help="ingest existing file contents instead of only new lines")
+    parser.add_argument("--simulate", type=int, metavar="N", help="append N demo alerts and exit")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds between simulated alerts")
+    args = parser.parse_args()
+
+    if args.simulate:
+        simulate(args.simulate, args.feed_dir / "simulated.ndjson", args.delay)
+        return
+
+    feed = ThreatFeed(args.feed_dir, port=args.port, from_start=args.from_start).start()
+    print(f"📡 Tailing {args.feed_dir}" + (f" and 127.0.0.1:{args.port}" if args.port else "") + " (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"  {feed.stats()}")
+    except KeyboardInterrupt:
+        feed.stop()
+        print(f"🛑 Stopped: {feed.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,55 @@
-import bcrypt
 from pathlib import Path
-from app.data.users import get_user_by_username, insert_user
+from app.data.users import get_user_by_username, insert_user, update_password_hash
+from app.data.metrics import instrumented
+from app.services.auth import hash_password, submit_hash, unknown_users, verify_password
 
+@instrumented
 def register_user(username, password, role='user'):
     # Check if user exists
     if get_user_by_username(username):
         return False, f"Username '{username}' already exists."
     
-    # Hash password
-    password_hash = bcrypt.hashpw(
-        password.encode('utf-8'),
-        bcrypt.gensalt()
-    ).decode('utf-8')
+    # Hash password (bcrypt, on the auth service's hashing threads)
+    password_hash = hash_password(password)
     
     # Insert user
     insert_user(username, password_hash, role)
+    unknown_users.discard(username)
     return True, f"User '{username}' registered successfully."
 
-def login_user(username, password):
+def _upgrade_hash(user_id, password):
+    """Re-hash in the background at the current work factor, then store it."""
+    def store(future):
+        if future.exception() is None:
+            update_password_hash(user_id, future.result())
+
+    future = submit_hash(password)
+    future.add_done_callback(store)
+    return future
+
+def authenticate(username, password):
+    """(success, message, user row or None).
+
+    Unknown usernames are remembered briefly so repeated attempts skip the
+    database. A legacy SHA-256 or lower-cost bcrypt hash is replaced by a
+    current one after a successful login, without delaying it.
+    """
+    if username in unknown_users:
+        return False, "User not found.", None
     user = get_user_by_username(username)
     if not user:
-        return False, "User not found."
+        unknown_users.add(username)
+        return False, "User not found.", None
     
     stored_hash = user[2]  # password_hash column
-    if bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8')):
-        return True, f"Welcome, {username}!"
-    return False, "Incorrect password."
\ No newline at end of file
+    ok, stale = verify_password(password, stored_hash)
+    if not ok:
+        return False, "Incorrect password.", None
+    if stale:
+        _upgrade_hash(user[0], password)
+    return True, f"Welcome, {username}!", user
+
+@instrumented
+def login_user(username, password):
+    success, message, _ = authenticate(username, password)
+    return success, message
@@ -0,0 +1,65 @@
+# benchmarks/bench_bulk.py
+"""Row-at-a-time insert_incident vs insert_incidents_bulk on a scratch DB.
+
+Run from WEEK8_BACKEND:  python -m benchmarks.bench_bulk [--rows 50000]
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from app.data import db
+from app.data.incidents import (
+    delete_incidents_bulk,
+    insert_incident,
+    insert_incidents_bulk,
+    update_incident_status_bulk,
+)
+from app.data.migrations import apply_migrations
+from app.data.schema import create_all_tables
+from benchmarks.synthetic import incident_rows
+
+
+def timed(label, fn, rows):
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    print(f"{label:<34}{rows:>9,}{seconds:>10.2f}s{rows / seconds:>12,.0f} rows/s")
+    return result
+
+
+def run(rows, single_rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        with contextlib.redirect_stdout(io.StringIO()):
+            conn = db.connect_database(db_path)
+            create_all_tables(conn)
+            apply_migrations(conn)
+            conn.close()
+
+        db.DB_PATH = db_path  # point connection() at the scratch DB
+        data = list(incident_rows(rows))
+
+        timed("insert_incident (one per call)", lambda: [insert_incident(*r) for r in data[:single_rows]],
+              single_rows)
+        ranges = timed("insert_incidents_bulk", lambda: insert_incidents_bulk(data), rows)
+        timed("insert_incidents_bulk (10k batches)",
+              lambda: insert_incidents_bulk(data, batch_size=10_000), rows)
+        ids = list(ranges[0])
+        timed("update_incident_status_bulk", lambda: update_incident_status_bulk(ids, "Closed"), len(ids))
+        timed("delete_incidents_bulk", lambda: delete_incidents_bulk(ids), len(ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--single-rows", type=int, default=2_000,
+                        help="rows for the one-per-call baseline (it is slow)")
+    args = parser.parse_args()
+    run(args.rows, args.single_rows)
+
+
+if __name__ == "__main__":
+    main()
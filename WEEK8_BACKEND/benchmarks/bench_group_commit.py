@@ -0,0 +1,94 @@
+# benchmarks/bench_group_commit.py
+"""Per-call commits vs the group-commit writer under concurrent submitters.
+
+Run from WEEK8_BACKEND:
+    python -m benchmarks.bench_group_commit [--saves 4000] [--synchronous FULL]
+
+Each run spreads the same number of incident saves across 1, 8 and 64
+threads. "per-call" is the old path (borrow a connection, insert, commit);
+"group" submits to a GroupCommitWriter and waits on the future.
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from app.data.db import connect_database
+from app.data.incidents import INSERT_INCIDENT_SQL
+from app.data.migrations import apply_migrations
+from app.data.pool import PRAGMAS, ConnectionPool
+from app.data.schema import create_all_tables
+from app.data.writer import GroupCommitWriter
+from benchmarks.synthetic import incident_rows
+
+SUBMITTERS = [1, 8, 64]
+
+
+def fresh_db(tmp, name):
+    path = Path(tmp) / f"{name}.db"
+    with contextlib.redirect_stdout(io.StringIO()):
+        conn = connect_database(path)
+        create_all_tables(conn)
+        apply_migrations(conn)
+        conn.close()
+    return path
+
+
+def run_threads(submitters, rows, save):
+    """Run ``save(row)`` for every row across ``submitters`` threads; seconds taken."""
+    shares = [rows[i::submitters] for i in range(submitters)]
+    threads = [threading.Thread(target=lambda share=share: [save(r) for r in share]) for share in shares]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def per_call(path, submitters, rows, pragmas):
+    pool = ConnectionPool(path, max_size=min(submitters, 8), pragmas=pragmas)
+
+    def save(row):
+        with pool.connection() as conn:
+            conn.execute(INSERT_INCIDENT_SQL, row)
+            conn.commit()
+
+    seconds = run_threads(submitters, rows, save)
+    pool.close_all()
+    return seconds, len(rows)
+
+
+def group(path, submitters, rows, pragmas):
+    writer = GroupCommitWriter(path, pragmas=pragmas)
+    seconds = run_threads(submitters, rows, lambda row: writer.execute(INSERT_INCIDENT_SQL, row))
+    batches = writer.stats()["batches"]
+    writer.close()
+    return seconds, batches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--saves", type=int, default=4000)
+    parser.add_argument("--synchronous", default=PRAGMAS["synchronous"],
+                        help="PRAGMA synchronous for both paths (FULL = fsync every commit)")
+    args = parser.parse_args()
+
+    pragmas = dict(PRAGMAS, synchronous=args.synchronous)
+    rows = list(incident_rows(args.saves))
+    print(f"{args.saves:,} saves, synchronous={args.synchronous}\n")
+    print(f"{'submitters':>10}{'mode':>10}{'seconds':>10}{'saves/s':>10}{'commits':>9}{'commits/s':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for submitters in SUBMITTERS:
+            for mode, fn in (("per-call", per_call), ("group", group)):
+                path = fresh_db(tmp, f"{mode}_{submitters}")
+                seconds, commits = fn(path, submitters, rows, pragmas)
+                print(f"{submitters:>10}{mode:>10}{seconds:>10.2f}{len(rows) / seconds:>10,.0f}"
+                      f"{commits:>9,}{commits / seconds:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_load_many.py
+"""Sequential vs concurrent (load_many) loading of the dashboard's queries.
+
+Run from WEEK8_BACKEND:  python -m benchmarks.bench_load_many [--rows 200000]
+
+Prints each query's own time and the wall time of both strategies. With
+enough cores the concurrent total should approach the slowest single
+query; SQLite releases the GIL while it runs, but pandas work on the
+results does not, so frame-heavy loads overlap less than pure SQL.
+"""
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.data import db
+from app.data.aio import format_timings, load_many
+from app.data.migrations import apply_migrations
+from app.data.schema import create_all_tables
+from benchmarks.synthetic import populate
+
+STREAMLIT_DIR = Path(__file__).resolve().parents[2] / "WEEK9_STREAMLIT"
+
+
+def dashboard_queries():
+    sys.path.insert(0, str(STREAMLIT_DIR))
+    from app_backend.aggregates import count_by, trend
+    from app_backend.datasets import load_datasets
+    from app_backend.incidents import load_incidents
+    from app_backend.tickets import load_tickets
+
+    return {
+        "load_incidents": load_incidents,
+        "load_tickets": load_tickets,
+        "load_datasets": load_datasets,
+        "incident_types": (count_by, "cyber_incidents", "incident_type", {"status": "Open"}),
+        "incident_trend": (trend, "incidents", "day", None, None, "severity"),
+    }
+
+
+def run(rows, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        with contextlib.redirect_stdout(io.StringIO()):
+            conn = db.connect_database(path)
+            create_all_tables(conn)
+            populate(conn, incidents=rows, tickets=rows, datasets=max(rows // 10, 1))
+            apply_migrations(conn)
+            conn.close()
+        db.DB_PATH = path
+        queries = dashboard_queries()
+        from app_backend.cache import query_cache
+
+        sequential, concurrent = float("inf"), float("inf")
+        for _ in range(repeat):
+            query_cache.clear()
+            start = time.perf_counter()
+            for query in queries.values():
+                fn, *args = query if isinstance(query, tuple) else (query,)
+                fn(*args)
+            sequential = min(sequential, time.perf_counter() - start)
+
+            query_cache.clear()
+            _, timings = load_many(queries)
+            if timings["total"]["seconds"] < concurrent:
+                concurrent, best = timings["total"]["seconds"], timings
+
+        print("load_many, per query (best run):")
+        for line in format_timings(best):
+            print(f"  {line}")
+        slowest = max(t["seconds"] for n, t in best.items() if n != "total")
+        print(f"\nsequential: {sequential * 1000:.1f} ms   load_many: {concurrent * 1000:.1f} ms   "
+              f"slowest single query: {slowest * 1000:.1f} ms   speed-up: {sequential / concurrent:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_login.py
+"""Login throughput and tail latency at increasing concurrency.
+
+Run from WEEK8_BACKEND:
+    python -m benchmarks.bench_login [--rounds 10] [--workers 2] [--concurrency 1 4 16]
+
+Each level starts that many client threads calling login_user() for
+--logins logins in total. Hashing is bounded by the auth service's
+--workers threads, so above that level throughput flattens and the extra
+clients show up as queueing in p99 instead of oversubscribing the CPU.
+Unknown-user logins (answered from the negative cache) are timed
+separately.
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app.data import db
+from app.data.schema import create_all_tables
+from app.services import auth
+from app.services.user_service import login_user, register_user
+
+USERS = 32
+
+
+def timed_login(username, password):
+    start = time.perf_counter()
+    ok, _ = login_user(username, password)
+    return time.perf_counter() - start, ok
+
+
+def run_level(concurrency, logins):
+    calls = [(f"user{i % USERS}", "bench-password") for i in range(logins)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as clients:
+        results = list(clients.map(lambda c: timed_login(*c), calls))
+    wall = time.perf_counter() - start
+    latencies = sorted(seconds for seconds, _ in results)
+    assert all(ok for _, ok in results), "a benchmark login failed"
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+    return logins / wall, statistics.median(latencies), p99
+
+
+def run(rounds, workers, levels, logins):
+    auth.configure(rounds=rounds, workers=workers)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        with contextlib.redirect_stdout(io.StringIO()):
+            conn = db.connect_database(path)
+            create_all_tables(conn)
+            conn.close()
+        db.DB_PATH = path
+        for i in range(USERS):
+            register_user(f"user{i}", "bench-password")
+
+        print(f"🔐 bcrypt cost {rounds}, {workers} hashing thread(s), {logins} logins per level")
+        print(f"{'clients':>8}{'logins/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+        for level in levels:
+            rate, p50, p99 = run_level(level, logins)
+            print(f"{level:>8}{rate:>12.1f}{p50 * 1000:>10.1f}{p99 * 1000:>10.1f}")
+
+        login_user("nobody", "x")  # prime the negative cache
+        start = time.perf_counter()
+        for _ in range(1000):
+            login_user("nobody", "x")
+        print(f"\nunknown user (negative cache): {(time.perf_counter() - start) * 1000:.3f} µs/login")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt work factor")
+    parser.add_argument("--workers", type=int, default=auth.HASH_WORKERS, help="hashing threads")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+    run(args.rounds, args.workers, args.concurrency, args.logins)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# benchmarks/bench_mappers.py
+"""Parity check + micro-benchmark for the vectorized CSV mappers in main.py.
+
+Run from WEEK8_BACKEND:  python -m benchmarks.bench_mappers [--sizes 10000 100000 1000000]
+
+The original iterrows() mappers are kept below as the reference output.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from main import map_cyber_incidents, map_datasets_metadata, map_it_tickets
+
+
+# ---------------- reference (pre-vectorization) mappers ----------------
+
+def legacy_map_cyber_incidents(df):
+    mapped_rows = []
+    for _, row in df.iterrows():
+        mapped_rows.append({
+            "date_reported": row.get("Date", "2024-01-01"),
+            "incident_type": row.get("Type", "Unknown"),
+            "severity": "Medium",
+            "status": "Open",
+            "description": f"{row.get('Title', '')} - {row.get('Description', '')}",
+            "reported_by": "System"
+        })
+    return pd.DataFrame(mapped_rows)
+
+
+def legacy_map_datasets_metadata(df):
+    mapped_rows = []
+    for _, row in df.iterrows():
+        mapped_rows.append({
+            "dataset_name": row.get("dataset_name", "Unknown Dataset"),
+            "source": row.get("source_organization", "Unknown"),
+            "record_count": 0,
+            "last_updated": row.get("last_updated", "2024-01-01"),
+            "description": row.get("description", "No description")
+        })
+    return pd.DataFrame(mapped_rows)
+
+
+def legacy_map_it_tickets(df):
+    mapped_rows = []
+    for i, row in df.iterrows():
+        mapped_rows.append({
+            "ticket_id": f"TICKET_{i + 1000}",
+            "date_created": "2024-01-01",
+            "priority": row.get("Category", "Medium"),
+            "status": "Open",
+            "description": row.get("Customer Input", "No description"),
+            "assigned_to": "Unassigned"
+        })
+    return pd.DataFrame(mapped_rows)
+
+
+# ---------------- synthetic raw CSV frames ----------------
+
+def _pick(rng, values, n, missing=0.05):
+    """Random choice from values with a share of NaNs, like a messy export."""
+    col = rng.choice(values, size=n).astype(object)
+    col[rng.random(n) < missing] = np.nan
+    return pd.Series(col)
+
+
+def raw_incidents(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Title": _pick(rng, ["Attack on ministry", "Spear-phishing campaign", "DDoS on bank"], n),
+        "Date": _pick(rng, ["2/13/2020", "1/23/2020", "4/6/2020"], n),
+        "Description": _pick(rng, ["Weeks-long intrusion.", "Malware via email.", "Service outage."], n),
+        "Type": _pick(rng, ["Espionage", "Data destruction", "Denial of service"], n),
+    })
+
+
+def raw_datasets(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "dataset_name": _pick(rng, ["MISP feed", "CVE dump", "Netflow sample"], n),
+        "source_organization": _pick(rng, ["CERT", "NIST", "Internal"], n),
+        "last_updated": _pick(rng, ["2024-01-01", "2024-06-30"], n),
+        "description": _pick(rng, ["Indicators", "Vulnerabilities", "Traffic"], n),
+    })
+
+
+def raw_tickets(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Customer Input": _pick(rng, ["VPN is down", "Laptop cursor stuck", "Slow internet"], n),
+        "Category": _pick(rng, ["Network Issue", "OS Issue"], n),
+    })
+
+
+CASES = [
+    ("cyber_incidents", raw_incidents, legacy_map_cyber_incidents, map_cyber_incidents),
+    ("datasets_metadata", raw_datasets, legacy_map_datasets_metadata, map_datasets_metadata),
+    ("it_tickets", raw_tickets, legacy_map_it_tickets, map_it_tickets),
+]
+
+
+def _timed(fn, df):
+    start = time.perf_counter()
+    out = fn(df)
+    return out, time.perf_counter() - start
+
+
+def check_parity(expected, actual, name):
+    """Raise AssertionError if the vectorized mapper output differs."""
+    pd.testing.assert_frame_equal(expected, actual, obj=name)
+
+
+def run(sizes, legacy_max):
+    print(f"{'table':<20}{'rows':>10}{'legacy s':>12}{'vector s':>12}{'speedup':>10}  parity")
+    for size in sizes:
+        for name, make_raw, legacy, vectorized in CASES:
+            raw = make_raw(size)
+            new_df, new_s = _timed(vectorized, raw)
+            if size <= legacy_max:
+                old_df, old_s = _timed(legacy, raw)
+                check_parity(old_df, new_df, name)
+                print(f"{name:<20}{size:>10}{old_s:>12.3f}{new_s:>12.3f}{old_s / new_s:>9.0f}x  ok")
+            else:
+                print(f"{name:<20}{size:>10}{'-':>12}{new_s:>12.3f}{'-':>10}  skipped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument(
+        "--legacy-max", type=int, default=100_000,
+        help="skip the slow iterrows() reference above this many rows",
+    )
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_max)
+
+
+if __name__ == "__main__":
+    main()
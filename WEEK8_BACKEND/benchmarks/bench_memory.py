@@ -0,0 +1,50 @@
+# benchmarks/bench_memory.py
+"""Bytes per row of the table loaders: SELECT * vs compact dtypes vs projection.
+
+Run from WEEK8_BACKEND:  python -m benchmarks.bench_memory [--rows 200000]
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+
+from app.data.db import connect_database
+from app.data.frames import bytes_per_row, read_table
+from app.data.schema import create_all_tables
+from benchmarks.synthetic import populate
+
+# columns a chart-only page actually needs
+PROJECTIONS = {
+    "cyber_incidents": ["severity", "status", "date_reported"],
+    "it_tickets": ["priority", "status", "created_date"],
+    "datasets_metadata": ["source", "record_count", "last_updated"],
+}
+
+
+def run(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect_database(Path(tmp) / "bench.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_all_tables(conn)
+        populate(conn, incidents=rows, tickets=rows, datasets=rows)
+
+        print(f"{'table':<20}{'SELECT *':>12}{'compact':>12}{'projected':>12}{'saving':>10}   (bytes/row)")
+        for table, columns in PROJECTIONS.items():
+            before = bytes_per_row(read_table(conn, table, compact=False))
+            compact = bytes_per_row(read_table(conn, table))
+            projected = bytes_per_row(read_table(conn, table, columns))
+            print(f"{table:<20}{before:>12.0f}{compact:>12.0f}{projected:>12.0f}"
+                  f"{before / projected:>9.1f}x")
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+    run(args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/bench_migrations.py
+"""Apply the schema migrations to a synthetic DB and compare query plans/timings.
+
+Run from WEEK8_BACKEND:  python -m benchmarks.bench_migrations [--rows 200000]
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from app.data.db import connect_database
+from app.data.migrations import MIGRATIONS, apply_migrations
+from app.data.schema import create_all_tables
+from benchmarks.synthetic import populate
+
+
+def time_query(conn, sql, params, repeat=5):
+    """Best-of-N wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect_database(Path(tmp) / "bench.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_all_tables(conn)
+        populate(conn, incidents=rows, tickets=rows, datasets=max(rows // 10, 1))
+
+        probes = [probe for m in MIGRATIONS for probe in m["probes"]]
+        before = {sql: time_query(conn, sql, params) for sql, params in probes}
+
+        apply_migrations(conn, report=True)
+
+        print(f"\n{'query':<90}{'before ms':>11}{'after ms':>10}")
+        for sql, params in probes:
+            after = time_query(conn, sql, params)
+            print(f"{sql[:88]:<90}{before[sql]:>11.2f}{after:>10.2f}")
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+    run(args.rows)
+
+
+if __name__ == "__main__":
+    main()
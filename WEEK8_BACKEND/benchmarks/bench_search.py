@@ -0,0 +1,69 @@
+# benchmarks/bench_search.py
+"""Compare FTS5 search with a LIKE '%term%' scan on a synthetic DB.
+
+Run from WEEK8_BACKEND:  python -m benchmarks.bench_search [--rows 1000000]
+
+The synthetic vocabulary is tiny, so common words match a large share of
+the table; the rare-term row (one inserted needle) is closer to what real
+incident text looks like.
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from app.data.db import connect_database
+from app.data.migrations import apply_migrations
+from app.data.schema import create_all_tables
+from app.data.search import search
+from benchmarks.synthetic import populate
+
+QUERIES = ["xylophone", "ransomware server", "vpn emea", "phishing"]
+
+
+def best_ms(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run(rows, limit):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect_database(Path(tmp) / "bench.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_all_tables(conn)
+            populate(conn, incidents=rows)
+            conn.execute(
+                "INSERT INTO cyber_incidents (description, incident_type) VALUES (?, ?)",
+                ("Xylophone malware beaconing from lab host", "Malware"),
+            )
+            conn.commit()
+            apply_migrations(conn)
+
+        print(f"{'query':<22}{'hits':>8}{'FTS ms':>10}{'LIKE ms':>10}")
+        for query in QUERIES:
+            fts_ms, hits = best_ms(lambda: search(conn, "cyber_incidents", query, limit))
+            like = " AND ".join("description LIKE ?" for _ in query.split())
+            like_ms, _ = best_ms(lambda: conn.execute(
+                f"SELECT id FROM cyber_incidents WHERE {like} LIMIT ?",
+                [f"%{w}%" for w in query.split()] + [limit],
+            ).fetchall())
+            print(f"{query:<22}{len(hits):>8}{fts_ms:>10.2f}{like_ms:>10.2f}")
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    run(args.rows, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_snapshots.py
+"""Cold start from SQLite vs from Arrow snapshots: wall time and peak RSS.
+
+Run from WEEK8_BACKEND:  python -m benchmarks.bench_snapshots [--rows 1000000]
+
+Every measurement is a fresh Python process, so nothing is cached:
+"loaders" imports the Streamlit backend and calls load_incidents(),
+load_tickets() and load_datasets(); "dashboard" runs pages/1_Dashboard.py
+once through Streamlit's AppTest as a logged-in admin. Each runs once
+with snapshots disabled (SQLite) and once with them enabled (memory-mapped
+snapshot files). Times include imports.
+"""
+import argparse
+import contextlib
+import io
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.data import db
+from app.data.migrations import apply_migrations
+from app.data.schema import create_all_tables
+from app.data.snapshots import export_snapshots
+from benchmarks.synthetic import populate
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+STREAMLIT_DIR = BACKEND_DIR.parent / "WEEK9_STREAMLIT"
+
+CHILD = """
+import sys, time
+started = time.perf_counter()
+sys.path[:0] = [{streamlit!r}, {backend!r}]
+from app.data import db, snapshots
+db.DB_PATH = {db_path!r}
+snapshots.ENABLED = {enabled!r}
+{body}
+elapsed = time.perf_counter() - started
+# VmHWM starts over at exec; ru_maxrss would include the parent's peak
+peak = next(line.split()[1] for line in open("/proc/self/status") if line.startswith("VmHWM"))
+print(elapsed, peak)
+"""
+
+BODIES = {
+    "loaders": (
+        "from app_backend.incidents import load_incidents\n"
+        "from app_backend.tickets import load_tickets\n"
+        "from app_backend.datasets import load_datasets\n"
+        "load_incidents(); load_tickets(); load_datasets()"
+    ),
+    "dashboard": (
+        "from streamlit.testing.v1 import AppTest\n"
+        "at = AppTest.from_file('pages/1_Dashboard.py', default_timeout=600)\n"
+        "at.session_state['logged_in'] = True\n"
+        "at.session_state['role'] = 'admin'\n"
+        "at.run()\n"
+        "assert not at.exception, at.exception"
+    ),
+}
+
+
+def measure(db_path, body, enabled):
+    """(seconds, peak RSS in MB) of one fresh process."""
+    code = CHILD.format(streamlit=str(STREAMLIT_DIR), backend=str(BACKEND_DIR),
+                        db_path=str(db_path), enabled=enabled, body=body)
+    out = subprocess.run([sys.executable, "-c", code], cwd=STREAMLIT_DIR, check=True,
+                         capture_output=True, text=True).stdout
+    seconds, rss_kb = out.strip().splitlines()[-1].split()
+    return float(seconds), int(rss_kb) / 1024
+
+
+def run(rows, scenarios):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        with contextlib.redirect_stdout(io.StringIO()):
+            conn = db.connect_database(path)
+            create_all_tables(conn)
+            populate(conn, incidents=rows, tickets=max(rows // 10, 1), datasets=max(rows // 100, 1))
+            apply_migrations(conn)
+        start = time.perf_counter()
+        export_snapshots(conn)
+        conn.close()
+        size = sum(f.stat().st_size for f in (path.parent / "snapshots").iterdir()) / 2**20
+        print(f"🗂  {rows} incidents: snapshots written in {time.perf_counter() - start:.2f} s ({size:.0f} MB)")
+
+        print(f"{'scenario':<12}{'SQLite s':>10}{'RSS MB':>9}{'snapshot s':>12}{'RSS MB':>9}{'speed-up':>10}")
+        for name in scenarios:
+            sqlite_s, sqlite_rss = measure(path, BODIES[name], False)
+            snap_s, snap_rss = measure(path, BODIES[name], True)
+            print(f"{name:<12}{sqlite_s:>10.2f}{sqlite_rss:>9.0f}{snap_s:>12.2f}{snap_rss:>9.0f}"
+                  f"{sqlite_s / snap_s:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="incidents (tickets: rows/10)")
+    parser.add_argument("--scenarios", nargs="+", choices=list(BODIES), default=list(BODIES))
+    args = parser.parse_args()
+    run(args.rows, args.scenarios)
+
+
+if __name__ == "__main__":
+    main()
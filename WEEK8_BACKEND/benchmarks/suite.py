@@ -0,0 +1,200 @@
+# benchmarks/suite.py
+"""Time the platform's hot paths on synthetic data and compare with a baseline.
+
+Run from WEEK8_BACKEND:
+    python -m benchmarks.suite --rows 100000 --save-baseline benchmarks/results/baseline.json
+    python -m benchmarks.suite --rows 100000 --baseline benchmarks/results/baseline.json
+
+Every run writes a JSON report (benchmarks/results/latest.json by default).
+With --baseline, each case is compared with the saved numbers and the exit
+status is 1 if any case got slower than --tolerance allows, so the suite
+can gate a CI job. Everything runs against a scratch database.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import main as backend
+from app.data import db
+from app.data.incidents import insert_incident
+from app.data.migrations import apply_migrations
+from app.data.schema import create_all_tables
+from app.services.user_service import login_user, register_user
+from benchmarks.bench_mappers import raw_datasets, raw_incidents, raw_tickets
+from benchmarks.synthetic import populate
+
+STREAMLIT_DIR = Path(__file__).resolve().parents[2] / "WEEK9_STREAMLIT"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+NOISE_FLOOR_S = 0.005  # differences below this are never reported as regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(fn, repeat, setup=None):
+    """Best and all wall times (seconds) of ``fn()`` over ``repeat`` runs."""
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return min(runs), runs
+
+
+def build_database(path, rows):
+    with contextlib.redirect_stdout(io.StringIO()):
+        conn = db.connect_database(path)
+        create_all_tables(conn)
+        populate(conn, incidents=rows, tickets=rows, datasets=max(rows // 10, 1))
+        apply_migrations(conn)
+        conn.close()
+    db.DB_PATH = path  # every connection()/writer() now uses the scratch DB
+
+
+def write_csvs(data_dir, rows):
+    data_dir.mkdir()
+    raw_incidents(rows).to_csv(data_dir / "cyber_incidents.csv", index=False)
+    raw_datasets(rows).to_csv(data_dir / "datasets_metadata.csv", index=False)
+    raw_tickets(rows).to_csv(data_dir / "it_tickets.csv", index=False)
+
+
+def cases(tmp, rows, csv_rows, saves):
+    """(name, rows processed or None, fn, setup) for every benchmark case."""
+    sys.path.insert(0, str(STREAMLIT_DIR))
+    from app_backend.aggregates import count_by, kpi_summary
+    from app_backend.cache import query_cache
+    from app_backend.datasets import load_datasets
+    from app_backend.incidents import load_incidents
+    from app_backend.tickets import load_tickets
+
+    data_dir = Path(tmp) / "csv"
+    write_csvs(data_dir, csv_rows)
+    load_db = Path(tmp) / "load.db"
+
+    def load_csvs():
+        backend.DATA_DIR = data_dir
+        with contextlib.redirect_stdout(io.StringIO()):
+            conn = db.connect_database(load_db)
+            create_all_tables(conn)
+            backend.load_all_csv_data(conn, mode="stream")
+            conn.close()
+
+    raws = {"cyber_incidents": raw_incidents(csv_rows), "datasets_metadata": raw_datasets(csv_rows),
+            "it_tickets": raw_tickets(csv_rows)}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        register_user("bench_user", "bench-password")
+
+    yield "load_all_csv_data", 3 * csv_rows, load_csvs, None
+    for table, mapper in backend.MAPPERS.items():
+        yield f"mapper.{table}", csv_rows, lambda m=mapper, t=table: m(raws[t]), None
+    for name, loader, n in (("load_incidents", load_incidents, rows), ("load_tickets", load_tickets, rows),
+                            ("load_datasets", load_datasets, max(rows // 10, 1))):
+        yield f"{name}.cold", n, loader, query_cache.clear
+        yield f"{name}.warm", n, loader, None
+    yield "kpi_summary", None, kpi_summary, None
+    yield "count_by.severity", None, lambda: count_by("cyber_incidents", "severity"), None
+    yield "count_by.incident_type", rows, lambda: count_by("cyber_incidents", "incident_type"), None
+    yield ("insert_incident", saves,
+           lambda: [insert_incident("2024-01-01", "Phishing", "High", "Open", "bench", "bench")
+                    for _ in range(saves)], None)
+    yield "login_user", None, lambda: login_user("bench_user", "bench-password"), None
+
+
+def run(rows, csv_rows, saves, repeat):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        build_database(Path(tmp) / "bench.db", rows)
+        for name, n, fn, setup in cases(tmp, rows, csv_rows, saves):
+            best, runs = measure(fn, repeat, setup)
+            rate = n / best if n and best else None
+            results[name] = {"seconds": best, "runs": runs, "rows": n, "rows_per_sec": rate}
+            print(f"  {name:<28}{best * 1000:>12.2f} ms" + (f"{rate:>16,.0f} rows/s" if rate else ""))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print current vs baseline; return the names of regressed cases."""
+    regressions = []
+    print(f"\n{'case':<30}{'baseline ms':>13}{'current ms':>13}{'change':>9}")
+    for name, current in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<30}{'-':>13}{current['seconds'] * 1000:>13.2f}{'new':>9}")
+            continue
+        ratio = current["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+        slower = current["seconds"] - before["seconds"] > NOISE_FLOOR_S and ratio > 1 + tolerance
+        mark = "  ❌" if slower else ""
+        print(f"{name:<30}{before['seconds'] * 1000:>13.2f}{current['seconds'] * 1000:>13.2f}"
+              f"{(ratio - 1) * 100:>+8.0f}%{mark}")
+        if slower:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000, help="rows per table (10k-10M)")
+    parser.add_argument("--csv-rows", type=int, help="rows per CSV for load/mapper cases (default: --rows)")
+    parser.add_argument("--saves", type=int, default=200, help="insert_incident calls per run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--baseline", type=Path, help="compare with this report")
+    parser.add_argument("--save-baseline", type=Path, help="also write this run's report here")
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="allowed slowdown vs baseline before failing (0.20 = 20%%)")
+    args = parser.parse_args()
+
+    csv_rows = args.csv_rows or args.rows
+    print(f"📊 Benchmark suite: {args.rows:,} rows/table, {csv_rows:,} rows/CSV, best of {args.repeat}")
+    results = run(args.rows, csv_rows, args.saves, args.repeat)
+    report = {
+        "meta": {
+            "rows": args.rows,
+            "csv_rows": csv_rows,
+            "saves": args.saves,
+            "repeat": args.repeat,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.platform(),
+        },
+        "results": results,
+    }
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+        print(f"💾 Report written to {path}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if (baseline["meta"]["rows"], baseline["meta"].get("csv_rows")) != (args.rows, csv_rows):
+            print(f"⚠️ Baseline was recorded at {baseline['meta']['rows']:,} rows; numbers are not comparable")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+        print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# benchmarks/synthetic.py
+"""Deterministic synthetic rows for the schema.py tables."""
+import random
+
+# Same vocabularies as the simulated threat feed on the dashboard.
+THREAT_TYPES = ["Phishing", "Ransomware", "DDoS", "Bruteforce", "Data Exfiltration"]
+REGIONS = ["EMEA", "APAC", "NA", "LATAM"]
+ASSETS = ["Email Gateway", "Web Server", "Database Cluster", "VPN Gateway", "User Endpoint"]
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+INCIDENT_STATUSES = ["Open", "Investigating", "Closed"]
+TICKET_STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+TICKET_CATEGORIES = ["Network Issue", "OS Issue", "Hardware", "Access Request", "Software"]
+SOURCES = ["CERT", "NIST", "MISP", "Internal", "Vendor Feed", "OSINT"]
+DATASET_CATEGORIES = ["Threat Intel", "Vulnerabilities", "Netflow", "Logs"]
+ANALYSTS = ["alice", "bob", "carol", "dave", "System"]
+
+BATCH_SIZE = 50_000
+
+
+def _date(rng, year_from=2020, year_to=2025):
+    return f"{rng.randint(year_from, year_to)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def incident_rows(n, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        threat = rng.choice(THREAT_TYPES)
+        asset = rng.choice(ASSETS)
+        region = rng.choice(REGIONS)
+        yield (
+            _date(rng),
+            threat,
+            rng.choice(SEVERITIES),
+            rng.choice(INCIDENT_STATUSES),
+            f"{threat} targeting {asset} in {region}",
+            rng.choice(ANALYSTS),
+        )
+
+
+def ticket_rows(n, seed=0):
+    rng = random.Random(seed + 1)
+    for i in range(n):
+        category = rng.choice(TICKET_CATEGORIES)
+        yield (
+            f"TICKET_{i + 1000}",
+            rng.choice(PRIORITIES),
+            rng.choice(TICKET_STATUSES),
+            category,
+            f"{category}: {rng.choice(ASSETS)} not responding",
+            f"User reports a problem with the {rng.choice(ASSETS).lower()}",
+            _date(rng),
+            rng.choice(ANALYSTS),
+        )
+
+
+def dataset_rows(n, seed=0):
+    rng = random.Random(seed + 2)
+    for i in range(n):
+        yield (
+            f"dataset_{i:06d}",
+            rng.choice(DATASET_CATEGORIES),
+            rng.choice(SOURCES),
+            _date(rng),
+            rng.randint(100, 5_000_000),
+            round(rng.uniform(0.1, 2048.0), 2),
+        )
+
+
+INSERTS = {
+    "cyber_incidents": (
+        "INSERT INTO cyber_incidents (date_reported, incident_type, severity, status, "
+        "description, reported_by) VALUES (?, ?, ?, ?, ?, ?)",
+        incident_rows,
+    ),
+    "it_tickets": (
+        "INSERT INTO it_tickets (ticket_id, priority, status, category, subject, "
+        "description, created_date, assigned_to) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        ticket_rows,
+    ),
+    "datasets_metadata": (
+        "INSERT INTO datasets_metadata (dataset_name, category, source, last_updated, "
+        "record_count, file_size_mb) VALUES (?, ?, ?, ?, ?, ?)",
+        dataset_rows,
+    ),
+}
+
+
+def populate(conn, incidents=0, tickets=0, datasets=0, seed=0):
+    """Fill the tables with ``n`` deterministic rows each (same seed, same data)."""
+    for table, n in (("cyber_incidents", incidents), ("it_tickets", tickets),
+                     ("datasets_metadata", datasets)):
+        sql, make_rows = INSERTS[table]
+        batch = []
+        for row in make_rows(n, seed):
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                conn.executemany(sql, batch)
+                conn.commit()
+                batch = []
+        if batch:
+            conn.executemany(sql, batch)
+            conn.commit()
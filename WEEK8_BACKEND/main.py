@@ -2,8 +2,16 @@
 from pathlib import Path
 from app.data.db import connect_database
 from app.data.schema import create_all_tables
+from app.data.migrations import apply_migrations
 from app.services.user_service import register_user, login_user
-from app.data.incidents import insert_incident, get_all_incidents
+from app.data.incidents import insert_incident, iter_incidents
+from app.data.ingest import (DEFAULT_CHUNK_SIZE, RowKeys, bulk_tables, ingest_incremental,
+                             map_chunk, plan_files, prepare_chunk, reset_tables, table_columns)
+from app.data.manifest import forget_file
+from app.data.pipeline import DEFAULT_QUEUE_DEPTH, run_pipeline
+from app.data.maintenance import maintenance_paused
+from app.data.changes import compact_changes
+from app.data.snapshots import export_snapshots
 import pandas as pd
 import traceback
 
@@ -15,56 +23,69 @@ DATA_DIR.mkdir(exist_ok=True)
 
 
 # 2. CSV - DATAFRAME MAPPERS 
+# Whole-column transforms: a missing CSV column falls back to a constant,
+# present columns are copied through as-is (NaN included).
+
+
+def _column(df, name, default):
+    """Return df[name] if the CSV has that column, else the default value."""
+    return df[name] if name in df.columns else default
+
+
+def _as_text(value):
+    """Vectorized equivalent of f"{value}" for a column or a scalar."""
+    if isinstance(value, pd.Series):
+        # numpy keeps f-string formatting for missing values ("nan", "None")
+        text = value.to_numpy(dtype=object).astype(str)
+        return pd.Series(text, index=value.index)
+    return str(value)
+
+
+def _mapped_frame(columns, index):
+    """Build the mapped DataFrame with a fresh 0..n-1 index."""
+    return pd.DataFrame(columns, index=index).reset_index(drop=True)
 
 
 def map_cyber_incidents(df):
     """Convert messy CSV into cyber_incidents-compatible DataFrame."""
-    mapped_rows = []
-    
-    for _, row in df.iterrows():
-        mapped_rows.append({
-            "date_reported": row.get("Date", "2024-01-01"),
-            "incident_type": row.get("Type", "Unknown"),
-            "severity": "Medium",       # default value
-            "status": "Open",           # default value
-            "description": f"{row.get('Title', '')} - {row.get('Description', '')}",
-            "reported_by": "System"
-        })
-    
-    return pd.DataFrame(mapped_rows)
+    title = _as_text(_column(df, "Title", ""))
+    details = _as_text(_column(df, "Description", ""))
+
+    return _mapped_frame({
+        "date_reported": _column(df, "Date", "2024-01-01"),
+        "incident_type": _column(df, "Type", "Unknown"),
+        "severity": "Medium",       # default value
+        "status": "Open",           # default value
+        "description": title + " - " + details,
+        "reported_by": "System"
+    }, df.index)
 
 
 def map_datasets_metadata(df):
     """Map dataset metadata CSV → table format."""
-    mapped_rows = []
-    
-    for _, row in df.iterrows():
-        mapped_rows.append({
-            "dataset_name": row.get("dataset_name", "Unknown Dataset"),
-            "source": row.get("source_organization", "Unknown"),
-            "record_count": 0,
-            "last_updated": row.get("last_updated", "2024-01-01"),
-            "description": row.get("description", "No description")
-        })
-    
-    return pd.DataFrame(mapped_rows)
+    return _mapped_frame({
+        "dataset_name": _column(df, "dataset_name", "Unknown Dataset"),
+        "source": _column(df, "source_organization", "Unknown"),
+        "record_count": 0,
+        "last_updated": _column(df, "last_updated", "2024-01-01"),
+        "description": _column(df, "description", "No description")
+    }, df.index)
 
 
 def map_it_tickets(df):
     """Map IT tickets into consistent table format."""
-    mapped_rows = []
-    
-    for i, row in df.iterrows():
-        mapped_rows.append({
-            "ticket_id": f"TICKET_{i + 1000}",
-            "date_created": "2024-01-01",
-            "priority": row.get("Category", "Medium"),
-            "status": "Open",
-            "description": row.get("Customer Input", "No description"),
-            "assigned_to": "Unassigned"
-        })
-    
-    return pd.DataFrame(mapped_rows)
+    # Numbered from the frame's index; the ingest replaces these with ids
+    # derived from each row's source_key (unique across every tickets file).
+    ticket_numbers = pd.Series(df.index, index=df.index) + 1000
+
+    return _mapped_frame({
+        "ticket_id": "TICKET_" + ticket_numbers.astype(str),
+        "date_created": "2024-01-01",
+        "priority": _column(df, "Category", "Medium"),
+        "status": "Open",
+        "description": _column(df, "Customer Input", "No description"),
+        "assigned_to": "Unassigned"
+    }, df.index)
 
 
 # Mapper dictionary for easier extension
@@ -76,35 +97,136 @@ MAPPERS = {
 
 # 3. LOAD ALL CSV FILES
 
-def load_all_csv_data(conn):
-    """Loads all CSVs into the database with flexible mapping functions."""
-    
-    csv_files = {
-        "cyber_incidents.csv": "cyber_incidents",
-        "datasets_metadata.csv": "datasets_metadata",
-        "it_tickets.csv": "it_tickets",
-    }
-
+def discover_csv_files(data_dir=None):
+    """Map every feed CSV in DATA/ to its table.
+
+    ``<table>.csv`` plus any extra ``<table>_*.csv`` feed files, e.g.
+    ``cyber_incidents_2024_q1.csv``.
+    """
+    data_dir = data_dir or DATA_DIR
+    csv_files = {}
+    for table_name in MAPPERS:
+        main_file = data_dir / f"{table_name}.csv"
+        if main_file.exists():
+            csv_files[main_file] = table_name
+        else:
+            print(f"⚠️ CSV missing: {main_file.name}")
+        for extra in sorted(data_dir.glob(f"{table_name}_*.csv")):
+            csv_files[extra] = table_name
+    return csv_files
+
+
+def _print_file_stats(stats):
+    if stats["action"] == "skip":
+        print(f" Unchanged since last load - skipped {Path(stats['file']).name}")
+        return
+    print(
+        f" [{stats['action']}] Read {stats['rows_read']} rows "
+        f"from {Path(stats['file']).name} into {stats['table']} in {stats['chunks']} chunk(s), "
+        f"{stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec): "
+        f"{stats['rows_inserted']} inserted, {stats['rows_updated']} updated, "
+        f"{stats['rows_unchanged']} unchanged, {stats['rows_ignored']} ignored, "
+        f"{stats['rows_deleted']} deleted"
+    )
+    if stats["rows_ignored"]:
+        print(f" ⚠️ {stats['rows_ignored']} row(s) of {Path(stats['file']).name} "
+              f"ignored: their unique key already exists in {stats['table']}")
+    if stats.get("error"):
+        print(f" Error loading {Path(stats['file']).name}: {stats['error']}")
+
+
+def _print_stage_stats(stages):
+    parse, write, total = stages["parse"], stages["write"], stages["total"]
+    print("\n PIPELINE STAGES:")
+    print(f"  • parse+map: {parse['rows']} rows on {parse['workers']} worker(s), "
+          f"{parse['busy_s']:.2f} worker-s ({parse['rows_per_sec']:,.0f} rows/sec per worker)")
+    print(f"  • write:     {write['rows']} rows, {write['busy_s']:.2f}s busy, "
+          f"{write['idle_s']:.2f}s waiting ({write['rows_per_sec']:,.0f} rows/sec)")
+    print(f"  • total:     {total['wall_s']:.2f}s wall ({total['rows_per_sec']:,.0f} rows/sec)")
+
+
+def load_all_csv_data(conn, mode="incremental", chunk_size=DEFAULT_CHUNK_SIZE,
+                      workers=None, queue_depth=DEFAULT_QUEUE_DEPTH):
+    """Loads all CSVs into the database with flexible mapping functions.
+
+    mode="incremental" (default) checks the ingest manifest and only loads
+    what changed: untouched files are skipped, appended rows are added and
+    edited rows are upserted. Files are streamed in chunks of ``chunk_size``
+    rows into the schema.py tables with executemany.
+    mode="pipeline" does the same, but parses/maps files in ``workers``
+    processes feeding one writer thread through a ``queue_depth`` queue.
+    mode="stream" always reloads every file in full.
+    mode="pandas" is the old path: whole file in memory, table emptied and
+    refilled with to_sql (schema and indexes kept).
+    """
+    csv_files = discover_csv_files()
+
+    # Plan first, so only tables getting a big load pause their triggers:
+    # KPI counters / versions / FTS / rollups are then refreshed once
+    # afterwards instead of per row. Small deltas keep the triggers, and
+    # tables whose files are all unchanged aren't touched at all.
+    plans = None
+    if mode in ("incremental", "pipeline"):
+        plans = plan_files(conn, csv_files)
+        bulk = bulk_tables(csv_files, plans)
+    else:
+        bulk = set(csv_files.values())  # stream / pandas reload everything
+
+    with maintenance_paused(conn, bulk):
+        return _load_csv_files(conn, csv_files, mode, chunk_size, workers, queue_depth, plans)
+
+
+def _load_csv_files(conn, csv_files, mode, chunk_size, workers, queue_depth, plans):
     total_rows = 0
-    
-    for file_name, table_name in csv_files.items():
-        csv_path = DATA_DIR / file_name
-        
-        if not csv_path.exists():
-            print(f"⚠️ CSV missing: {file_name}")
-            continue
-        
+
+    if mode == "stream":
+        reset_tables(conn, set(csv_files.values()))
+        plans = plan_files(conn, csv_files)
+        mode = "incremental"
+
+    if mode == "pipeline":
+        print(f"\n📥 Loading {len(csv_files)} file(s) through the ingest pipeline ...")
+        report = run_pipeline(conn, csv_files, MAPPERS, workers, queue_depth, chunk_size, plans)
+        for stats in report["files"]:
+            _print_file_stats(stats)
+            total_rows += stats["rows_inserted"]
+        _print_stage_stats(report["stages"])
+        return total_rows
+
+    replaced = set()
+    for csv_path, table_name in csv_files.items():
+        file_name = csv_path.name
         try:
             print(f"\n📥 Loading {file_name} ...")
+
+            if mode == "incremental":
+                stats = ingest_incremental(conn, csv_path, table_name, MAPPERS[table_name], chunk_size,
+                                           plans[csv_path])
+                total_rows += stats["rows_inserted"]
+                _print_file_stats(stats)
+                continue
+
             df_raw = pd.read_csv(csv_path)
 
             print(f"🔎 Raw columns: {list(df_raw.columns)}")
 
-            # Use the mapper to convert CSV → database-ready DF
-            df_mapped = MAPPERS[table_name](df_raw)
+            # Use the mapper to convert CSV → database-ready DF (with the same
+            # source keys / ticket ids as the other modes), aligned with the
+            # schema.py columns (renames, NOT NULL defaults, ISO dates)
+            mapped = map_chunk(df_raw, MAPPERS[table_name], RowKeys(csv_path, table_name))
+            used, rows = prepare_chunk(table_name, mapped, table_columns(conn, table_name))
+            df_mapped = pd.DataFrame(rows, columns=used)
 
-            # Save to SQL
-            df_mapped.to_sql(table_name, conn, if_exists="replace", index=False)
+            # Legacy path empties the table, so the manifest no longer applies
+            forget_file(conn, csv_path)
+
+            # Save to SQL: DELETE + append keeps the typed table with its
+            # migration-created indexes (to_sql "replace" would drop them)
+            if table_name not in replaced:
+                conn.execute(f"DELETE FROM {table_name}")
+                replaced.add(table_name)
+            df_mapped.to_sql(table_name, conn, if_exists="append", index=False)
+            conn.commit()
 
             total_rows += len(df_mapped)
             print(f" Loaded {len(df_mapped)} rows into {table_name}")
@@ -118,20 +240,34 @@ def load_all_csv_data(conn):
 # 4. FULL DATABASE SETUP
 
 
-def setup_database_complete():
+def setup_database_complete(mode="incremental", **load_options):
     print("\n" + "="*70)
     print(" STARTING COMPLETE DATABASE SETUP")
     print("="*70)
 
     conn = connect_database()
 
-    # Create all tables
+    # Create all tables, then bring indexes etc. up to the latest version
     create_all_tables(conn)
+    apply_migrations(conn)
 
     # Load CSV data
-    total = load_all_csv_data(conn)
+    total = load_all_csv_data(conn, mode=mode, **load_options)
     print(f"\n TOTAL ROWS IMPORTED FROM CSV: {total}")
 
+    # Change log retention (a trigger also caps it by size)
+    removed = compact_changes(conn)
+    conn.commit()
+    if removed:
+        print(f"🧹 change_log: {removed} old entries compacted")
+
+    # Columnar snapshots: the next process loads frames from these instead of SQLite
+    written = {t: n for t, n in export_snapshots(conn).items() if n is not None}
+    if written:
+        print("🗂  Snapshots written: " + ", ".join(f"{t} ({n} rows)" for t, n in written.items()))
+    else:
+        print("🗂  Snapshots already up to date")
+
     # Summary
     cursor = conn.cursor()
     tables = ["users", "cyber_incidents", "datasets_metadata", "it_tickets"]
@@ -162,8 +298,14 @@ def demo_operations():
     
     print(f"✔ Created Incident #{incident_id}")
 
-    df = get_all_incidents()
-    print(f"Total incidents in DB: {len(df)}")
+    # Streamed in chunks: only one batch of rows is in memory at a time
+    total, by_severity = 0, {}
+    for chunk in iter_incidents(columns=["severity"]):
+        total += len(chunk)
+        for severity, count in chunk["severity"].value_counts().items():
+            by_severity[severity] = by_severity.get(severity, 0) + count
+    print(f"Total incidents in DB: {total}")
+    print("By severity: " + ", ".join(f"{s} {n}" for s, n in sorted(by_severity.items()) if n))
 
 # 6. MAIN ENTRY
 
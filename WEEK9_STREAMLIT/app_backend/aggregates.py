@@ -0,0 +1,135 @@
+# app_backend/aggregates.py
+import pandas as pd
+from app_backend.db import connection
+from app_backend.sqlsafe import check_columns, table_columns, where_clause
+from app.data.counters import COUNTER_DIMENSIONS, counters_installed, read_counters
+from app.data.metrics import instrumented
+from app.data import rollups
+
+
+def _where(conn, table, where):
+    clause, params = where_clause(conn, table, where)
+    return (f" WHERE {clause}" if clause else ""), params
+
+
+@instrumented
+def count_by(table, column, where=None):
+    """Row counts per value of ``column``, largest first.
+
+    Returns a DataFrame with columns [column, "count"], e.g.
+    count_by("cyber_incidents", "severity", where={"status": "Open"}).
+    """
+    with connection() as conn:
+        check_columns(conn, table, column)
+        if not where and column in COUNTER_DIMENSIONS.get(table, []) and counters_installed(conn):
+            counts = read_counters(conn, table, column)
+            df = pd.DataFrame({column: list(counts), "count": list(counts.values())})
+            return df.sort_values("count", ascending=False, ignore_index=True)
+        where_sql, params = _where(conn, table, where)
+        sql = (f"SELECT {column}, COUNT(*) AS count FROM {table}{where_sql} "
+               f"GROUP BY {column} ORDER BY count DESC")
+        return pd.read_sql(sql, conn, params=params)
+
+
+@instrumented
+def sum_by(table, value_column, by=None, where=None):
+    """SUM(value_column), optionally grouped by ``by``.
+
+    With ``by`` returns a DataFrame [by, value_column]; without it returns
+    the single total as a number (0 for an empty table).
+    """
+    with connection() as conn:
+        check_columns(conn, table, value_column, *([by] if by else []))
+        where_sql, params = _where(conn, table, where)
+        if by is None:
+            row = conn.execute(
+                f"SELECT COALESCE(SUM({value_column}), 0) FROM {table}{where_sql}", params
+            ).fetchone()
+            return row[0]
+        sql = (f"SELECT {by}, SUM({value_column}) AS {value_column} FROM {table}{where_sql} "
+               f"GROUP BY {by} ORDER BY {value_column} DESC")
+        return pd.read_sql(sql, conn, params=params)
+
+
+@instrumented
+def count_rows(table, where=None):
+    """COUNT(*) with an optional filter."""
+    with connection() as conn:
+        table_columns(conn, table)
+        where_sql, params = _where(conn, table, where)
+        return conn.execute(f"SELECT COUNT(*) FROM {table}{where_sql}", params).fetchone()[0]
+
+
+# Headline numbers read from kpi_counters: (key, table, dimension, values)
+COUNTER_KPIS = [
+    ("total_incidents", "cyber_incidents", "total", [""]),
+    ("high_critical_incidents", "cyber_incidents", "severity", ["High", "Critical"]),
+    ("open_incidents", "cyber_incidents", "status", ["Open"]),
+    ("total_tickets", "it_tickets", "total", [""]),
+    ("open_tickets", "it_tickets", "status", ["Open"]),
+    ("high_priority_tickets", "it_tickets", "priority", ["High"]),
+]
+
+
+def _counter_kpis(conn):
+    """Incident/ticket KPIs as primary-key lookups on kpi_counters."""
+    kpis = {}
+    for key, table, dimension, values in COUNTER_KPIS:
+        row = conn.execute(
+            f"SELECT COALESCE(SUM(count), 0) FROM kpi_counters "
+            f"WHERE table_name = ? AND dimension = ? AND value IN ({', '.join('?' for _ in values)})",
+            (table, dimension, *values),
+        ).fetchone()
+        kpis[key] = row[0]
+    row = conn.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM datasets_metadata),
+            (SELECT COUNT(DISTINCT source) FROM datasets_metadata),
+            (SELECT COALESCE(SUM(record_count), 0) FROM datasets_metadata)
+    """).fetchone()
+    kpis.update(zip(["total_datasets", "unique_sources", "total_records"], row))
+    return kpis
+
+
+@instrumented
+def kpi_summary():
+    """Every headline number the pages show, in one round trip.
+
+    Served from the trigger-maintained kpi_counters table when it exists,
+    otherwise counted directly.
+    """
+    with connection() as conn:
+        if counters_installed(conn):
+            return _counter_kpis(conn)
+        row = conn.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM cyber_incidents),
+                (SELECT COUNT(*) FROM cyber_incidents WHERE severity IN ('High', 'Critical')),
+                (SELECT COUNT(*) FROM cyber_incidents WHERE status = 'Open'),
+                (SELECT COUNT(*) FROM it_tickets),
+                (SELECT COUNT(*) FROM it_tickets WHERE status = 'Open'),
+                (SELECT COUNT(*) FROM it_tickets WHERE priority = 'High'),
+                (SELECT COUNT(*) FROM datasets_metadata),
+                (SELECT COUNT(DISTINCT source) FROM datasets_metadata),
+                (SELECT COALESCE(SUM(record_count), 0) FROM datasets_metadata)
+        """).fetchone()
+    keys = [
+        "total_incidents", "high_critical_incidents", "open_incidents",
+        "total_tickets", "open_tickets", "high_priority_tickets",
+        "total_datasets", "unique_sources", "total_records",
+    ]
+    return dict(zip(keys, row))
+
+
+@instrumented
+def trend(series, granularity="day", start=None, end=None, by=None):
+    """Time series from the pre-aggregated rollups table.
+
+    series is "incidents" (day/week/month, by incident_type or severity)
+    or "tickets" (day, by status or priority). Returns [bucket, count] or,
+    with ``by``, [bucket, <by>, count]. Empty if the rollups aren't built.
+    """
+    with connection() as conn:
+        if not rollups.rollups_installed(conn):
+            return pd.DataFrame(columns=["bucket"] + ([by] if by else []) + ["count"])
+        return rollups.trend(conn, series, granularity, start, end, by)
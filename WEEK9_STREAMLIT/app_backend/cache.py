@@ -0,0 +1,101 @@
+# app_backend/cache.py
+import threading
+from collections import OrderedDict
+
+from app_backend.db import connection
+from app.data.versions import get_versions
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def frame_bytes(df):
+    """Approximate in-memory size of a DataFrame (object strings included)."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class QueryCache:
+    """Process-wide LRU cache of loader results, bounded by bytes.
+
+    Each entry remembers the table_versions it was loaded at; it is only
+    served while those versions are unchanged, so a write from any session
+    (or from the ingest script) is visible on the very next load.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (versions, df, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0,
+                       "uncacheable": 0}
+
+    def get_or_load(self, key, tables, loader):
+        """Return a cached frame for ``key`` or call ``loader()`` and cache it."""
+        with connection() as conn:
+            versions = get_versions(conn, tables)
+        if versions is None:  # database not migrated: no way to validate
+            self._count("uncacheable")
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == versions:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[1].copy(deep=False)
+                self._drop(key)
+                self._stats["invalidations"] += 1
+            self._stats["misses"] += 1
+
+        df = loader()
+        size = frame_bytes(df)
+        if size > self.max_bytes:
+            self._count("uncacheable")
+            return df
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (versions, df, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats["evictions"] += 1
+        return df.copy(deep=False)
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["entries"] = len(self._entries)
+            snapshot["bytes"] = self._bytes
+            snapshot["max_bytes"] = self.max_bytes
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = snapshot["hits"] / lookups if lookups else 0.0
+        return snapshot
+
+
+query_cache = QueryCache()
+
+
+def cached(key, tables, loader):
+    """Shortcut for the shared cache: cached(key, ["cyber_incidents"], fn)."""
+    return query_cache.get_or_load(key, tables, loader)
+
+
+def cache_stats():
+    return query_cache.stats()
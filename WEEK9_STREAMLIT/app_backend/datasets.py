@@ -1,10 +1,15 @@
 # app_backend/datasets.py
-import pandas as pd
-from app_backend.db import connect_database
+from app_backend.db import connection
+from app_backend.cache import cached
+from app.data.snapshots import load_table
+from app.data.metrics import instrumented
 
-def load_datasets():
-    """Return dataset metadata table as a DataFrame."""
-    conn = connect_database()
-    df = pd.read_sql("SELECT * FROM datasets_metadata", conn)
-    conn.close()
-    return df
+def _read_datasets(columns, compact):
+    with connection() as conn:
+        return load_table(conn, "datasets_metadata", columns, compact)
+
+@instrumented
+def load_datasets(columns=None, compact=True):
+    """Return dataset metadata table as a DataFrame (``columns``/``compact`` as in load_incidents)."""
+    key = ("load_datasets", tuple(columns or ()), compact)
+    return cached(key, ["datasets_metadata"], lambda: _read_datasets(columns, compact))
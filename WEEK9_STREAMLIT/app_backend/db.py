@@ -1,8 +1,15 @@
 # app_backend/db.py
-import sqlite3
+import sys
 from pathlib import Path
 
-DB_PATH = Path(r"C:\Users\syeda\OneDrive - Middlesex University\Cybersecurity\CST1510\modular multi-domain intelligence Week 8-10\WEEK8_BACKEND\DATA\intelligence_platform.db")
+# The Streamlit app shares the Week 8 backend's database and connection pool.
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "WEEK8_BACKEND"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.data.db import DB_PATH, connection, pool_stats, writer  # noqa: E402
+from app.data.db import connect_database as _connect  # noqa: E402
+from app.data.aio import format_timings, load_many, run_query  # noqa: E402
 
 def connect_database():
-    return sqlite3.connect(DB_PATH)
+    return _connect(DB_PATH)
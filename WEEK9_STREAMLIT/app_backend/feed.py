@@ -0,0 +1,13 @@
+# app_backend/feed.py
+from app_backend.db import BACKEND_DIR  # noqa: F401  (puts the backend on sys.path)
+from app.services.threat_feed import get_feed
+
+
+def threat_feed():
+    """The process-wide threat feed ingestor (started by the first caller)."""
+    return get_feed()
+
+
+def recent_threats(n=10):
+    """The ``n`` newest stored feed events, newest first (from memory, no query)."""
+    return threat_feed().buffer.latest(n)
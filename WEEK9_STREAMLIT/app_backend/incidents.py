@@ -1,27 +1,45 @@
 # app_backend/incidents.py
-import pandas as pd
-from app_backend.db import connect_database
+from app_backend.db import connection, writer
+from app_backend.cache import cached
+from app.data.snapshots import load_table
+from app.data.metrics import instrumented
+from app.data.search import search
+from app.data.incidents import INSERT_INCIDENT_SQL, incidents_between  # noqa: F401
+from app.data.incidents import (  # noqa: F401  (bulk APIs shared with the backend)
+    insert_incidents_bulk,
+    update_incident_status_bulk,
+    delete_incidents_bulk,
+)
 
-def load_incidents():
-    """Return cyber_incidents table as a DataFrame."""
-    conn = connect_database()
-    df = pd.read_sql("SELECT * FROM cyber_incidents", conn)
-    conn.close()
-    return df
+def _read_incidents(columns, compact):
+    with connection() as conn:
+        return load_table(conn, "cyber_incidents", columns, compact)
 
+@instrumented
+def load_incidents(columns=None, compact=True):
+    """Return cyber_incidents table as a DataFrame.
+
+    ``columns`` limits the SELECT to what the page needs; with ``compact``
+    low-cardinality text comes back as category dtype and dates as
+    datetime64. Served from the shared query cache until the table changes.
+    """
+    key = ("load_incidents", tuple(columns or ()), compact)
+    return cached(key, ["cyber_incidents"], lambda: _read_incidents(columns, compact))
+
+@instrumented
+def search_incidents(query, limit=50):
+    """bm25-ranked incident matches with a highlighted snippet."""
+    with connection() as conn:
+        return search(conn, "cyber_incidents", query, limit)
+
+@instrumented
 def insert_incident(date_reported, incident_type, severity, status, description, reported_by):
-    """Insert a new cyber incident into the database."""
-    conn = connect_database()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO cyber_incidents
-        (date_reported, incident_type, severity, status, description, reported_by)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
+    """Insert a new cyber incident into the database.
+
+    Submitted to the shared group-commit writer; returns the new id once
+    the batch it landed in has committed.
+    """
+    return writer().execute(
+        INSERT_INCIDENT_SQL,
         (date_reported, incident_type, severity, status, description, reported_by),
     )
-    conn.commit()
-    incident_id = cur.lastrowid
-    conn.close()
-    return incident_id
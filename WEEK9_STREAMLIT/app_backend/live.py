@@ -0,0 +1,124 @@
+# app_backend/live.py
+import threading
+from collections import deque
+
+import pandas as pd
+from app_backend.db import connection
+from app.data.changes import change_log_installed, changes_since, latest_seq, read_rows
+from app.data.frames import compact_frame
+
+
+WINDOW = 500  # newest rows a DeltaFrame keeps
+
+
+class DeltaFrame:
+    """The newest ``window`` rows of one table, kept current from the change_log.
+
+    refresh() asks for the changes since its cursor and applies only those:
+    deleted ids leave the window, inserted/updated ids inside it (or newer
+    than it) are re-read by id, and the window is trimmed back to size. The
+    work per refresh is proportional to the rows that changed plus the
+    window, never to the table; a reset (bulk load, or a cursor older than
+    the retained log) re-reads just the window. Each change publishes a new
+    frame, so a frame handed out by frame() never changes under its reader.
+    """
+
+    def __init__(self, table, columns=None, compact=True, window=WINDOW):
+        self.table = table
+        self.columns = list(dict.fromkeys(["id", *columns])) if columns else None
+        self.compact = compact
+        self.window = window
+        self.seq = 0
+        self._df = None
+        self._recent = deque(maxlen=50)  # (op, id), newest at the right
+        self._lock = threading.Lock()
+        self._stats = {"reloads": 0, "refreshes": 0, "rows_applied": 0}
+
+    def _select(self):
+        return ", ".join(self.columns) if self.columns else "*"
+
+    def _finish(self, df):
+        if self.compact:
+            df = compact_frame(df)  # also re-unifies categories after a concat
+        return df.set_index("id", drop=False)
+
+    def _reload(self, conn):
+        self.seq = latest_seq(conn)  # before reading: later changes get re-applied, never lost
+        df = pd.read_sql(
+            f"SELECT * FROM (SELECT {self._select()} FROM {self.table} ORDER BY id DESC LIMIT ?) ORDER BY id",
+            conn, params=(self.window,),
+        )
+        self._df = self._finish(df)
+        self._stats["reloads"] += 1
+
+    def _apply(self, conn, change):
+        deleted = change["deleted"].get(self.table, [])
+        upserted = change["upserted"].get(self.table, [])
+        df = self._df
+        oldest = df.index.min() if len(df) else 0
+        # rows older than the window don't show here; their change is still listed in recent
+        wanted = [i for i in upserted if i in df.index or i > oldest]
+        if deleted or wanted:
+            kept = df.drop(index=[i for i in deleted + wanted if i in df.index])
+            parts = [kept.reset_index(drop=True)]
+            if wanted:
+                # an id missing from rows was deleted after the cursor; its 'D' comes next time
+                parts.append(read_rows(conn, self.table, wanted, list(df.columns)))
+            merged = pd.concat(parts, ignore_index=True).sort_values("id").tail(self.window)
+            self._df = self._finish(merged.reset_index(drop=True))
+        self._recent.extend([("D", i) for i in deleted] + [("U", i) for i in upserted])
+        self._stats["rows_applied"] += len(deleted) + len(upserted)
+
+    def refresh(self):
+        """Bring the window up to date; returns the number of changes applied (-1 for a reload)."""
+        with self._lock, connection() as conn:
+            if self._df is None or not change_log_installed(conn):
+                self._reload(conn)
+                return -1
+            applied = 0
+            while True:
+                change = changes_since(conn, self.seq, [self.table])
+                if change["reset"]:
+                    self._reload(conn)
+                    return -1
+                self._apply(conn, change)
+                applied += sum(len(ids) for ids in change["upserted"].values())
+                applied += sum(len(ids) for ids in change["deleted"].values())
+                self.seq = change["seq"]
+                if not change["more"]:
+                    break
+            self._stats["refreshes"] += 1
+            return applied
+
+    def frame(self):
+        """The current window (indexed by id, oldest first); treat it as read-only."""
+        with self._lock:
+            return self._df
+
+    def recent_changes(self, n=10):
+        """The ``n`` latest applied changes as (op, id), newest first ('U' = inserted or updated)."""
+        with self._lock:
+            return list(reversed(self._recent))[:n]
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["seq"] = self.seq
+            snapshot["window_rows"] = 0 if self._df is None else len(self._df)
+        return snapshot
+
+
+_frames = {}
+_frames_lock = threading.Lock()
+
+
+def live_table(table, columns=None, compact=True, window=WINDOW):
+    """Process-wide DeltaFrame for (table, columns, compact, window), refreshed before it is returned."""
+    key = (table, tuple(columns or ()), compact, window)
+    with _frames_lock:
+        live = _frames.get(key)
+        if live is None:
+            live = DeltaFrame(table, columns, compact, window)
+            _frames[key] = live
+    live.refresh()
+    return live
@@ -0,0 +1,82 @@
+# app_backend/paging.py
+import pandas as pd
+from app_backend.db import connection
+from app_backend.sqlsafe import check_columns, table_columns, where_clause
+from app.data.metrics import instrumented
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+def _keyset(order_by, after, descending):
+    """WHERE fragment selecting rows strictly after cursor (value, id).
+
+    SQLite sorts NULLs first ascending and last descending, so a cursor
+    sitting in the NULL block and one past it need different predicates.
+    """
+    value, row_id = after
+    if order_by == "id":
+        return ("id < ?" if descending else "id > ?"), [row_id]
+    if descending:
+        if value is None:
+            return f"{order_by} IS NULL AND id < ?", [row_id]
+        return (f"({order_by} < ? OR ({order_by} = ? AND id < ?) OR {order_by} IS NULL)",
+                [value, value, row_id])
+    if value is None:
+        return f"(({order_by} IS NULL AND id > ?) OR {order_by} IS NOT NULL)", [row_id]
+    return f"({order_by} > ? OR ({order_by} = ? AND id > ?))", [value, value, row_id]
+
+
+@instrumented
+def fetch_page(table, after=None, limit=DEFAULT_PAGE_SIZE, order_by="id", descending=False,
+               filters=None, columns=None):
+    """One page of ``table`` using keyset (seek) pagination.
+
+    ``after`` is the cursor returned as ``next_cursor`` by the previous
+    page (None for the first page). Rows are ordered by ``order_by`` then
+    ``id``, so with an indexed sort column every page is an index seek and
+    costs the same however deep you go. ``filters`` uses the same
+    {column: value | [values]} form as the aggregate helpers.
+
+    Returns {"rows": DataFrame, "next_cursor": cursor | None, "has_next": bool}.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    with connection() as conn:
+        check_columns(conn, table, order_by)
+        if columns:
+            check_columns(conn, table, *columns)
+            select = list(dict.fromkeys(["id", order_by, *columns]))
+        else:
+            select = table_columns(conn, table)
+
+        clauses, params = [], []
+        where_sql, where_params = where_clause(conn, table, filters)
+        if where_sql:
+            clauses.append(where_sql)
+            params += where_params
+        if after is not None:
+            keyset_sql, keyset_params = _keyset(order_by, after, descending)
+            clauses.append(keyset_sql)
+            params += keyset_params
+
+        direction = "DESC" if descending else "ASC"
+        order = f"id {direction}" if order_by == "id" else f"{order_by} {direction}, id {direction}"
+        sql = (f"SELECT {', '.join(select)} FROM {table}"
+               f"{' WHERE ' + ' AND '.join(clauses) if clauses else ''} "
+               f"ORDER BY {order} LIMIT ?")
+        df = pd.read_sql(sql, conn, params=params + [limit + 1])
+
+    has_next = len(df) > limit
+    df = df.iloc[:limit]
+    next_cursor = None
+    if has_next:
+        last = df.iloc[-1]
+        value = last[order_by]
+        if pd.isna(value):
+            value = None
+        elif hasattr(value, "item"):  # numpy scalar -> plain Python for sqlite3
+            value = value.item()
+        next_cursor = (value, int(last["id"]))
+    if columns:
+        df = df[list(dict.fromkeys(["id", *columns]))]
+    return {"rows": df, "next_cursor": next_cursor, "has_next": has_next}
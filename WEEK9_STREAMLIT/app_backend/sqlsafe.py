@@ -0,0 +1,28 @@
+# app_backend/sqlsafe.py
+# Identifier whitelist + parameterized WHERE builder shared by the
+# aggregate and paging helpers. Both come from the backend query builder
+# (app.data.query), so filters here accept the same column__op syntax.
+from app.data.query import check_columns as _check_columns, compile_filters
+from app.data.schema import QUERYABLE_COLUMNS
+
+ALLOWED_TABLES = tuple(QUERYABLE_COLUMNS)
+
+
+def table_columns(conn, table):
+    """Column names of an allowed table (ValueError otherwise)."""
+    _check_columns(table)
+    return list(QUERYABLE_COLUMNS[table])
+
+
+def check_columns(conn, table, *columns):
+    _check_columns(table, *columns)
+
+
+def where_clause(conn, table, where):
+    """{column[__op]: value} -> ("col = ? AND ...", params).
+
+    A list means IN and None means IS NULL, as before; see
+    app.data.query.compile_condition for the operators.
+    Returns ("", []) when there is nothing to filter on.
+    """
+    return compile_filters(table, where)
@@ -1,10 +1,23 @@
 # app_backend/tickets.py
-import pandas as pd
-from app_backend.db import connect_database
+from app_backend.db import connection
+from app_backend.cache import cached
+from app.data.snapshots import load_table
+from app.data.metrics import instrumented
+from app.data.search import search
+from app.data.tickets import tickets_between  # noqa: F401  (index-served date ranges)
 
-def load_tickets():
-    """Return IT tickets table as a DataFrame."""
-    conn = connect_database()
-    df = pd.read_sql("SELECT * FROM it_tickets", conn)
-    conn.close()
-    return df
+def _read_tickets(columns, compact):
+    with connection() as conn:
+        return load_table(conn, "it_tickets", columns, compact)
+
+@instrumented
+def load_tickets(columns=None, compact=True):
+    """Return IT tickets table as a DataFrame (``columns``/``compact`` as in load_incidents)."""
+    key = ("load_tickets", tuple(columns or ()), compact)
+    return cached(key, ["it_tickets"], lambda: _read_tickets(columns, compact))
+
+@instrumented
+def search_tickets(query, limit=50):
+    """bm25-ranked ticket matches with a highlighted snippet."""
+    with connection() as conn:
+        return search(conn, "it_tickets", query, limit)
@@ -1,45 +1,28 @@
 # app_backend/users.py
-import hashlib
-from app_backend.db import connect_database
-
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+from app_backend.db import BACKEND_DIR  # noqa: F401  (puts the backend on sys.path)
+from app.data.metrics import instrumented
+from app.services.user_service import authenticate
+from app.services.user_service import register_user as _register_user
 
+@instrumented
 def register_user(username: str, password: str, role: str = "analyst"):
-    """Register a new user with role (default: analyst)."""
-    conn = connect_database()
-    cur = conn.cursor()
-    try:
-        cur.execute("SELECT username FROM users WHERE username = ?", (username,))
-        if cur.fetchone() is not None:
-            return False, "Username already exists"
+    """Register a new user with role (default: analyst).
 
-        cur.execute(
-            "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-            (username, hash_password(password), role)
-        )
-        conn.commit()
-        return True, "User registered successfully"
+    Passwords are bcrypt-hashed by the backend's auth service, off the
+    script thread.
+    """
+    try:
+        return _register_user(username, password, role)
     except Exception as e:
         return False, f"Error during registration: {e}"
-    finally:
-        conn.close()
 
+@instrumented
 def login_user(username: str, password: str):
     """
     Return (success: bool, message: str, role: str|None)
-    """
-    conn = connect_database()
-    cur = conn.cursor()
-    try:
-        cur.execute("SELECT password_hash, role FROM users WHERE username = ?", (username,))
-        row = cur.fetchone()
-        if row is None:
-            return False, "User not found", None
 
-        stored_hash, role = row
-        if stored_hash == hash_password(password):
-            return True, "Login successful", role
-        return False, "Invalid password", None
-    finally:
-        conn.close()
+    Accounts created with the old unsalted SHA-256 hashes still log in;
+    their hash is upgraded to bcrypt on the first successful login.
+    """
+    success, message, user = authenticate(username, password)
+    return success, message, (user[3] if success else None)
@@ -0,0 +1,72 @@
+# app_backend/widgets.py
+import sqlite3
+
+import pandas as pd
+import streamlit as st
+from app_backend.aggregates import count_by
+from app_backend.paging import DEFAULT_PAGE_SIZE, fetch_page
+
+
+def render_paged_table(table, key, sort_columns, filter_columns=(), columns=None):
+    """Keyset-paginated table with server-side sort/filter and Prev/Next.
+
+    Only one page of rows is ever fetched. The cursors of the pages
+    already visited are kept in session_state so "Prev" goes back
+    without an OFFSET scan.
+    """
+    c1, c2, c3 = st.columns([2, 1, 1])
+    order_by = c1.selectbox("Sort by", sort_columns, key=f"{key}_order_by")
+    descending = c2.selectbox("Order", ["Descending", "Ascending"], key=f"{key}_order") == "Descending"
+    page_size = c3.selectbox("Rows per page", [25, DEFAULT_PAGE_SIZE, 100, 250], index=1,
+                             key=f"{key}_page_size")
+
+    filters = {}
+    if filter_columns:
+        filter_cols = st.columns(len(filter_columns))
+        for col, column in zip(filter_cols, filter_columns):
+            options = [v for v in count_by(table, column)[column].tolist() if pd.notna(v)]
+            chosen = col.multiselect(column.replace("_", " ").title(), sorted(options),
+                                     key=f"{key}_filter_{column}")
+            if chosen:
+                filters[column] = chosen
+
+    # Any change of sort/filter/page size starts again from page 1
+    signature = (order_by, descending, page_size, tuple(sorted((k, tuple(v)) for k, v in filters.items())))
+    if st.session_state.get(f"{key}_signature") != signature:
+        st.session_state[f"{key}_signature"] = signature
+        st.session_state[f"{key}_cursors"] = [None]
+    cursors = st.session_state[f"{key}_cursors"]
+
+    page = fetch_page(table, after=cursors[-1], limit=page_size, order_by=order_by,
+                      descending=descending, filters=filters, columns=columns)
+    st.dataframe(page["rows"], use_container_width=True, hide_index=True)
+
+    prev_col, info_col, next_col = st.columns([1, 2, 1])
+    if prev_col.button("◀ Prev", key=f"{key}_prev", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    info_col.caption(f"Page {len(cursors)} • {len(page['rows'])} rows")
+    if next_col.button("Next ▶", key=f"{key}_next", disabled=not page["has_next"]):
+        cursors.append(page["next_cursor"])
+        st.rerun()
+
+
+def render_search(search_fn, key, placeholder="Search…", limit=50):
+    """Search box backed by an FTS index. Returns True when results were shown."""
+    query = st.text_input("🔍 Search", key=f"{key}_search", placeholder=placeholder)
+    if not query.strip():
+        return False
+    try:
+        hits = search_fn(query, limit=limit)
+    except sqlite3.OperationalError:
+        st.warning("Search index not available — run the backend setup to apply migrations.")
+        return False
+    if hits.empty:
+        st.info(f"No matches for “{query}”.")
+        return True
+    st.caption(f"Top {len(hits)} matches, best first")
+    for hit in hits.itertuples(index=False):
+        hit = hit._asdict()
+        title = " • ".join(str(hit[c]) for c in list(hit)[1:4] if hit[c] is not None)
+        st.markdown(f"**#{hit['id']}** — {title}  \n{hit['snippet']}")
+    return True
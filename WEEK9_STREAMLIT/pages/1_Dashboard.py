@@ -1,10 +1,11 @@
 import streamlit as st
 import pandas as pd
-import random
 from app_backend.theme import apply_cyber_theme, render_sidebar
-from app_backend.incidents import load_incidents
-from app_backend.tickets import load_tickets
-from app_backend.datasets import load_datasets
+from app_backend.aggregates import count_by, kpi_summary, trend
+from app_backend.feed import recent_threats, threat_feed
+from app_backend.live import live_table
+from app_backend.db import format_timings, load_many
+from app.data.query import query
 
 st.set_page_config(page_title="Dashboard", page_icon="📊", layout="wide")
 
@@ -30,18 +31,37 @@ st.markdown("""
 st.title("📊 Cyber Intelligence Dashboard")
 
 # ================== LOAD DATA ==================
-inc = load_incidents()
-tickets = load_tickets()
-datasets = load_datasets()
+# Aggregated in SQLite: only counts come back, whatever the table sizes.
+# The queries are independent, so they run concurrently on the data
+# layer's thread pool and the page waits for the slowest one only.
+latest_high_critical = (
+    query("cyber_incidents")
+    .select("id", "date_reported", "incident_type", "severity", "status")
+    .where(severity__in=["High", "Critical"])
+    .order_by("-date_reported", "-id")
+    .limit(10)
+)
+queries = {
+    "kpis": kpi_summary,
+    "severity_counts": (count_by, "cyber_incidents", "severity"),
+    "status_counts": (count_by, "it_tickets", "status"),
+    "incident_trend": (trend, "incidents", st.session_state.get("trend_granularity", "month"),
+                       None, None, "severity"),
+    "latest": latest_high_critical.to_frame,
+}
+if role == "admin":
+    queries["source_counts"] = (count_by, "datasets_metadata", "source")
+data, timings = load_many(queries)
+kpis = data["kpis"]
 
 # ================== KPI METRICS ==================
 c1, c2, c3 = st.columns(3)
-c1.metric("Total Incidents", len(inc))
-c2.metric("Total Tickets", len(tickets))
-c3.metric("Datasets", len(datasets))
+c1.metric("Total Incidents", kpis["total_incidents"])
+c2.metric("Total Tickets", kpis["total_tickets"])
+c3.metric("Datasets", kpis["total_datasets"])
 
-high_critical = inc[inc["severity"].isin(["High", "Critical"])].shape[0] if "severity" in inc.columns else 0
-open_tickets = tickets[tickets["status"] == "Open"].shape[0] if "status" in tickets.columns else 0
+high_critical = kpis["high_critical_incidents"]
+open_tickets = kpis["open_tickets"]
 
 if high_critical > 0:
     st.error(f"🚨 {high_critical} High/Critical incidents require attention.")
@@ -133,28 +153,62 @@ with col_map:
 st.divider()
 
 # ================== THREAT FEED ==================
-st.subheader("⚡ Real-Time Threat Feed (Simulated)")
-
-threat_types = ["Phishing", "Ransomware", "DDoS", "Bruteforce", "Data Exfiltration"]
-regions = ["EMEA", "APAC", "NA", "LATAM"]
-assets = ["Email Gateway", "Web Server", "Database Cluster", "VPN Gateway", "User Endpoint"]
-
-def generate_fake_threats(n=6):
-    rows = []
-    for _ in range(n):
-        t = random.choice(threat_types)
-        r = random.choice(regions)
-        a = random.choice(assets)
-        sev = random.choice(["Low", "Medium", "High", "Critical"])
-        rows.append(f"- [{sev}] {t} targeting **{a}** in **{r}**")
-    return rows
+st.subheader("⚡ Real-Time Threat Feed")
+
+FEED_REFRESH_SECONDS = 2
+
+
+@st.fragment(run_every=FEED_REFRESH_SECONDS)
+def threat_feed_panel():
+    # Reruns on its own every few seconds; only this panel is redrawn and
+    # it reads the feed's in-memory buffer, not the database.
+    feed = threat_feed()
+    if not feed.stats()["owner"]:
+        st.info(f"Another process is ingesting {feed.feed_dir}; this one takes over when it stops.")
+        return
+    events = recent_threats(8)
+    if not events:
+        st.info(f"Waiting for alerts: append NDJSON/CSV lines to {feed.feed_dir} "
+                "(or run `python -m app.services.threat_feed --simulate 20` in WEEK8_BACKEND).")
+    for event in events:
+        target = f" targeting **{event['asset']}**" if event["asset"] else ""
+        region = f" in **{event['region']}**" if event["region"] else ""
+        st.markdown(f"- [{event['severity'] or 'Unrated'}] {event['incident_type']}{target}{region}"
+                    f" · {event['received_at'][11:]}")
+    stats = feed.stats()
+    st.caption(f"{stats['written']:,} alert(s) stored · {stats['queued']:,} queued · "
+               f"{stats['sources']} source file(s)")
+
+
+threat_feed_panel()
+
+# ================== LIVE INCIDENT ACTIVITY ==================
+st.subheader("🟢 Live Incident Activity")
+
+LIVE_COLUMNS = ["date_reported", "incident_type", "severity", "status"]
+
+
+@st.fragment(run_every=FEED_REFRESH_SECONDS)
+def live_incidents_panel():
+    # The shared window of recent rows applies change_log deltas on each
+    # refresh and the totals are counter lookups, so a tick costs the same
+    # whatever the table size.
+    live = live_table("cyber_incidents", LIVE_COLUMNS)
+    df = live.frame()
+    kpis = kpi_summary()
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Tracked Incidents", kpis["total_incidents"])
+    m2.metric("Open", kpis["open_incidents"])
+    m3.metric("Change Cursor", live.seq)
+    recent = live.recent_changes(8)
+    changed = [i for op, i in recent if op != "D" and i in df.index]
+    if changed:
+        st.dataframe(df.loc[changed, ["id", *LIVE_COLUMNS]], use_container_width=True, hide_index=True)
+    else:
+        st.caption("No changes since this page was opened.")
 
-if st.button("🔄 Refresh Threat Feed"):
-    st.session_state.threat_feed = generate_fake_threats()
 
-feed = st.session_state.get("threat_feed") or generate_fake_threats()
-for line in feed:
-    st.markdown(line)
+live_incidents_panel()
 
 st.divider()
 
@@ -164,21 +218,44 @@ st.subheader("📈 Incident & Ticket Analytics")
 a1, a2 = st.columns(2)
 with a1:
     st.markdown("**Incidents by Severity**")
-    if "severity" in inc.columns and not inc.empty:
-        st.bar_chart(inc["severity"].value_counts())
+    severity_counts = data["severity_counts"]
+    if not severity_counts.empty:
+        st.bar_chart(severity_counts.set_index("severity"))
     else:
         st.info("No severity data available.")
 
 with a2:
     st.markdown("**Tickets by Status**")
-    if "status" in tickets.columns and not tickets.empty:
-        st.bar_chart(tickets["status"].value_counts())
+    status_counts = data["status_counts"]
+    if not status_counts.empty:
+        st.bar_chart(status_counts.set_index("status"))
     else:
         st.info("No ticket status data available.")
 
+st.markdown("**Incident Trend by Severity**")
+st.radio("Granularity", ["month", "week", "day"], horizontal=True, key="trend_granularity")
+incident_trend = data["incident_trend"]
+if not incident_trend.empty:
+    chart = incident_trend.pivot_table(index="bucket", columns="severity", values="count",
+                                       aggfunc="sum", fill_value=0)
+    st.line_chart(chart)
+else:
+    st.info("No dated incidents to chart yet.")
+
+st.markdown("**Latest High / Critical Incidents**")
+latest = data["latest"]
+if not latest.empty:
+    st.dataframe(latest, use_container_width=True, hide_index=True)
+else:
+    st.info("No high or critical incidents.")
+
 if role == "admin":
     st.subheader("📊 Datasets by Source (Admin Only)")
-    if "source" in datasets.columns and not datasets.empty:
-        st.bar_chart(datasets["source"].value_counts())
+    source_counts = data["source_counts"]
+    if not source_counts.empty:
+        st.bar_chart(source_counts.set_index("source"))
     else:
         st.info("No dataset source data available.")
+
+    with st.expander("⏱ Dashboard query timings"):
+        st.text("\n".join(format_timings(timings)))
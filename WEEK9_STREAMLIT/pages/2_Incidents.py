@@ -2,7 +2,8 @@
 import streamlit as st
 from datetime import date
 from app_backend.theme import apply_cyber_theme, render_sidebar
-from app_backend.incidents import load_incidents, insert_incident
+from app_backend.incidents import insert_incident, search_incidents
+from app_backend.widgets import render_paged_table, render_search
 
 st.set_page_config(page_title="Incidents", page_icon="🛡", layout="wide")
 
@@ -18,8 +19,13 @@ st.title("🛡 Incident Management")
 tab1, tab2 = st.tabs(["View Incidents", "Add Incident"])
 
 with tab1:
-    df = load_incidents()
-    st.dataframe(df, use_container_width=True)
+    if not render_search(search_incidents, key="incidents", placeholder="e.g. phishing credential"):
+        render_paged_table(
+            "cyber_incidents",
+            key="incidents",
+            sort_columns=["id", "date_reported", "severity", "status"],
+            filter_columns=["severity", "status"],
+        )
 
 with tab2:
     inc_date = st.date_input("Date Reported", date.today())
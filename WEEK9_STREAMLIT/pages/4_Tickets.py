@@ -1,7 +1,9 @@
 # pages/4_Tickets.py
 import streamlit as st
 from app_backend.theme import apply_cyber_theme, render_sidebar
-from app_backend.tickets import load_tickets
+from app_backend.aggregates import count_by, kpi_summary
+from app_backend.tickets import search_tickets
+from app_backend.widgets import render_paged_table, render_search
 
 st.set_page_config(page_title="IT Tickets", page_icon="🎫", layout="wide")
 
@@ -14,30 +16,38 @@ if "logged_in" not in st.session_state or not st.session_state.logged_in:
 
 st.title("🎫 IT Tickets Overview")
 
-df = load_tickets()
+kpis = kpi_summary()
 
 col1, col2, col3 = st.columns(3)
-col1.metric("Total Tickets", len(df))
-col2.metric("Open Tickets", (df["status"] == "Open").sum() if "status" in df.columns else 0)
-col3.metric("High Priority", (df["priority"] == "High").sum() if "priority" in df.columns else 0)
+col1.metric("Total Tickets", kpis["total_tickets"])
+col2.metric("Open Tickets", kpis["open_tickets"])
+col3.metric("High Priority", kpis["high_priority_tickets"])
 
 st.divider()
 
 colA, colB = st.columns(2)
 with colA:
     st.subheader("Priority Breakdown")
-    if "priority" in df.columns and not df.empty:
-        st.bar_chart(df["priority"].value_counts())
+    priority_counts = count_by("it_tickets", "priority")
+    if not priority_counts.empty:
+        st.bar_chart(priority_counts.set_index("priority"))
     else:
         st.info("No priority data available.")
 
 with colB:
     st.subheader("Status Breakdown")
-    if "status" in df.columns and not df.empty:
-        st.bar_chart(df["status"].value_counts())
+    status_counts = count_by("it_tickets", "status")
+    if not status_counts.empty:
+        st.bar_chart(status_counts.set_index("status"))
     else:
         st.info("No status data available.")
 
 st.divider()
-st.subheader("📄 Full Ticket Table")
-st.dataframe(df, use_container_width=True)
+st.subheader("📄 Ticket Table")
+if not render_search(search_tickets, key="tickets", placeholder="e.g. password reset"):
+    render_paged_table(
+        "it_tickets",
+        key="tickets",
+        sort_columns=["id", "status", "priority"],
+        filter_columns=["status", "priority"],
+    )
@@ -0,0 +1,99 @@
+# pages/98_Performance.py
+import pandas as pd
+import streamlit as st
+from app_backend.theme import apply_cyber_theme, render_sidebar
+from app_backend.cache import cache_stats
+from app_backend.db import connection, pool_stats, writer
+from app.data.metrics import metrics
+from app.data.snapshots import snapshot_stats
+
+st.set_page_config(page_title="Performance", page_icon="⏱", layout="wide")
+
+apply_cyber_theme()
+render_sidebar()
+
+if "logged_in" not in st.session_state or not st.session_state.logged_in:
+    st.error("Please log in first.")
+    st.stop()
+
+if st.session_state.get("role") != "admin":
+    st.error("This page is only available to admins.")
+    st.stop()
+
+st.title("⏱ Data Layer Performance")
+st.caption("Metrics of this Streamlit process since it started (or since the last reset).")
+
+# ================== DATA-ACCESS FUNCTIONS ==================
+st.subheader("📈 Data-Access Functions")
+functions = metrics.functions()
+if functions.empty:
+    st.info("No data-access calls recorded yet.")
+else:
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Calls", int(functions["calls"].sum()))
+    c2.metric("Errors", int(functions["errors"].sum()))
+    c3.metric("Time in Data Layer", f"{functions['total_s'].sum():.2f} s")
+    st.dataframe(
+        functions.style.format({"p50_ms": "{:.1f}", "p95_ms": "{:.1f}", "p99_ms": "{:.1f}",
+                                "total_s": "{:.3f}", "bytes": "{:,}", "rows": "{:,}"}),
+        use_container_width=True, hide_index=True,
+    )
+
+# ================== SLOW QUERIES ==================
+st.subheader("🐢 Slow Queries")
+with st.form("slow_query_threshold"):
+    threshold_ms = st.number_input("Slow-query threshold (ms)", min_value=1, max_value=60_000,
+                                   value=int(metrics.slow_query_seconds * 1000), step=10)
+    if st.form_submit_button("Apply to all sessions"):
+        metrics.set_slow_query_seconds(threshold_ms / 1000)
+        st.success(f"Slow-query threshold set to {threshold_ms} ms.")
+st.caption("The threshold is a process-wide setting: it applies to every user of this Streamlit server.")
+
+slow = metrics.slow_queries()
+if not slow:
+    st.info("No statement has been slower than the threshold.")
+for entry in slow[:50]:
+    with st.expander(f"{entry['seconds'] * 1000:.0f} ms · {entry['at']} · {entry['sql'][:80]}"):
+        st.code(entry["sql"], language="sql")
+        st.markdown(f"**Parameters:** {entry['params']}")
+        if entry["plan"]:
+            st.markdown("**Query plan:**")
+            st.code("\n".join(entry["plan"]))
+
+# ================== POOL / CACHE / WRITER ==================
+st.subheader("🔌 Connection Pool, Query Cache & Writer")
+stats = pd.DataFrame([
+    {"component": "connection pool", **pool_stats()},
+    {"component": "query cache", **cache_stats()},
+    {"component": "group-commit writer", **writer().stats()},
+]).set_index("component").T.astype(str)
+st.dataframe(stats, use_container_width=True)
+
+# ================== SNAPSHOTS ==================
+st.subheader("🗂 Columnar Snapshots")
+with connection() as conn:
+    snapshots = pd.DataFrame(snapshot_stats(conn))
+if not snapshots["exists"].any():
+    st.info("No snapshots yet: `python main.py` writes them after loading the CSVs.")
+else:
+    st.caption("Fresh snapshots serve cold table loads; stale ones are rewritten on the next load.")
+    st.dataframe(snapshots.style.format({"bytes": "{:,}", "rows": "{:,}"}),
+                 use_container_width=True, hide_index=True)
+
+# ================== EXPORT ==================
+st.subheader("📤 Prometheus Export")
+text = metrics.prometheus_text()
+e1, e2, e3 = st.columns(3)
+with e1:
+    if st.button("💾 Write metrics file"):
+        path = metrics.export_prometheus()
+        st.success(f"Written to {path}")
+with e2:
+    st.download_button("⬇️ Download metrics", text, file_name="metrics.prom", mime="text/plain")
+with e3:
+    if st.button("🧹 Reset metrics"):
+        metrics.reset()
+        st.rerun()
+
+with st.expander("Preview"):
+    st.code(text)